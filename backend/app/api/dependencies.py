@@ -4,13 +4,16 @@ API dependencies
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 import uuid
 
-from ..db.session import get_db
-from ..core.security import decode_token
+from ..db.session import get_async_db
+from ..core.config import settings
+from ..core.security import decode_token, hash_api_key
 from ..models import User
+from ..services.api_key_index import api_key_index, is_well_formed
+from ..services.principal_cache import principal_cache
 
 security = HTTPBearer(auto_error=False)
 
@@ -18,7 +21,7 @@ security = HTTPBearer(auto_error=False)
 async def get_current_user(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> User:
     """
     Accepts either a JWT Bearer token or an X-API-Key header (permanent service key).
@@ -26,8 +29,16 @@ async def get_current_user(
     # ── 1. X-API-Key (permanent service token) ──────────────────────────────
     api_key = request.headers.get("X-API-Key")
     if api_key:
-        user = db.query(User).filter(User.api_key == api_key, User.is_active == True).first()
-        if not user:
+        if not is_well_formed(api_key):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
+
+        digest = hash_api_key(api_key)
+        user_id = await api_key_index.resolve(db, digest)
+        user = await _load_user(db, user_id) if user_id else None
+        if not user or not user.is_active or user.api_key_hash != digest:
+            # Cached digest went stale (key rotated or user deactivated)
+            if user_id:
+                api_key_index.forget(digest)
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
         return user
 
@@ -39,7 +50,32 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    payload = decode_token(credentials.credentials)
+    user_id = None
+    if settings.PRINCIPAL_CACHE_ENABLED:
+        user_id = principal_cache.get_token_user_id(credentials.credentials)
+    if user_id is None:
+        user_id = _user_id_from_token(credentials.credentials)
+
+    user = await _load_user(db, user_id)
+
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+
+    return user
+
+
+async def _load_user(db: AsyncSession, user_id: uuid.UUID) -> Optional[User]:
+    if settings.PRINCIPAL_CACHE_ENABLED:
+        return await principal_cache.load_user(db, user_id)
+    return await db.get(User, user_id)
+
+
+def _user_id_from_token(token: str) -> uuid.UUID:
+    """Validate a JWT access token and return its user id (cached on success)"""
+    payload = decode_token(token)
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -71,14 +107,9 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-
-    if not user.is_active:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
-
-    return user
+    if settings.PRINCIPAL_CACHE_ENABLED:
+        principal_cache.remember_token(token, user_id, payload.get("exp"))
+    return user_id
 
 
 async def get_current_active_user(
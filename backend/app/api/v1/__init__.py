@@ -9,6 +9,9 @@ from .documents import router as documents_router
 from .calendar import router as calendar_router
 from .notifications import router as notifications_router
 from .paperless import router as paperless_router
+from .search import router as search_router
+from .sync import router as sync_router
+from .uploads import router as uploads_router
 
 api_router = APIRouter()
 
@@ -19,3 +22,6 @@ api_router.include_router(documents_router, prefix="/documents", tags=["document
 api_router.include_router(calendar_router)
 api_router.include_router(notifications_router)
 api_router.include_router(paperless_router)
+api_router.include_router(search_router)
+api_router.include_router(sync_router)
+api_router.include_router(uploads_router)
@@ -3,27 +3,38 @@ Authentication endpoints
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime
 import secrets
 import uuid
 
-from ...db.session import get_db
+from ...db.session import get_async_db
 from ...schemas import UserCreate, UserResponse, UserSettingsUpdate, UserLogin, Token
 from ...models import User
-from ...core.security import verify_password, get_password_hash, create_access_token, create_refresh_token
+from ...core.security import (
+    verify_password,
+    get_password_hash,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    hash_api_key,
+)
 from ..dependencies import get_current_user
+from ...services.api_key_index import api_key_index
+from ...services.principal_cache import commit_user_changes, load_uncached_columns
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Register a new user
     """
     # Check if username already exists
-    existing_user = db.query(User).filter(User.username == user_data.username).first()
+    existing_user = await db.scalar(select(User).where(User.username == user_data.username))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -31,40 +42,41 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
 
     # Check if email already exists
-    existing_email = db.query(User).filter(User.email == user_data.email).first()
+    existing_email = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    # Create new user
+    # Create new user (argon2 is CPU-bound, keep it off the event loop)
+    password_hash = await run_in_threadpool(get_password_hash, user_data.password)
     new_user = User(
         username=user_data.username,
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=password_hash,
         full_name=user_data.full_name,
         is_active=True,
         is_verified=False,
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     return new_user
 
 
 @router.post("/login", response_model=Token)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """
     Login and get access token
     """
     # Find user
-    user = db.query(User).filter(User.username == credentials.username).first()
+    user = await db.scalar(select(User).where(User.username == credentials.username))
 
     # Verify user and password
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not user or not await run_in_threadpool(verify_password, credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -79,7 +91,7 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
 
     # Update last login
     user.last_login_at = datetime.utcnow()
-    db.commit()
+    await commit_user_changes(db)
 
     # Create tokens
     access_token = create_access_token(data={"sub": str(user.id)})
@@ -93,18 +105,22 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Get current user information
     """
+    await load_uncached_columns(db, current_user, "ui_preferences")
     return current_user
 
 
 @router.patch("/me", response_model=UserResponse)
-def update_settings(
+async def update_settings(
     data: UserSettingsUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update user profile and all configurable parameters"""
     if data.full_name is not None:
@@ -115,6 +131,7 @@ def update_settings(
         current_user.language = data.language
 
     # Merge ui_preferences
+    await load_uncached_columns(db, current_user, "ui_preferences")
     prefs = dict(current_user.ui_preferences or {})
     if data.paperless_url is not None:
         prefs["paperless_url"] = data.paperless_url
@@ -135,13 +152,13 @@ def update_settings(
     current_user.notification_preferences = notif
 
     current_user.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(current_user)
+    await commit_user_changes(db)
+    await db.refresh(current_user)
     return current_user
 
 
 @router.post("/refresh", response_model=Token)
-def refresh_access_token(request: Request, db: Session = Depends(get_db)):
+async def refresh_access_token(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Neuen Access-Token per Refresh-Token holen.
     Header: Authorization: Bearer <refresh_token>
@@ -161,7 +178,7 @@ def refresh_access_token(request: Request, db: Session = Depends(get_db)):
     except (ValueError, TypeError):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Ungültiger Token-Inhalt")
 
-    user = db.query(User).filter(User.id == user_id, User.is_active == True).first()
+    user = await db.scalar(select(User).where(User.id == user_id, User.is_active == True))
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Benutzer nicht gefunden")
 
@@ -177,23 +194,33 @@ def logout(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/api-key", summary="Permanenten Service-API-Key generieren")
-def generate_api_key(
+async def generate_api_key(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Generiert einen permanenten API-Key für externe Dienste (z. B. Morning Briefing).
-    Der Key wird gespeichert und ersetzt einen eventuell vorhandenen alten Key.
+    Gespeichert wird nur der SHA-256-Hash; der Key ersetzt einen eventuell vorhandenen
+    alten Key und wird nur in dieser Antwort angezeigt.
     Sende ihn als Header: X-API-Key: <key>
     """
     key = secrets.token_hex(32)  # 64 Zeichen hex
-    current_user.api_key = key
+    digest = hash_api_key(key)
+    current_user.api_key_hash = digest
+    current_user.api_key_prefix = key[:8]
     current_user.updated_at = datetime.utcnow()
-    db.commit()
+    await commit_user_changes(db)
+    api_key_index.remember(digest, current_user.id)
     return {"api_key": key, "hint": "Sende diesen Key als X-API-Key Header. Er ist permanent und ersetzt keinen JWT."}
 
 
 @router.get("/api-key", summary="Aktuellen API-Key anzeigen")
 def get_api_key(current_user: User = Depends(get_current_user)):
-    """Zeigt den aktuellen Service-API-Key (oder null wenn noch keiner generiert wurde)."""
-    return {"api_key": current_user.api_key}
+    """
+    Zeigt, ob ein Service-API-Key existiert, und dessen Präfix.
+    Der vollständige Key ist nur bei der Erzeugung sichtbar (gespeichert wird nur der Hash).
+    """
+    return {
+        "configured": current_user.api_key_hash is not None,
+        "api_key_prefix": current_user.api_key_prefix,
+    }
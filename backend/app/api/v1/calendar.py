@@ -2,17 +2,18 @@
 Calendar and Integration management endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
 from datetime import datetime, timedelta
+import asyncio
 import uuid
 
-from google_auth_oauthlib.flow import Flow
-from google.oauth2.credentials import Credentials
 
-from ...db.session import get_db
+from ...db.session import get_async_db, run_with_sync_session
 from ...schemas import (
     CalendarEventCreate,
     CalendarEventUpdate,
@@ -27,11 +28,14 @@ from ...models import User, CalendarEvent, Integration
 from ...models.calendar_event import CalendarSyncStatus
 from ...models.integration import IntegrationType, SyncDirection
 from ..dependencies import get_current_user
-from ...services.caldav_service import CalDAVService
-from ...services.google_calendar_service import GoogleCalendarService
 from ...services.calendar_sync_service import CalendarSyncService
 from ...services.task_event_mapping_service import TaskEventMappingService
 from ...core.config import settings
+from ...core.metrics import observe_external
+from ...core.etag import collection_etag, etag_matches, not_modified, set_etag
+from ...core.pagination import next_page, paginate, parse_sort, set_next_cursor
+from ...core.query_budget import query_budget
+from ...core.serialization import fast_json_response, nest_rows, response_columns
 
 router = APIRouter(prefix="/calendar", tags=["Calendar"])
 
@@ -39,14 +43,19 @@ router = APIRouter(prefix="/calendar", tags=["Calendar"])
 # ===== Calendar Events Endpoints =====
 
 @router.get("/events/", response_model=List[CalendarEventResponse])
-def get_calendar_events(
+@query_budget(3)
+async def get_calendar_events(
+    request: Request,
+    response: Response,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     sync_status: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
+    sort: str = "start_time",
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all calendar events for current user
@@ -55,29 +64,49 @@ def get_calendar_events(
     - start_date: Only events starting after this date
     - end_date: Only events ending before this date
     - sync_status: Filter by sync status (pending, synced, failed, conflict)
+
+    Paging: sort=start_time (default) or -start_time; pass the X-Next-Cursor
+    response header as cursor to get the next page. Answers 304 Not Modified
+    if If-None-Match matches the ETag.
     """
-    query = db.query(CalendarEvent).filter(CalendarEvent.user_id == current_user.id)
+    etag = await collection_etag(db, request, current_user.id, "calendar_events")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    sort_key = parse_sort(sort, {"start_time": CalendarEvent.start_time}, CalendarEvent.id)
+    query = select(CalendarEvent).where(CalendarEvent.user_id == current_user.id)
 
     # Apply filters
     if start_date:
-        query = query.filter(CalendarEvent.start_time >= start_date)
+        query = query.where(CalendarEvent.start_time >= start_date)
     if end_date:
-        query = query.filter(CalendarEvent.end_time <= end_date)
+        query = query.where(CalendarEvent.end_time <= end_date)
     if sync_status:
-        query = query.filter(CalendarEvent.sync_status == sync_status)
-
-    # Order by start time
-    query = query.order_by(CalendarEvent.start_time)
-
-    events = query.offset(skip).limit(limit).all()
+        query = query.where(CalendarEvent.sync_status == sync_status)
+
+    # Order by start time, then id
+    query = paginate(query, sort_key, cursor, limit, skip)
+
+    if settings.FAST_LIST_RESPONSES:
+        columns = response_columns(CalendarEvent, CalendarEventResponse)
+        rows = (await db.execute(query.with_only_columns(*columns))).mappings()
+        items, next_cursor = next_page(nest_rows(rows), sort_key, limit)
+        fast_response = fast_json_response(items)
+        set_next_cursor(fast_response, next_cursor)
+        set_etag(fast_response, etag)
+        return fast_response
+
+    events, next_cursor = next_page((await db.scalars(query)).all(), sort_key, limit)
+    set_next_cursor(response, next_cursor)
+    set_etag(response, etag)
     return events
 
 
 @router.post("/events/", response_model=CalendarEventResponse, status_code=status.HTTP_201_CREATED)
-def create_calendar_event(
+async def create_calendar_event(
     event_data: CalendarEventCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new calendar event
@@ -92,10 +121,10 @@ def create_calendar_event(
     # Validate task_id if provided
     if event_data.task_id:
         from ...models import Task
-        task = db.query(Task).filter(
+        task = await db.scalar(select(Task).where(
             Task.id == event_data.task_id,
             Task.user_id == current_user.id
-        ).first()
+        ))
         if not task:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -104,10 +133,10 @@ def create_calendar_event(
 
     # Validate integration if provided
     if event_data.external_calendar_id:
-        integration = db.query(Integration).filter(
+        integration = await db.scalar(select(Integration).where(
             Integration.id == event_data.external_calendar_id,
             Integration.user_id == current_user.id
-        ).first()
+        ))
         if not integration:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -127,8 +156,8 @@ def create_calendar_event(
     )
 
     db.add(new_event)
-    db.commit()
-    db.refresh(new_event)
+    await db.commit()
+    await db.refresh(new_event)
 
     # TODO: Trigger sync to external calendar if external_calendar_id is set
 
@@ -136,18 +165,18 @@ def create_calendar_event(
 
 
 @router.get("/events/{event_id}", response_model=CalendarEventResponse)
-def get_calendar_event(
+async def get_calendar_event(
     event_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a specific calendar event
     """
-    event = db.query(CalendarEvent).filter(
+    event = await db.scalar(select(CalendarEvent).where(
         CalendarEvent.id == str(event_id),
         CalendarEvent.user_id == current_user.id
-    ).first()
+    ))
 
     if not event:
         raise HTTPException(
@@ -159,19 +188,19 @@ def get_calendar_event(
 
 
 @router.patch("/events/{event_id}", response_model=CalendarEventResponse)
-def update_calendar_event(
+async def update_calendar_event(
     event_id: uuid.UUID,
     event_data: CalendarEventUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a calendar event
     """
-    event = db.query(CalendarEvent).filter(
+    event = await db.scalar(select(CalendarEvent).where(
         CalendarEvent.id == str(event_id),
         CalendarEvent.user_id == current_user.id
-    ).first()
+    ))
 
     if not event:
         raise HTTPException(
@@ -201,8 +230,8 @@ def update_calendar_event(
     if event.sync_status == CalendarSyncStatus.SYNCED:
         event.sync_status = CalendarSyncStatus.PENDING
 
-    db.commit()
-    db.refresh(event)
+    await db.commit()
+    await db.refresh(event)
 
     # TODO: Trigger sync to external calendar
 
@@ -210,18 +239,18 @@ def update_calendar_event(
 
 
 @router.delete("/events/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_calendar_event(
+async def delete_calendar_event(
     event_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a calendar event
     """
-    event = db.query(CalendarEvent).filter(
+    event = await db.scalar(select(CalendarEvent).where(
         CalendarEvent.id == str(event_id),
         CalendarEvent.user_id == current_user.id
-    ).first()
+    ))
 
     if not event:
         raise HTTPException(
@@ -231,8 +260,8 @@ def delete_calendar_event(
 
     # TODO: Delete from external calendar if synced
 
-    db.delete(event)
-    db.commit()
+    await db.delete(event)
+    await db.commit()
 
     return None
 
@@ -240,34 +269,44 @@ def delete_calendar_event(
 # ===== Integration Endpoints =====
 
 @router.get("/integrations/", response_model=List[IntegrationResponse])
-def get_integrations(
+@query_budget(3)
+async def get_integrations(
+    request: Request,
+    response: Response,
     enabled_only: bool = False,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all calendar integrations for current user
+
+    Answers 304 Not Modified if If-None-Match matches the ETag.
     """
-    query = db.query(Integration).filter(Integration.user_id == current_user.id)
+    etag = await collection_etag(db, request, current_user.id, "integrations")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    query = select(Integration).where(Integration.user_id == current_user.id)
 
     if enabled_only:
-        query = query.filter(Integration.enabled == True)
+        query = query.where(Integration.enabled == True)
 
-    integrations = query.all()
+    integrations = (await db.scalars(query)).all()
 
     # Remove sensitive credentials from response
     for integration in integrations:
         if hasattr(integration, 'credentials'):
             integration.credentials = None
 
+    set_etag(response, etag)
     return integrations
 
 
 @router.post("/integrations/", response_model=IntegrationResponse, status_code=status.HTTP_201_CREATED)
-def create_integration(
+async def create_integration(
     integration_data: IntegrationCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new calendar integration
@@ -292,8 +331,8 @@ def create_integration(
     )
 
     db.add(new_integration)
-    db.commit()
-    db.refresh(new_integration)
+    await db.commit()
+    await db.refresh(new_integration)
 
     # Remove credentials from response
     new_integration.credentials = None
@@ -302,18 +341,18 @@ def create_integration(
 
 
 @router.get("/integrations/{integration_id}", response_model=IntegrationResponse)
-def get_integration(
+async def get_integration(
     integration_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a specific integration
     """
-    integration = db.query(Integration).filter(
+    integration = await db.scalar(select(Integration).where(
         Integration.id == str(integration_id),
         Integration.user_id == current_user.id
-    ).first()
+    ))
 
     if not integration:
         raise HTTPException(
@@ -328,19 +367,19 @@ def get_integration(
 
 
 @router.patch("/integrations/{integration_id}", response_model=IntegrationResponse)
-def update_integration(
+async def update_integration(
     integration_id: uuid.UUID,
     integration_data: IntegrationUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update an integration
     """
-    integration = db.query(Integration).filter(
+    integration = await db.scalar(select(Integration).where(
         Integration.id == str(integration_id),
         Integration.user_id == current_user.id
-    ).first()
+    ))
 
     if not integration:
         raise HTTPException(
@@ -356,8 +395,8 @@ def update_integration(
         else:
             setattr(integration, field, value)
 
-    db.commit()
-    db.refresh(integration)
+    await db.commit()
+    await db.refresh(integration)
 
     # Remove credentials from response
     integration.credentials = None
@@ -366,20 +405,20 @@ def update_integration(
 
 
 @router.delete("/integrations/{integration_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_integration(
+async def delete_integration(
     integration_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete an integration
 
     This will also set external_calendar_id to NULL for all related events
     """
-    integration = db.query(Integration).filter(
+    integration = await db.scalar(select(Integration).where(
         Integration.id == str(integration_id),
         Integration.user_id == current_user.id
-    ).first()
+    ))
 
     if not integration:
         raise HTTPException(
@@ -387,8 +426,8 @@ def delete_integration(
             detail="Integration not found"
         )
 
-    db.delete(integration)
-    db.commit()
+    await db.delete(integration)
+    await db.commit()
 
     return None
 
@@ -397,15 +436,15 @@ def delete_integration(
 async def test_integration(
     integration_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Test connection to calendar integration
     """
-    integration = db.query(Integration).filter(
+    integration = await db.scalar(select(Integration).where(
         Integration.id == str(integration_id),
         Integration.user_id == current_user.id
-    ).first()
+    ))
 
     if not integration:
         raise HTTPException(
@@ -422,6 +461,7 @@ async def test_integration(
                     detail="Missing credentials"
                 )
 
+            from ...services.caldav_service import CalDAVService
             caldav_service = CalDAVService(
                 url=integration.config.get('url'),
                 username=integration.credentials.get('username'),
@@ -450,13 +490,14 @@ async def test_integration(
                     detail="Missing Google OAuth credentials"
                 )
 
+            from ...services.google_calendar_service import GoogleCalendarService
             google_service = GoogleCalendarService(integration.credentials)
             result = await google_service.test_connection()
 
             # Update credentials in case token was refreshed
             updated_creds = google_service.get_updated_credentials()
             integration.credentials = updated_creds
-            db.commit()
+            await db.commit()
 
             return result
 
@@ -479,7 +520,7 @@ async def resolve_event_conflict(
     event_id: uuid.UUID,
     resolution: str,  # 'keep_local' or 'keep_remote'
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Resolve a conflict for a calendar event
@@ -493,10 +534,10 @@ async def resolve_event_conflict(
             detail="Resolution must be either 'keep_local' or 'keep_remote'"
         )
 
-    event = db.query(CalendarEvent).filter(
+    event = await db.scalar(select(CalendarEvent).where(
         CalendarEvent.id == str(event_id),
         CalendarEvent.user_id == current_user.id
-    ).first()
+    ))
 
     if not event:
         raise HTTPException(
@@ -510,9 +551,15 @@ async def resolve_event_conflict(
             detail="Event is not in conflict state"
         )
 
-    # Resolve conflict using sync service
-    sync_service = CalendarSyncService(db)
-    success = await sync_service.resolve_conflict(str(event_id), resolution, current_user)
+    # Resolve conflict using sync service (sync Session API, runs in the threadpool)
+    user_id = current_user.id
+
+    def _resolve(sync_db):
+        user = sync_db.get(User, user_id)
+        sync_service = CalendarSyncService(sync_db)
+        return asyncio.run(sync_service.resolve_conflict(str(event_id), resolution, user))
+
+    success = await run_with_sync_session(_resolve)
 
     if not success:
         raise HTTPException(
@@ -521,7 +568,7 @@ async def resolve_event_conflict(
         )
 
     # Refresh and return updated event
-    db.refresh(event)
+    await db.refresh(event)
     return event
 
 
@@ -530,15 +577,15 @@ async def sync_integration(
     integration_id: uuid.UUID,
     sync_request: SyncRequest = SyncRequest(),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Manually trigger sync for an integration
     """
-    integration = db.query(Integration).filter(
+    integration = await db.scalar(select(Integration).where(
         Integration.id == str(integration_id),
         Integration.user_id == current_user.id
-    ).first()
+    ))
 
     if not integration:
         raise HTTPException(
@@ -552,9 +599,16 @@ async def sync_integration(
             detail="Integration is disabled. Use force=true to sync anyway."
         )
 
-    # Perform sync using CalendarSyncService
-    sync_service = CalendarSyncService(db)
-    result = await sync_service.sync_integration(integration, current_user)
+    # Perform sync using CalendarSyncService (sync Session API, runs in the threadpool)
+    user_id = current_user.id
+
+    def _sync(sync_db):
+        target = sync_db.get(Integration, integration.id)
+        user = sync_db.get(User, user_id)
+        sync_service = CalendarSyncService(sync_db)
+        return asyncio.run(sync_service.sync_integration(target, user))
+
+    result = await run_with_sync_session(_sync)
 
     return SyncResponse(
         success=result.errors == 0,
@@ -568,10 +622,10 @@ async def sync_integration(
 # ===== Task-Event Mapping Endpoints =====
 
 @router.post("/tasks/sync-all", response_model=dict)
-def sync_all_tasks_to_calendar(
+async def sync_all_tasks_to_calendar(
     force: bool = False,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Bulk sync all tasks with due_dates to calendar events
@@ -579,8 +633,9 @@ def sync_all_tasks_to_calendar(
     Args:
         force: If true, recreate all events from scratch
     """
-    mapping_service = TaskEventMappingService(db)
-    stats = mapping_service.bulk_sync_user_tasks(current_user, force=force)
+    stats = await db.run_sync(
+        lambda session: TaskEventMappingService(session).bulk_sync_user_tasks(current_user, force=force)
+    )
 
     return {
         "success": stats["errors"] == 0,
@@ -590,10 +645,10 @@ def sync_all_tasks_to_calendar(
 
 
 @router.post("/tasks/cleanup-completed", response_model=dict)
-def cleanup_completed_task_events(
+async def cleanup_completed_task_events(
     older_than_days: int = 7,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Remove calendar events for completed tasks older than X days
@@ -607,8 +662,9 @@ def cleanup_completed_task_events(
             detail="older_than_days must be at least 1"
         )
 
-    mapping_service = TaskEventMappingService(db)
-    deleted_count = mapping_service.remove_completed_task_events(current_user, older_than_days)
+    deleted_count = await db.run_sync(
+        lambda session: TaskEventMappingService(session).remove_completed_task_events(current_user, older_than_days)
+    )
 
     return {
         "success": True,
@@ -635,6 +691,7 @@ def google_oauth_authorize(
         )
 
     # Create OAuth flow
+    from google_auth_oauthlib.flow import Flow
     flow = Flow.from_client_config(
         client_config={
             "web": {
@@ -665,7 +722,7 @@ async def google_oauth_callback(
     request: Request,
     code: str,
     state: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Google OAuth2 callback endpoint
@@ -680,6 +737,7 @@ async def google_oauth_callback(
 
     try:
         # Recreate the flow
+        from google_auth_oauthlib.flow import Flow
         flow = Flow.from_client_config(
             client_config={
                 "web": {
@@ -694,13 +752,14 @@ async def google_oauth_callback(
         )
         flow.redirect_uri = settings.GOOGLE_REDIRECT_URI
 
-        # Exchange authorization code for tokens
-        flow.fetch_token(code=code)
+        # Exchange authorization code for tokens (blocking HTTP call)
+        with observe_external("google", "oauth_token"):
+            await run_in_threadpool(flow.fetch_token, code=code)
         credentials = flow.credentials
 
         # Get user ID from state
         user_id = uuid.UUID(state)
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
@@ -713,6 +772,7 @@ async def google_oauth_callback(
         }
 
         # Initialize Google Calendar service to get calendar list
+        from ...services.google_calendar_service import GoogleCalendarService
         google_service = GoogleCalendarService(credentials_dict)
         calendars = await google_service.list_calendars()
 
@@ -742,8 +802,8 @@ async def google_oauth_callback(
             sync_interval_minutes=15
         )
         db.add(integration)
-        db.commit()
-        db.refresh(integration)
+        await db.commit()
+        await db.refresh(integration)
 
         # Return success page or redirect
         return {
@@ -2,135 +2,241 @@
 Document endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, File, Form, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, selectinload
 from typing import List, Optional
 from uuid import UUID
 
 from ...api.dependencies import get_current_active_user
-from ...db.session import get_db
+from ...db.session import get_async_db
 from ...models.user import User
 from ...models.document import Document as DocumentModel
 from ...models.file import File as FileModel
-from ...schemas.document import DocumentResponse, DocumentWithFileResponse, DocumentUpdate
-from ...services.file_storage import FileStorageService
+from ...schemas.document import (
+    DocumentResponse,
+    DocumentSummaryResponse,
+    DocumentSummaryWithFileResponse,
+    DocumentTextResponse,
+    DocumentUpdate,
+    DocumentWithFileResponse,
+    FileResponse,
+)
+from ...services.file_storage import FileStorageService, FileTooLargeError, StagedFile
 from ...core.config import settings
+from ...core.etag import collection_etag, etag_matches, not_modified, set_etag
+from ...core.pagination import next_page, paginate, parse_sort, set_next_cursor
+from ...core.query_budget import query_budget
+from ...core.security import file_url_expires
+from ...core.serialization import fast_json_response, nest_rows, response_columns
 from ...tasks.document_processing import process_document
+from ...tasks.thumbnails import generate_thumbnails
 
 router = APIRouter()
 file_storage = FileStorageService()
 
+ALLOWED_CONTENT_TYPES = ["image/jpeg", "image/png", "image/jpg", "application/pdf"]
 
-@router.post("/", response_model=DocumentWithFileResponse, status_code=status.HTTP_201_CREATED)
-async def upload_document(
-    file: UploadFile = File(...),
-    type: str = Form(default="other"),
-    title: Optional[str] = Form(default=None),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
-):
-    """
-    Upload a new document
 
-    Args:
-        file: File to upload (image or PDF)
-        type: Document type (invoice, reminder, contract, receipt, other)
-        title: Optional title for the document
-    """
-    # Validate file size
-    file_content = await file.read()
-    if len(file_content) > settings.MAX_UPLOAD_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File size exceeds maximum allowed size of {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
-        )
+async def _get_user_document(db: AsyncSession, document_id: UUID, user_id: UUID) -> Optional[DocumentModel]:
+    """Load a document of the user with its file eagerly (no lazy IO on async sessions)"""
+    return await db.scalar(
+        select(DocumentModel)
+        .options(selectinload(DocumentModel.file))
+        .where(DocumentModel.id == document_id, DocumentModel.user_id == user_id)
+    )
 
-    # Validate file type
-    allowed_types = ["image/jpeg", "image/png", "image/jpg", "application/pdf"]
-    if file.content_type not in allowed_types:
+
+def check_content_type(content_type: Optional[str]) -> None:
+    """400 unless the file type can be processed"""
+    if content_type not in ALLOWED_CONTENT_TYPES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File type {file.content_type} not allowed. Allowed: {', '.join(allowed_types)}"
+            detail=f"File type {content_type} not allowed. Allowed: {', '.join(ALLOWED_CONTENT_TYPES)}"
         )
 
-    # Save file
-    file_path, checksum, size_bytes = await file_storage.save_file(
-        file_content=file_content,
-        filename=file.filename or "upload",
-        user_id=current_user.id,
-    )
+
+async def create_document(
+    db: AsyncSession,
+    user_id: UUID,
+    staged: StagedFile,
+    filename: str,
+    content_type: Optional[str],
+    type: str,
+    title: Optional[str] = None,
+    force_processing: bool = False,
+) -> DocumentModel:
+    """
+    Store a staged upload, create its File and Document rows and queue processing
+
+    Shared by POST /documents/ and POST /uploads/{upload_id}/complete. The
+    staged file is consumed (stored or discarded).
+    """
+    try:
+        file_path = await file_storage.store(db, staged, content_type)
+    except BaseException:
+        file_storage.discard(staged)
+        raise
 
     # Create File record
     db_file = FileModel(
-        user_id=current_user.id,
+        user_id=user_id,
         path=file_path,
-        original_filename=file.filename or "upload",
-        size_bytes=size_bytes,
-        mime_type=file.content_type or "application/octet-stream",
-        checksum=checksum,
-        storage_backend="local",
+        original_filename=filename,
+        size_bytes=staged.size_bytes,
+        mime_type=content_type or "application/octet-stream",
+        checksum=staged.checksum,
+        storage_backend=file_storage.backend.name,
     )
     db.add(db_file)
-    db.flush()
+    await db.flush()
 
     # Create Document record
     db_document = DocumentModel(
-        user_id=current_user.id,
+        user_id=user_id,
         file_id=db_file.id,
         type=type,
-        title=title or file.filename,
+        title=title or filename,
         processing_status="pending",
     )
     db.add(db_document)
-    db.commit()
-    db.refresh(db_document)
+    await db.commit()
+    await db.refresh(db_document, attribute_names=["file"])
 
-    # Trigger background processing (OCR + AI analysis)
-    process_document.delay(str(db_document.id))
+    # Trigger background processing (OCR + AI analysis) and thumbnails for the app's lists
+    process_document.delay(str(db_document.id), force=force_processing)
+    generate_thumbnails.delay(str(db_file.id))
 
     return db_document
 
 
-@router.get("/", response_model=List[DocumentWithFileResponse])
-def list_documents(
+@router.post("/", response_model=DocumentWithFileResponse, status_code=status.HTTP_201_CREATED)
+async def upload_document(
+    file: UploadFile = File(...),
+    type: str = Form(default="other"),
+    title: Optional[str] = Form(default=None),
+    force_processing: bool = Form(default=False),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Upload a new document
+
+    Args:
+        file: File to upload (image or PDF)
+        type: Document type (invoice, reminder, contract, receipt, other)
+        title: Optional title for the document
+        force_processing: Run OCR and AI analysis even if the same file was analyzed before
+    """
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File size exceeds maximum allowed size of {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
+    )
+    # Oversized request bodies are already cut off by UploadSizeLimitMiddleware
+    if file.size is not None and file.size > settings.MAX_UPLOAD_SIZE:
+        raise too_large
+
+    # Validate file type
+    check_content_type(file.content_type)
+
+    # Save file (streamed in chunks, hashed on the way; stored once per content)
+    try:
+        staged = await file_storage.stage_stream(
+            file,
+            filename=file.filename or "upload",
+            max_size=settings.MAX_UPLOAD_SIZE,
+        )
+    except FileTooLargeError:
+        raise too_large
+
+    return await create_document(
+        db,
+        current_user.id,
+        staged,
+        filename=file.filename or "upload",
+        content_type=file.content_type,
+        type=type,
+        title=title,
+        force_processing=force_processing,
+    )
+
+
+@router.get("/", response_model=List[DocumentSummaryWithFileResponse])
+@query_budget(4)  # principal, collection version, documents, files (selectinload)
+async def list_documents(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 50,
     type: Optional[str] = None,
     processing_status: Optional[str] = None,
+    sort: str = "-uploaded_at",
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     List user's documents
 
+    Entries come without extracted_text, which is never read from the
+    database here; fetch it with GET /documents/{document_id}/text.
+
     Args:
-        skip: Number of documents to skip
+        skip: Number of documents to skip (ignored with a cursor)
         limit: Maximum number of documents to return
         type: Filter by document type
         processing_status: Filter by processing status
+        sort: uploaded_at or -uploaded_at (newest first, default)
+        cursor: X-Next-Cursor header of the previous page
+
+    Answers 304 Not Modified if If-None-Match matches the ETag.
     """
-    query = db.query(DocumentModel).filter(DocumentModel.user_id == current_user.id)
+    # The entries carry signed file URLs, so a new expiry is a new list
+    expires = file_url_expires()
+    etag = await collection_etag(db, request, current_user.id, "documents", variant=str(expires))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    sort_key = parse_sort(sort, {"uploaded_at": DocumentModel.uploaded_at}, DocumentModel.id)
+    query = select(DocumentModel).where(DocumentModel.user_id == current_user.id)
 
     if type:
-        query = query.filter(DocumentModel.type == type)
+        query = query.where(DocumentModel.type == type)
     if processing_status:
-        query = query.filter(DocumentModel.processing_status == processing_status)
-
-    documents = query.order_by(DocumentModel.uploaded_at.desc()).offset(skip).limit(limit).all()
+        query = query.where(DocumentModel.processing_status == processing_status)
+
+    query = paginate(query, sort_key, cursor, limit, skip)
+
+    if settings.FAST_LIST_RESPONSES:
+        columns = response_columns(DocumentModel, DocumentSummaryResponse) + response_columns(FileModel, FileResponse, prefix="file__")
+        query = query.with_only_columns(*columns).outerjoin(FileModel, DocumentModel.file_id == FileModel.id)
+        items, next_cursor = next_page(nest_rows((await db.execute(query)).mappings(), nested="file"), sort_key, limit)
+        for item in items:
+            if item["file"]:
+                FileResponse.sign_row(item["file"], expires)
+        fast_response = fast_json_response(items)
+        set_next_cursor(fast_response, next_cursor)
+        set_etag(fast_response, etag)
+        return fast_response
+
+    documents = (await db.scalars(
+        query.options(defer(DocumentModel.extracted_text), selectinload(DocumentModel.file))
+    )).all()
+    documents, next_cursor = next_page(documents, sort_key, limit)
+    set_next_cursor(response, next_cursor)
+    set_etag(response, etag)
     return documents
 
 
 @router.get("/{document_id}", response_model=DocumentWithFileResponse)
-def get_document(
+async def get_document(
     document_id: UUID,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a specific document"""
-    document = db.query(DocumentModel).filter(
-        DocumentModel.id == document_id,
-        DocumentModel.user_id == current_user.id
-    ).first()
+    document = await _get_user_document(db, document_id, current_user.id)
 
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
@@ -138,18 +244,58 @@ def get_document(
     return document
 
 
+@router.get("/{document_id}/text", response_model=DocumentTextResponse)
+@query_budget(2)  # principal, text slice
+async def get_document_text(
+    document_id: UUID,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20000, ge=1, le=100000),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get a page of a document's extracted text
+
+    Only the requested slice is sent by the database.
+
+    Args:
+        offset: First character of the page
+        limit: Maximum number of characters
+    """
+    row = (await db.execute(
+        select(
+            func.substr(DocumentModel.extracted_text, offset + 1, limit).label("text"),
+            func.length(DocumentModel.extracted_text).label("total_length"),
+        ).where(DocumentModel.id == document_id, DocumentModel.user_id == current_user.id)
+    )).first()
+
+    if row is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    text = row.text or ""
+    total_length = row.total_length or 0
+    end = offset + len(text)
+    return DocumentTextResponse(
+        document_id=document_id,
+        offset=offset,
+        text=text,
+        total_length=total_length,
+        next_offset=end if end < total_length else None,
+    )
+
+
 @router.patch("/{document_id}", response_model=DocumentResponse)
-def update_document(
+async def update_document(
     document_id: UUID,
     document_update: DocumentUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update a document"""
-    document = db.query(DocumentModel).filter(
+    document = await db.scalar(select(DocumentModel).where(
         DocumentModel.id == document_id,
         DocumentModel.user_id == current_user.id
-    ).first()
+    ))
 
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
@@ -162,8 +308,8 @@ def update_document(
     if document_update.doc_metadata is not None:
         document.doc_metadata = document_update.doc_metadata
 
-    db.commit()
-    db.refresh(document)
+    await db.commit()
+    await db.refresh(document)
     return document
 
 
@@ -171,26 +317,24 @@ def update_document(
 async def delete_document(
     document_id: UUID,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Delete a document and its file"""
-    document = db.query(DocumentModel).filter(
-        DocumentModel.id == document_id,
-        DocumentModel.user_id == current_user.id
-    ).first()
+    document = await _get_user_document(db, document_id, current_user.id)
 
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    # Delete file from storage
-    try:
-        await file_storage.delete_file(document.file.path)
-    except Exception as e:
-        # Log error but continue with deletion
-        print(f"Error deleting file: {e}")
-
-    # Delete from database (cascade will delete file record)
-    db.delete(document)
-    db.commit()
+    # Delete from database; the stored file goes with its last reference,
+    # once the rows are gone
+    released = None
+    await db.delete(document)
+    if document.file:
+        released = await file_storage.release(db, document.file)
+        await db.delete(document.file)
+    await db.commit()
+
+    if released:
+        await file_storage.purge(db, released)
 
     return None
@@ -2,22 +2,78 @@
 File serving endpoints
 """
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+import asyncio
+import mimetypes
+import os
+import stat
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import quote
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import FileResponse, RedirectResponse
 from pathlib import Path
+from typing import Optional
 from ...core.config import settings
+from ...core.etag import etag_matches
+from ...core.security import verify_file_signature
+from ...services.file_storage import FileStorageService, get_storage_backend
 
 router = APIRouter()
 
+# Content-addressed files never change under their path; cached until the URL expires
+CACHE_IMMUTABLE = "private, max-age={max_age}, immutable"
+# Files stored before content addressing: cache, but revalidate
+CACHE_REVALIDATE = "private, no-cache"
+
+
+class _FileResponse(FileResponse):
+    """FileResponse that checks If-Range against the ETag and Last-Modified it sends"""
+
+    def _should_use_range(self, http_if_range: str, stat_result: os.stat_result) -> bool:
+        return http_if_range in (self.headers.get("etag"), self.headers.get("last-modified"))
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """If-None-Match, or If-Modified-Since when no If-None-Match is sent (RFC 9110)"""
+    if request.headers.get("if-none-match"):
+        return etag_matches(request, etag)
+    since = request.headers.get("if-modified-since")
+    if not since:
+        return False
+    try:
+        return int(mtime) <= parsedate_to_datetime(since).timestamp()
+    except (TypeError, ValueError):
+        return False
+
 
 @router.get("/{file_path:path}")
-async def serve_file(file_path: str):
+@router.head("/{file_path:path}")
+async def serve_file(
+    file_path: str,
+    request: Request,
+    uid: Optional[str] = Query(None),
+    exp: Optional[str] = Query(None),
+    sig: Optional[str] = Query(None),
+    b: str = Query("local"),
+):
     """
     Serve uploaded files
 
-    Note: Authentication removed for now to allow Image.network() to work.
-    TODO: Implement proper authenticated image loading with headers
+    Only with a signed URL (the url of a FileResponse, see
+    create_file_url()): the signature is checked without database access,
+    so <img>/Image.network() can load files without headers. Files in
+    object storage (b, the signed File.storage_backend) are redirected to a
+    presigned URL of that backend.
+
+    Sends ETag (the checksum for content-addressed files and thumbnails),
+    Last-Modified and Cache-Control, answers conditional requests with 304
+    and Range requests with 206. With FILE_SENDFILE set, the reverse proxy sends the
+    file body.
     """
+    if not verify_file_signature(file_path, uid, exp, sig or "", b):
+        raise HTTPException(status_code=403, detail="Invalid or expired file URL")
+
     # Build full path
     full_path = Path(settings.UPLOAD_DIR) / file_path
 
@@ -32,15 +88,48 @@ async def serve_file(file_path: str):
     except Exception as e:
         raise HTTPException(status_code=403, detail=f"Invalid path: {str(e)}")
 
-    # Check if file exists
-    if not full_path.exists():
+    # Check if file exists; files in object storage are downloaded from there
+    try:
+        stat_result = await asyncio.to_thread(os.stat, full_path)
+    except FileNotFoundError:
+        download_url = get_storage_backend(b).download_url(file_path) if b != "local" else None
+        if download_url:
+            return RedirectResponse(download_url, status_code=307)
         raise HTTPException(status_code=404, detail=f"File not found: {file_path}")
 
-    if not full_path.is_file():
+    if not stat.S_ISREG(stat_result.st_mode):
         raise HTTPException(status_code=403, detail="Not a file")
 
-    # Return file
-    return FileResponse(
+    content_tag = FileStorageService.content_tag(file_path)
+    if content_tag:
+        etag, cache_control = f'"{content_tag}"', CACHE_IMMUTABLE.format(max_age=int(exp) - int(time.time()))
+    else:
+        etag, cache_control = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"', CACHE_REVALIDATE
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Cache-Control": cache_control,
+    }
+
+    if _not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Let the proxy send the body (including Range requests)
+    if settings.FILE_SENDFILE in ("x-accel-redirect", "x-sendfile"):
+        if settings.FILE_SENDFILE == "x-accel-redirect":
+            headers["X-Accel-Redirect"] = settings.FILE_ACCEL_REDIRECT_PREFIX + quote(file_path)
+        else:
+            headers["X-Sendfile"] = str(full_path)
+        headers["Content-Disposition"] = f'attachment; filename="{full_path.name}"'
+        return Response(
+            media_type=mimetypes.guess_type(full_path.name)[0] or "application/octet-stream",
+            headers=headers,
+        )
+
+    # Return file (answers Range and If-Range)
+    return _FileResponse(
         path=str(full_path),
         filename=full_path.name,
+        headers=headers,
+        stat_result=stat_result,
     )
@@ -4,10 +4,11 @@ Push notification endpoints
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...db.session import get_db
+from ...db.session import get_async_db
 from ...models.user import User
+from ...services.principal_cache import commit_user_changes
 from ..dependencies import get_current_active_user
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
@@ -18,26 +19,26 @@ class FCMTokenRequest(BaseModel):
 
 
 @router.post("/fcm-token")
-def register_fcm_token(
+async def register_fcm_token(
     payload: FCMTokenRequest,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Register or update the FCM device token for the current user."""
     if not payload.token:
         raise HTTPException(status_code=400, detail="Token darf nicht leer sein")
 
     current_user.fcm_token = payload.token
-    db.commit()
+    await commit_user_changes(db)
     return {"status": "ok"}
 
 
 @router.delete("/fcm-token")
-def delete_fcm_token(
+async def delete_fcm_token(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Remove FCM token (e.g. on logout)."""
     current_user.fcm_token = None
-    db.commit()
+    await commit_user_changes(db)
     return {"status": "ok"}
@@ -2,16 +2,16 @@
 Paperless-ngx integration endpoints
 """
 
+import asyncio
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from fastapi.responses import Response
-from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
 
 from ...api.dependencies import get_current_active_user
-from ...db.session import get_db
+from ...db.session import run_with_sync_session
 from ...models.user import User
 from ...services.paperless_service import PaperlessClient, PaperlessSyncService, get_paperless_client
 from ...core.config import settings
@@ -60,7 +60,6 @@ async def get_status():
 async def sync_documents(
     since: Optional[datetime] = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
 ):
     """
     Import new documents from Paperless into Workmate.
@@ -74,10 +73,16 @@ async def sync_documents(
         )
 
     started = datetime.utcnow()
-    svc = PaperlessSyncService(db=db, user_id=current_user.id)
+    user_id = current_user.id
+
+    # PaperlessSyncService uses the sync Session API (shared with Celery),
+    # so it runs in the threadpool instead of blocking the event loop
+    def _import(db):
+        svc = PaperlessSyncService(db=db, user_id=user_id)
+        return asyncio.run(svc.import_new_documents(since=since))
 
     try:
-        result = await svc.import_new_documents(since=since)
+        result = await run_with_sync_session(_import)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -93,7 +98,6 @@ async def sync_documents(
 async def write_back_to_paperless(
     document_id: str,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
 ):
     """
     Push Workmate analysis (tags, custom fields, notes) back to the
@@ -113,8 +117,13 @@ async def write_back_to_paperless(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid document_id")
 
-    svc = PaperlessSyncService(db=db, user_id=current_user.id)
-    success = await svc.write_back(doc_uuid)
+    user_id = current_user.id
+
+    def _write_back(db):
+        svc = PaperlessSyncService(db=db, user_id=user_id)
+        return asyncio.run(svc.write_back(doc_uuid))
+
+    success = await run_with_sync_session(_write_back)
 
     if not success:
         raise HTTPException(
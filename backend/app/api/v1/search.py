@@ -0,0 +1,53 @@
+"""
+Search endpoints
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...db.session import get_async_db
+from ...models import User
+from ...schemas import SearchResponse
+from ...core.query_budget import query_budget
+from ...services.search_service import search_service
+from ..dependencies import get_current_user
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+SEARCH_KINDS = {
+    "all": ["task", "document"],
+    "tasks": ["task"],
+    "documents": ["document"],
+}
+
+
+@router.get("/", response_model=SearchResponse)
+@query_budget(3)  # principal, tasks, documents
+async def search(
+    q: str = Query(..., min_length=2, max_length=200),
+    type: str = "all",
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Full-text search over tasks and documents
+
+    Searches task title/description and document title, sender and OCR
+    text (German stemming, so "Rechnungen" finds "Rechnung"). q supports
+    "quoted phrases", or and -exclusions. Results are ranked, best first,
+    with a snippet in which the matches are wrapped in <mark>.
+
+    Args:
+        q: Search query
+        type: all (default), tasks or documents
+        limit: Maximum number of results
+    """
+    if type not in SEARCH_KINDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid type '{type}'. Allowed: {', '.join(SEARCH_KINDS)}"
+        )
+
+    results = await search_service.search(db, current_user.id, q.strip(), SEARCH_KINDS[type], limit)
+    return SearchResponse(query=q, results=results)
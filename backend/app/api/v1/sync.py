@@ -0,0 +1,38 @@
+"""
+Sync endpoints
+"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...db.session import get_async_db
+from ...models import User
+from ...schemas import SyncChangesResponse
+from ...core.query_budget import query_budget
+from ...services.sync_service import sync_service
+from ..dependencies import get_current_user
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+
+@router.get("/changes", response_model=SyncChangesResponse)
+@query_budget(7)  # principal, changes (+ one oversized write), tasks, documents, events, reminders
+async def get_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Tasks, documents, calendar events and reminders changed since a cursor
+
+    Start with since=0 (full sync), then pass the cursor of the previous
+    response. Every changed row is returned once in its current state;
+    deleted rows come as tombstones in deleted. Documents are sent without
+    extracted_text. Repeat while has_more is true.
+
+    Args:
+        since: Cursor of the previous response
+        limit: Maximum number of changed rows per response
+    """
+    return await sync_service.changes(db, current_user.id, since, limit)
@@ -2,91 +2,252 @@
 Task management endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from typing import Annotated, Dict, List, Optional, Set, Union
 import uuid
 
-from ...db.session import get_db
-from ...schemas import TaskCreate, TaskUpdate, TaskResponse
-from ...models import User, Task
+from ...db.session import get_async_db
+from ...schemas import (
+    TaskCreate,
+    TaskUpdate,
+    TaskResponse,
+    TaskTreeNode,
+    TaskBulkRequest,
+    TaskBulkResult,
+    TaskBulkResponse,
+)
+from ...models import User, Task, Document
 from ..dependencies import get_current_user
-from ...services.task_event_mapping_service import TaskEventMappingService
+from ...core.config import settings
+from ...core.etag import collection_etag, etag_matches, not_modified, set_etag
+from ...core.pagination import next_page, paginate, parse_sort, set_next_cursor
+from ...core.query_budget import query_budget
+from ...core.serialization import fast_json_response, nest_rows, response_columns
+from ...services.task_tree_service import task_tree_service
+from ...services.task_write_service import TaskWriteService
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
+# GET /tasks/ answers with trees for include=subtree; tasks are matched
+# against TaskResponse first, so plain lists are validated once
+TaskListResponse = Annotated[
+    Union[List[TaskResponse], List[TaskTreeNode]], Field(union_mode="left_to_right")
+]
 
-@router.get("/", response_model=List[TaskResponse])
-def get_tasks(
+
+@router.get("/", response_model=TaskListResponse)
+@query_budget(4)  # principal, collection version, tasks (+ the tree query with include=subtree)
+async def get_tasks(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     status_filter: str = None,
+    sort: str = "due_date",
+    cursor: Optional[str] = None,
+    include: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all tasks for current user
+
+    Ordered by due date (tasks without one last), then id; sort=-due_date
+    reverses it. Pass the X-Next-Cursor response header as cursor to get
+    the next page.
+
+    include=subtree returns each task as a TaskTreeNode (nested subtasks
+    and rollup, see GET /tasks/{task_id}/tree).
+
+    Answers 304 Not Modified if If-None-Match matches the ETag (see
+    app/core/etag.py).
     """
-    query = db.query(Task).filter(Task.user_id == current_user.id)
+    if include not in (None, "subtree"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid include '{include}'. Allowed: subtree")
+
+    etag = await collection_etag(db, request, current_user.id, "tasks")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    sort_key = parse_sort(sort, {"due_date": Task.due_date}, Task.id)
+    query = select(Task).where(Task.user_id == current_user.id)
 
     # Filter by status if provided
     if status_filter:
-        query = query.filter(Task.status == status_filter)
+        query = query.where(Task.status == status_filter)
+
+    query = paginate(query, sort_key, cursor, limit, skip)
 
-    tasks = query.offset(skip).limit(limit).all()
+    if include == "subtree":
+        rows = (await db.execute(query.with_only_columns(Task.id, Task.due_date))).mappings()
+        page, next_cursor = next_page(nest_rows(rows), sort_key, limit)
+        trees = await task_tree_service.load_trees(db, current_user.id, [row["id"] for row in page])
+        tree_response = fast_json_response([tree.model_dump(mode="json") for tree in trees])
+        set_next_cursor(tree_response, next_cursor)
+        set_etag(tree_response, etag)
+        return tree_response
+
+    if settings.FAST_LIST_RESPONSES:
+        rows = (await db.execute(query.with_only_columns(*response_columns(Task, TaskResponse)))).mappings()
+        items, next_cursor = next_page(nest_rows(rows), sort_key, limit)
+        fast_response = fast_json_response(items)
+        set_next_cursor(fast_response, next_cursor)
+        set_etag(fast_response, etag)
+        return fast_response
+
+    tasks, next_cursor = next_page((await db.scalars(query)).all(), sort_key, limit)
+    set_next_cursor(response, next_cursor)
+    set_etag(response, etag)
     return tasks
 
 
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-def create_task(
+async def create_task(
     task_data: TaskCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new task
 
-    If task has a due_date, a calendar event will be automatically created.
+    If task has a due_date, a calendar event and reminders will be
+    automatically created, in the same commit as the task.
     """
-    new_task = Task(
-        user_id=current_user.id,
-        title=task_data.title,
-        description=task_data.description,
-        due_date=task_data.due_date,
-        priority=task_data.priority,
-        amount=task_data.amount,
-        currency=task_data.currency,
-        document_id=task_data.document_id,
-        parent_task_id=task_data.parent_task_id,
-    )
+    new_task = await db.run_sync(lambda session: TaskWriteService(session).create_task(current_user.id, task_data))
+    await db.commit()
 
-    db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
+    return new_task
 
-    # Automatically create calendar event if task has due_date
-    if new_task.due_date:
-        mapping_service = TaskEventMappingService(db)
-        mapping_service.create_event_from_task(new_task)
-        db.refresh(new_task)
 
-    return new_task
+@router.post("/bulk", response_model=TaskBulkResponse)
+async def bulk_tasks(
+    bulk: TaskBulkRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create, update and delete many tasks in one transaction
+
+    Each operation gets a result in request order. Operations that cannot be
+    applied (unknown task, missing payload, parent task or document not
+    found) are reported as errors; all others are committed together.
+
+    Calendar events and reminders of the whole batch are built in memory
+    and written with the tasks in one flush, so the number of statements
+    depends on the kinds of changes, not on the number of tasks.
+    """
+    operations = bulk.operations
+
+    # Everything the batch refers to, loaded up front in one query per table
+    task_ids: Set[uuid.UUID] = {op.id for op in operations if op.op != "create" and op.id}
+    parent_ids = {op.task.parent_task_id for op in operations if op.op == "create" and op.task and op.task.parent_task_id}
+    document_ids = {op.task.document_id for op in operations if op.op == "create" and op.task and op.task.document_id}
+
+    tasks: Dict[uuid.UUID, Task] = {}
+    if task_ids or parent_ids:
+        tasks = {task.id: task for task in (await db.scalars(
+            select(Task)
+            .options(
+                selectinload(Task.calendar_event),
+                selectinload(Task.reminders),
+                selectinload(Task.subtasks),
+            )
+            .where(Task.user_id == current_user.id, Task.id.in_(task_ids | parent_ids))
+        )).all()}
+
+    documents: Set[uuid.UUID] = set()
+    if document_ids:
+        documents = set((await db.scalars(
+            select(Document.id).where(Document.user_id == current_user.id, Document.id.in_(document_ids))
+        )).all())
+
+    results: List[TaskBulkResult] = []
+    changed: List[tuple] = []  # (result, task) to fill in after the commit
+    deleted: Set[uuid.UUID] = set()
+
+    def apply_operations(session: Session) -> None:
+        # Relationships are preloaded above, so this only adds to the session
+        writer = TaskWriteService(session)
+
+        for index, operation in enumerate(operations):
+            result = TaskBulkResult(index=index, op=operation.op, status="error", id=operation.id)
+            results.append(result)
+
+            if operation.op == "create":
+                task_data = operation.task
+                if task_data is None:
+                    result.error = "task is required for create"
+                    continue
+                if task_data.parent_task_id and (task_data.parent_task_id not in tasks or task_data.parent_task_id in deleted):
+                    result.error = "Parent task not found"
+                    continue
+                if task_data.document_id and task_data.document_id not in documents:
+                    result.error = "Document not found"
+                    continue
+
+                task = writer.create_task(current_user.id, task_data)
+                result.status, result.id = "created", task.id
+                changed.append((result, task))
+                continue
+
+            if operation.id is None:
+                result.error = f"id is required for {operation.op}"
+                continue
+            task = tasks.get(operation.id) if operation.id not in deleted else None
+            if task is None:
+                result.error = "Task not found"
+                continue
+
+            if operation.op == "update":
+                if operation.changes is None:
+                    result.error = "changes is required for update"
+                    continue
+                writer.update_task(task, operation.changes)
+                result.status = "updated"
+                changed.append((result, task))
+            else:
+                writer.delete_task(task)
+                deleted.add(task.id)
+                result.status = "deleted"
+
+    await db.run_sync(apply_operations)
+    await db.commit()
+
+    for result, task in changed:
+        # Tasks deleted by a later operation of the batch have no state to return
+        if task.id not in deleted:
+            result.task = TaskResponse.model_validate(task)
+
+    counts = {"created": 0, "updated": 0, "deleted": 0, "error": 0}
+    for result in results:
+        counts[result.status] += 1
+
+    return TaskBulkResponse(
+        results=results,
+        created=counts["created"],
+        updated=counts["updated"],
+        deleted=counts["deleted"],
+        failed=counts["error"],
+    )
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
-def get_task(
+async def get_task(
     task_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a specific task
     """
-    task = db.query(Task).filter(
+    task = await db.scalar(select(Task).where(
         Task.id == task_id,
         Task.user_id == current_user.id
-    ).first()
+    ))
 
     if not task:
         raise HTTPException(
@@ -97,22 +258,48 @@ def get_task(
     return task
 
 
+@router.get("/{task_id}/tree", response_model=TaskTreeNode)
+@query_budget(2)  # principal, tree
+async def get_task_tree(
+    task_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a task with all of its subtasks, nested
+
+    Every node carries a rollup over itself and its subtasks: task count,
+    open count, total amount and the earliest due date of the open ones.
+    Loaded with one recursive query, whatever the depth.
+    """
+    trees = await task_tree_service.load_trees(db, current_user.id, [task_id])
+
+    if not trees:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+
+    return trees[0]
+
+
 @router.patch("/{task_id}", response_model=TaskResponse)
-def update_task(
+async def update_task(
     task_id: uuid.UUID,
     task_data: TaskUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a task
 
-    Calendar event will be automatically updated if task has due_date changes.
+    Calendar event will be automatically updated if task has due_date changes;
+    pending reminders are rescheduled when due_date or priority change.
     """
-    task = db.query(Task).filter(
+    task = await db.scalar(select(Task).where(
         Task.id == task_id,
         Task.user_id == current_user.id
-    ).first()
+    ))
 
     if not task:
         raise HTTPException(
@@ -120,41 +307,26 @@ def update_task(
             detail="Task not found"
         )
 
-    # Update fields
-    update_data = task_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(task, field, value)
-
-    # Update completed_at timestamp if status changed to done
-    if task_data.status == "done" and not task.completed_at:
-        task.completed_at = datetime.utcnow()
-    elif task_data.status and task_data.status != "done":
-        task.completed_at = None
-
-    db.commit()
-    db.refresh(task)
-
-    # Automatically update/create/delete calendar event based on due_date
-    mapping_service = TaskEventMappingService(db)
-    mapping_service.update_event_from_task(task)
-    db.refresh(task)
+    # Task, calendar event and reminders in one commit
+    await db.run_sync(lambda session: TaskWriteService(session).update_task(task, task_data))
+    await db.commit()
 
     return task
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(
+async def delete_task(
     task_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a task
     """
-    task = db.query(Task).filter(
+    task = await db.scalar(select(Task).where(
         Task.id == task_id,
         Task.user_id == current_user.id
-    ).first()
+    ))
 
     if not task:
         raise HTTPException(
@@ -162,7 +334,7 @@ def delete_task(
             detail="Task not found"
         )
 
-    db.delete(task)
-    db.commit()
+    await db.delete(task)
+    await db.commit()
 
     return None
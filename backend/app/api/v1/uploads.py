@@ -0,0 +1,212 @@
+"""
+Resumable upload endpoints
+
+Large scans are sent in chunks over several requests, so a dropped
+connection only loses the chunk in flight:
+
+    POST   /uploads                      start: filename, content_type, size_bytes
+    PATCH  /uploads/{id}                 chunk (raw body) with Upload-Offset: <offset>
+    HEAD   /uploads/{id}                 current offset, after a dropped connection
+    POST   /uploads/{id}/complete        creates the document and starts processing
+    DELETE /uploads/{id}                 cancel
+"""
+
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import ClientDisconnect
+
+from ...core.config import settings
+from ...db.session import get_async_db
+from ...models import UploadSession, User
+from ...schemas import DocumentWithFileResponse, UploadSessionCreate, UploadSessionResponse
+from ...services.file_storage import FileTooLargeError, UploadBusyError, UploadOffsetError
+from ..dependencies import get_current_active_user
+from .documents import check_content_type, create_document, file_storage
+
+router = APIRouter(prefix="/uploads", tags=["Uploads"])
+
+OFFSET_HEADER = "Upload-Offset"
+
+
+async def _get_upload(db: AsyncSession, upload_id: UUID, user_id: UUID) -> UploadSession:
+    upload = await db.scalar(
+        select(UploadSession).where(UploadSession.id == upload_id, UploadSession.user_id == user_id)
+    )
+    if not upload or upload.expires_at < datetime.utcnow():
+        raise HTTPException(status_code=404, detail="Upload not found or expired")
+    return upload
+
+
+def _offset(upload: UploadSession) -> int:
+    path = file_storage.upload_part_path(upload.id)
+    return path.stat().st_size if path.exists() else 0
+
+
+def _response(upload: UploadSession, offset: int, response: Response) -> UploadSessionResponse:
+    response.headers[OFFSET_HEADER] = str(offset)
+    return UploadSessionResponse(
+        id=upload.id,
+        filename=upload.filename,
+        content_type=upload.content_type,
+        size_bytes=upload.size_bytes,
+        offset=offset,
+        expires_at=upload.expires_at,
+    )
+
+
+@router.post("", response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
+async def create_upload(
+    upload_in: UploadSessionCreate,
+    response: Response,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Start a resumable upload
+
+    Files up to MAX_RESUMABLE_UPLOAD_SIZE (instead of MAX_UPLOAD_SIZE).
+    Unfinished uploads expire after UPLOAD_SESSION_EXPIRE_HOURS.
+    """
+    check_content_type(upload_in.content_type)
+    if upload_in.size_bytes > settings.MAX_RESUMABLE_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File size exceeds maximum allowed size of {settings.MAX_RESUMABLE_UPLOAD_SIZE / 1024 / 1024}MB"
+        )
+
+    upload = UploadSession(
+        user_id=current_user.id,
+        filename=upload_in.filename,
+        content_type=upload_in.content_type,
+        size_bytes=upload_in.size_bytes,
+        document_type=upload_in.type,
+        title=upload_in.title,
+        force_processing=upload_in.force_processing,
+        expires_at=datetime.utcnow() + timedelta(hours=settings.UPLOAD_SESSION_EXPIRE_HOURS),
+    )
+    db.add(upload)
+    await db.commit()
+    file_storage.upload_part_path(upload.id).touch()
+
+    return _response(upload, 0, response)
+
+
+@router.get("/{upload_id}", response_model=UploadSessionResponse)
+@router.head("/{upload_id}", response_model=UploadSessionResponse)
+async def get_upload(
+    upload_id: UUID,
+    response: Response,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Current offset of an upload (also in the Upload-Offset header), to resume it"""
+    upload = await _get_upload(db, upload_id, current_user.id)
+    return _response(upload, _offset(upload), response)
+
+
+@router.patch("/{upload_id}", response_model=UploadSessionResponse)
+async def upload_chunk(
+    upload_id: UUID,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(..., alias=OFFSET_HEADER, ge=0),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Append a chunk
+
+    The raw request body is written at Upload-Offset, which must be the
+    current offset (409 with the current Upload-Offset otherwise). Any
+    chunk size works; the body is streamed to disk.
+    """
+    upload = await _get_upload(db, upload_id, current_user.id)
+    # No database work while the body is received
+    await db.close()
+
+    path = file_storage.upload_part_path(upload.id)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Upload not found or expired")
+
+    try:
+        offset = await file_storage.append_chunk(path, request.stream(), upload_offset, upload.size_bytes)
+    except UploadOffsetError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload is at offset {e.offset}",
+            headers={OFFSET_HEADER: str(e.offset)},
+        )
+    except UploadBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except ClientDisconnect:
+        # What arrived is kept; the client asks for the offset and resumes
+        return Response(status_code=status.HTTP_400_BAD_REQUEST)
+
+    return _response(upload, offset, response)
+
+
+@router.post("/{upload_id}/complete", response_model=DocumentWithFileResponse, status_code=status.HTTP_201_CREATED)
+async def complete_upload(
+    upload_id: UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Finish an upload: store the file, create the document and start processing
+
+    Same result as POST /documents/ with the whole file.
+    """
+    upload = await _get_upload(db, upload_id, current_user.id)
+    path = file_storage.upload_part_path(upload.id)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Upload not found or expired")
+
+    try:
+        # Held until the file is stored, so no chunk is appended meanwhile
+        with file_storage.lock_part(path):
+            offset = path.stat().st_size
+            if offset != upload.size_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Upload incomplete: {offset} of {upload.size_bytes} bytes",
+                    headers={OFFSET_HEADER: str(offset)},
+                )
+
+            # The part file stays until the document is committed, so the
+            # upload can be completed again if storing or the commit fails
+            staged = await file_storage.stage_file(path, upload.filename)
+            await db.delete(upload)
+            document = await create_document(
+                db,
+                current_user.id,
+                staged,
+                filename=upload.filename,
+                content_type=upload.content_type,
+                type=upload.document_type,
+                title=upload.title,
+                force_processing=upload.force_processing,
+            )
+            path.unlink(missing_ok=True)
+            return document
+    except UploadBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.delete("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def cancel_upload(
+    upload_id: UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Cancel an upload and remove the received data"""
+    upload = await _get_upload(db, upload_id, current_user.id)
+    await db.delete(upload)
+    await db.commit()
+    file_storage.upload_part_path(upload.id).unlink(missing_ok=True)
+    return None
@@ -2,7 +2,17 @@
 Celery configuration for background tasks
 """
 
+import os
+import time
+
 from celery import Celery
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_process_init,
+    worker_process_shutdown,
+)
 from .core.config import settings
 
 celery_app = Celery(
@@ -11,6 +21,8 @@ celery_app = Celery(
     backend=settings.CELERY_RESULT_BACKEND,
     include=[
         "app.tasks.document_processing",
+        "app.tasks.thumbnails",
+        "app.tasks.upload_cleanup",
         "app.tasks.reminder_dispatch",
         "app.tasks.paperless_sync",
         "app.tasks.paperless_analyze",
@@ -40,4 +52,52 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.calendar_sync",
         "schedule": 900.0,  # every 15 minutes
     },
+    "cleanup-upload-sessions": {
+        "task": "app.tasks.cleanup_upload_sessions",
+        "schedule": 3600.0,  # every hour
+    },
 }
+
+
+@worker_process_init.connect
+def _configure_worker_db(**kwargs):
+    """Give every forked worker process its own connection pool (worker profile)"""
+    from .db.session import configure_engine
+    configure_engine("worker")
+
+
+@worker_process_shutdown.connect
+def _mark_metrics_process_dead(pid=None, **kwargs):
+    """Drop live gauges of an exiting worker process (multiprocess metrics only)"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+# ===== Task metrics =====
+
+_PUBLISHED_AT_HEADER = "workmate_published_at"
+_task_started_at: dict = {}
+
+
+@before_task_publish.connect
+def _stamp_publish_time(headers=None, **kwargs):
+    if headers is not None:
+        headers[_PUBLISHED_AT_HEADER] = time.time()
+
+
+@task_prerun.connect
+def _record_task_start(task_id=None, task=None, **kwargs):
+    from .core.metrics import CELERY_TASK_QUEUE_WAIT
+    _task_started_at[task_id] = time.perf_counter()
+    published_at = task.request.get(_PUBLISHED_AT_HEADER) or (task.request.headers or {}).get(_PUBLISHED_AT_HEADER)
+    if published_at:
+        CELERY_TASK_QUEUE_WAIT.labels(task.name).observe(max(time.time() - published_at, 0))
+
+
+@task_postrun.connect
+def _record_task_runtime(task_id=None, task=None, state=None, **kwargs):
+    from .core.metrics import CELERY_TASK_RUNTIME
+    started = _task_started_at.pop(task_id, None)
+    if started is not None:
+        CELERY_TASK_RUNTIME.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started)
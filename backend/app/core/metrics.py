@@ -0,0 +1,159 @@
+"""
+Prometheus metrics
+
+All metric objects live here so the rest of the app only imports what it
+records. Served by GET /metrics in app/main.py.
+
+With PROMETHEUS_MULTIPROC_DIR set (shared by the uvicorn workers and the
+Celery containers), prometheus_client writes to files in that directory and
+/metrics aggregates all processes, including the Celery task metrics.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+__all__ = [
+    "CONTENT_TYPE_LATEST",
+    "generate_latest",
+    "render_metrics",
+    "observe_external",
+    "DB_POOL_CHECKOUT_WAIT",
+    "DB_POOL_CHECKOUT_TIMEOUTS",
+    "DB_POOL_CHECKED_OUT",
+    "DB_POOL_CONNECTIONS_OPENED",
+    "HTTP_REQUEST_DURATION",
+    "HTTP_REQUESTS",
+    "HTTP_REQUEST_DB_QUERIES",
+    "HTTP_REQUEST_DB_DURATION",
+    "CELERY_TASK_RUNTIME",
+    "CELERY_TASK_QUEUE_WAIT",
+    "EXTERNAL_REQUEST_DURATION",
+    "EXTERNAL_REQUEST_ERRORS",
+]
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# ===== Database connection pool =====
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "workmate_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "workmate_db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT (pool exhausted)",
+    ["pool"],
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "workmate_db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CONNECTIONS_OPENED = Counter(
+    "workmate_db_pool_connections_opened_total",
+    "New DBAPI connections opened (first use, recycle, pre-ping failure)",
+    ["pool"],
+)
+
+
+# ===== HTTP =====
+
+HTTP_REQUEST_DURATION = Histogram(
+    "workmate_http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+HTTP_REQUESTS = Counter(
+    "workmate_http_requests_total",
+    "Requests by route template and status code",
+    ["method", "route", "status"],
+)
+
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "workmate_http_request_db_queries",
+    "SQL statements executed per request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+
+HTTP_REQUEST_DB_DURATION = Histogram(
+    "workmate_http_request_db_duration_seconds",
+    "Total SQL execution time per request",
+    ["route"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+
+# ===== Celery =====
+
+CELERY_TASK_RUNTIME = Histogram(
+    "workmate_celery_task_runtime_seconds",
+    "Task execution time by final state",
+    ["task", "state"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+)
+
+CELERY_TASK_QUEUE_WAIT = Histogram(
+    "workmate_celery_task_queue_wait_seconds",
+    "Time between publishing a task and a worker starting it",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+)
+
+
+# ===== Outbound APIs (Claude, Paperless, Google, CalDAV, FCM) =====
+
+EXTERNAL_REQUEST_DURATION = Histogram(
+    "workmate_external_request_duration_seconds",
+    "Latency of calls to external services",
+    ["service", "operation"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+EXTERNAL_REQUEST_ERRORS = Counter(
+    "workmate_external_request_errors_total",
+    "Calls to external services that raised",
+    ["service", "operation"],
+)
+
+
+@contextmanager
+def observe_external(service: str, operation: str) -> Iterator[None]:
+    """Time an outbound call and count it as an error if the block raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        EXTERNAL_REQUEST_ERRORS.labels(service, operation).inc()
+        raise
+    finally:
+        EXTERNAL_REQUEST_DURATION.labels(service, operation).observe(time.perf_counter() - started)
+
+
+def render_metrics() -> bytes:
+    """Exposition for GET /metrics, aggregated over processes in multiprocess mode"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
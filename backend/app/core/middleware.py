@@ -0,0 +1,139 @@
+"""
+ASGI middleware
+"""
+
+import time
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..db.query_stats import track_queries
+from .config import settings
+from .metrics import (
+    HTTP_REQUEST_DB_DURATION,
+    HTTP_REQUEST_DB_QUERIES,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+)
+from .query_budget import check_query_budget
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the matched route, e.g. /api/v1/tasks/{task_id}"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class PrometheusMiddleware:
+    """
+    Per-route latency, status counts and SQL statistics
+
+    Labelled by route template rather than the raw path to keep cardinality
+    bounded; requests that match no route are grouped as "unmatched".
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        with track_queries() as stats:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = route_template(scope)
+                method = scope["method"]
+                HTTP_REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - started)
+                HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+                HTTP_REQUEST_DB_QUERIES.labels(route).observe(stats.count)
+                HTTP_REQUEST_DB_DURATION.labels(route).observe(stats.duration)
+
+
+class QueryBudgetMiddleware:
+    """
+    Checks each request against the query budget declared on its endpoint
+
+    Call sites are only recorded with QUERY_BUDGET_TRACE_CALLSITES, since
+    walking the stack for every statement is not free.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(record_sites=settings.QUERY_BUDGET_TRACE_CALLSITES) as stats:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                check_query_budget(scope, route_template(scope), stats)
+
+
+# Boundaries, part headers and the other form fields of an upload
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects multipart uploads over MAX_UPLOAD_SIZE while they are received
+
+    Starlette parses the whole form (spooling the file to disk) before the
+    endpoint runs, so the endpoint's own size check comes too late. Requests
+    whose Content-Length is over the limit are answered 413 without reading
+    the body; chunked requests are cut off once the limit is crossed.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: Optional[int] = None):
+        self.app = app
+        self.max_body_size = max_body_size or settings.MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD
+
+    def _too_large(self) -> str:
+        return f"File size exceeds maximum allowed size of {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body_size:
+            response = JSONResponse({"detail": self._too_large()}, status_code=413, headers={"Connection": "close"})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def receive_limited() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # Re-raised by FastAPI's body parsing, answered by its exception handler
+                    raise HTTPException(status_code=413, detail=self._too_large())
+            return message
+
+        await self.app(scope, receive_limited, send)
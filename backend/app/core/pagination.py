@@ -0,0 +1,125 @@
+"""
+Keyset (cursor) pagination
+
+Lists are ordered by (sort column, id) and continued from the last row of the
+previous page instead of an OFFSET, so deep pages cost the same as the first
+one and rows do not shift between pages when others are inserted. Cursors are
+opaque to clients (base64 JSON) and bound to the sort they were issued for.
+
+The next cursor is returned in the X-Next-Cursor header, so the list
+response bodies stay plain arrays.
+
+Ascending sorts put NULLs last, descending sorts put them first - the order
+in which PostgreSQL reads a (user_id, column, id) index forwards/backwards.
+"""
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.sql import Select
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class SortKey:
+    """A sort option of a list endpoint, e.g. "-uploaded_at" """
+
+    def __init__(self, name: str, column, id_column, descending: bool):
+        self.name = name
+        self.column = column
+        self.id_column = id_column
+        self.descending = descending
+        self.nullable = column.property.columns[0].nullable
+
+    @property
+    def field(self) -> str:
+        return self.column.key
+
+
+def parse_sort(sort: str, columns: Dict[str, Any], id_column) -> SortKey:
+    """Resolve a sort parameter ("field" or "-field") against the allowed columns"""
+    field = sort.lstrip("-")
+    if field not in columns:
+        allowed = ", ".join(f"{name}, -{name}" for name in columns)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid sort '{sort}'. Allowed: {allowed}")
+    return SortKey(sort, columns[field], id_column, descending=sort.startswith("-"))
+
+
+def encode_cursor(sort_key: SortKey, value: Any, row_id: Any) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({"s": sort_key.name, "v": value, "id": str(row_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: SortKey) -> Tuple[Optional[datetime], uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        if payload["s"] != sort_key.name:
+            raise ValueError("cursor was issued for another sort")
+        value = datetime.fromisoformat(payload["v"]) if payload["v"] is not None else None
+        return value, uuid.UUID(payload["id"])
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _after(sort_key: SortKey, value: Optional[datetime], row_id: uuid.UUID):
+    """WHERE clause for the rows that follow (value, row_id) in sort order"""
+    column, id_column = sort_key.column, sort_key.id_column
+    if not sort_key.descending:
+        if value is None:
+            # Already in the trailing NULL block
+            return and_(column.is_(None), id_column > row_id)
+        after = tuple_(column, id_column) > tuple_(value, row_id)
+        return or_(after, column.is_(None)) if sort_key.nullable else after
+
+    if value is None:
+        # Leading NULL block: rest of it, then all non-NULL rows
+        return or_(and_(column.is_(None), id_column < row_id), column.isnot(None))
+    return tuple_(column, id_column) < tuple_(value, row_id)
+
+
+def paginate(query: Select, sort_key: SortKey, cursor: Optional[str], limit: int, skip: int = 0) -> Select:
+    """
+    Order the query by the sort key and continue after the cursor
+
+    Fetches limit + 1 rows; next_page() uses the extra row to tell whether
+    there is a next page. skip is only honoured without a cursor.
+    """
+    column, id_column = sort_key.column, sort_key.id_column
+    if sort_key.descending:
+        query = query.order_by(column.desc().nulls_first(), id_column.desc())
+    else:
+        query = query.order_by(column.asc().nulls_last(), id_column.asc())
+
+    if cursor:
+        query = query.where(_after(sort_key, *decode_cursor(cursor, sort_key)))
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit + 1)
+
+
+def next_page(items: Sequence, sort_key: SortKey, limit: int) -> Tuple[List, Optional[str]]:
+    """Trim the extra row and build the cursor for the next page (None on the last page)"""
+    items = list(items)
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    last = items[-1]
+    if isinstance(last, dict):
+        value, row_id = last[sort_key.field], last["id"]
+    else:
+        value, row_id = getattr(last, sort_key.field), last.id
+    return items, encode_cursor(sort_key, value, row_id)
+
+
+def set_next_cursor(response: Response, cursor: Optional[str]) -> None:
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
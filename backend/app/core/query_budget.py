@@ -0,0 +1,70 @@
+"""
+Per-route SQL query budgets
+
+Endpoints declare how many statements a request may execute:
+
+    @router.get("/", response_model=List[TaskResponse])
+    @query_budget(2)
+    async def get_tasks(...):
+
+The budget covers the whole request, including resolving current_user.
+Requests over budget are logged with the call sites that issued the
+statements (QUERY_BUDGET_TRACE_CALLSITES) and collected in `violations`
+while a test has enabled collection, see app/tests/conftest.py.
+"""
+
+import logging
+from typing import Callable, List, Optional
+
+from starlette.types import Scope
+
+from ..db.query_stats import QueryStats
+
+logger = logging.getLogger(__name__)
+
+# Statements repeated this often in one request are reported as likely N+1
+REPEATED_STATEMENT_THRESHOLD = 5
+
+
+class QueryBudgetViolation:
+    def __init__(self, method: str, route: str, budget: int, stats: QueryStats):
+        self.method = method
+        self.route = route
+        self.budget = budget
+        self.stats = stats
+
+    def __str__(self) -> str:
+        return f"{self.method} {self.route} exceeded its query budget of {self.budget}: {self.stats.report()}"
+
+
+# Filled while collect_violations is set (tests); never grows in production
+violations: List[QueryBudgetViolation] = []
+collect_violations = False
+
+
+def query_budget(max_queries: int) -> Callable:
+    """Declare the maximum number of SQL statements for an endpoint"""
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__query_budget__ = max_queries
+        return endpoint
+    return decorator
+
+
+def route_budget(scope: Scope) -> Optional[int]:
+    endpoint = getattr(scope.get("route"), "endpoint", None)
+    return getattr(endpoint, "__query_budget__", None)
+
+
+def check_query_budget(scope: Scope, route: str, stats: QueryStats) -> None:
+    """Log (and collect) the request if it went over its declared budget"""
+    budget = route_budget(scope)
+    if budget is not None and stats.count > budget:
+        violation = QueryBudgetViolation(scope["method"], route, budget, stats)
+        logger.warning(str(violation))
+        if collect_violations:
+            violations.append(violation)
+        return
+
+    repeated = stats.repeated_statements(REPEATED_STATEMENT_THRESHOLD)
+    if repeated:
+        logger.warning(f"{scope['method']} {route} repeats statements (possible N+1): {stats.report()}")
@@ -3,7 +3,13 @@ Security utilities for authentication and authorization
 """
 
 from datetime import datetime, timedelta
+import base64
+import hashlib
+import hmac
+import time
 from typing import Optional
+from urllib.parse import quote, urlencode
+from uuid import UUID
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from .config import settings
@@ -52,3 +58,56 @@ def decode_token(token: str) -> Optional[dict]:
         return payload
     except JWTError:
         return None
+
+
+def hash_api_key(api_key: str) -> str:
+    """SHA-256 digest of a service API key, as stored in users.api_key_hash"""
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def file_url_expires(now: Optional[float] = None) -> int:
+    """
+    Expiry of file URLs signed now (Unix time)
+
+    Rounded up to a quarter of FILE_URL_EXPIRE_MINUTES, so URLs signed in
+    the same window are identical and stay cacheable.
+    """
+    lifetime = settings.FILE_URL_EXPIRE_MINUTES * 60
+    step = max(lifetime // 4, 1)
+    return -(-(int(now or time.time()) + lifetime) // step) * step
+
+
+def sign_file_path(path: str, user_id: UUID, expires: int, backend: str = "local") -> str:
+    """HMAC-SHA256 (with SECRET_KEY) of a file path, its owner, the expiry and the storage backend"""
+    message = f"file\n{path}\n{user_id}\n{expires}\n{backend}".encode()
+    digest = hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def create_file_url(
+    path: str, user_id: UUID, expires: Optional[int] = None, backend: Optional[str] = None
+) -> str:
+    """
+    Signed URL of a stored file (relative to the server, outside /api/v1)
+
+    The storage backend (File.storage_backend) is signed with the path, so
+    the file is found where it is stored after STORAGE_BACKEND changes.
+    """
+    expires = expires or file_url_expires()
+    backend = backend or "local"
+    params = {"uid": str(user_id), "exp": expires}
+    if backend != "local":
+        params["b"] = backend
+    params["sig"] = sign_file_path(path, user_id, expires, backend)
+    return f"/files/{quote(path)}?{urlencode(params)}"
+
+
+def verify_file_signature(path: str, user_id: str, expires: str, signature: str, backend: str = "local") -> bool:
+    """Check a signed file URL without database access: valid signature and not expired"""
+    try:
+        user_id, expires = UUID(user_id), int(expires)
+    except (TypeError, ValueError):
+        return False
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(sign_file_path(path, user_id, expires, backend), signature)
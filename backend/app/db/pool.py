@@ -0,0 +1,110 @@
+"""
+Connection pool profiles and instrumentation
+
+Two profiles, both driven by settings:
+- "api":    the uvicorn process, sized for concurrent requests
+- "worker": a Celery prefork child, small pool or NullPool
+"""
+
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from ..core.config import settings
+from ..core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_TIMEOUTS,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_CONNECTIONS_OPENED,
+)
+
+PROFILES = ("api", "worker")
+
+
+class _CheckoutTimingMixin:
+    """
+    Records how long a checkout waited for a free connection
+
+    The pool's logging_name is used as metric label, because it is the one
+    custom attribute that survives Pool.recreate() on engine.dispose().
+    """
+
+    def _do_get(self):
+        label = getattr(self, "logging_name", None) or "default"
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.labels(pool=label).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(pool=label).observe(time.perf_counter() - started)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """QueuePool with checkout wait metrics"""
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout wait metrics"""
+
+
+def pool_options(database_url: str, profile: str, name: str, is_async: bool = False) -> dict:
+    """
+    Build create_engine() pool arguments for a profile
+
+    Args:
+        database_url: URL the engine is created for
+        profile: "api" or "worker"
+        name: Metric label / pool logging name, e.g. "api-sync"
+        is_async: Whether the options are for create_async_engine()
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown pool profile: {profile}")
+
+    if "sqlite" in database_url:
+        # SQLite (local dev) keeps SQLAlchemy's default pool for the dialect
+        return {"connect_args": {"check_same_thread": False}} if not is_async else {}
+
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_logging_name": name,
+    }
+
+    if profile == "worker" and settings.WORKER_DB_USE_NULLPOOL:
+        options["poolclass"] = NullPool
+        return options
+
+    if profile == "worker":
+        pool_size, max_overflow = settings.WORKER_DB_POOL_SIZE, settings.WORKER_DB_MAX_OVERFLOW
+    else:
+        pool_size, max_overflow = settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Track checked-out connections and newly opened connections of an engine's pool"""
+    checked_out = DB_POOL_CHECKED_OUT.labels(pool=name)
+    opened = DB_POOL_CONNECTIONS_OPENED.labels(pool=name)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        opened.inc()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checked_out.dec()
@@ -0,0 +1,125 @@
+"""
+Per-request SQL statistics
+
+Cursor events on every Engine (sync, async and the worker engines) add to the
+QueryStats of the current context, if one is active. The HTTP middleware opens
+one per request with track_queries(); nested blocks (e.g. the query_counter
+test fixture) also count towards the enclosing one.
+"""
+
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_BACKEND_DIR = os.path.dirname(_APP_DIR)
+# Frames from these modules are plumbing, not the code that issued the query
+_SKIP_FILES = (os.path.abspath(__file__), os.path.join(_APP_DIR, "core", "middleware.py"))
+
+
+class QueryStats:
+    """Statement count and total execution time of one unit of work"""
+
+    def __init__(self, record_sites: bool = False):
+        self.count = 0
+        self.duration = 0.0
+        self.record_sites = record_sites
+        self.statements: Counter = Counter()
+        self.sites: Counter = Counter()
+
+    def add(self, statement: str, duration: float, site: Optional[str]) -> None:
+        self.count += 1
+        self.duration += duration
+        # Always kept, so repeated statements (N+1) are found without call sites
+        self.statements[statement] += 1
+        if self.record_sites:
+            self.sites[site or "<unknown>"] += 1
+
+    def merge(self, other: "QueryStats") -> None:
+        self.count += other.count
+        self.duration += other.duration
+        self.statements.update(other.statements)
+        if self.record_sites:
+            self.sites.update(other.sites)
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least threshold times - the usual N+1 signature"""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+    def report(self, limit: int = 10) -> str:
+        """Human-readable summary with the call sites that issued the statements"""
+        lines = [f"{self.count} statements, {self.duration * 1000:.1f} ms"]
+        if not self.record_sites:
+            lines.append("  (call sites: set QUERY_BUDGET_TRACE_CALLSITES)")
+        for site, n in self.sites.most_common(limit):
+            lines.append(f"  {n:>4}x {site}")
+        for sql, n in self.repeated_statements(2)[:limit]:
+            lines.append(f"  repeated {n}x: {' '.join(sql.split())[:200]}")
+        return "\n".join(lines)
+
+
+# Mutable holder, so copies of the context (threadpool, greenlets) add to the same stats
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries(record_sites: bool = False) -> Iterator[QueryStats]:
+    """Collect the statements executed inside the block"""
+    parent = _current_stats.get()
+    stats = QueryStats(record_sites=record_sites or (parent is not None and parent.record_sites))
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+        if parent is not None:
+            parent.merge(stats)
+
+
+def _find_app_frame(frame) -> Optional[str]:
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_DIR) and filename not in _SKIP_FILES:
+            return f"{os.path.relpath(filename, _BACKEND_DIR)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def _call_site() -> Optional[str]:
+    """Innermost frame in app code outside the DB/middleware plumbing"""
+    site = _find_app_frame(sys._getframe(2))
+    if site is None:
+        # AsyncSession runs the sync ORM in a child greenlet; the awaiting
+        # endpoint code is on the stack of the parent greenlet
+        import greenlet
+        parent = greenlet.getcurrent().parent
+        if parent is not None:
+            site = _find_app_frame(parent.gr_frame)
+    return site
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_stats.get() is not None:
+        context._query_started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    started = getattr(context, "_query_started_at", None)
+    duration = time.perf_counter() - started if started is not None else 0.0
+    stats.add(statement, duration, _call_site() if stats.record_sites else None)
@@ -3,20 +3,65 @@ Database session management
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from starlette.concurrency import run_in_threadpool
+from typing import AsyncGenerator, Callable, Generator, TypeVar
 from ..core.config import settings
+from .pool import instrument_engine, pool_options
 
-# Create engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    echo=settings.DEBUG,
-)
+T = TypeVar("T")
+
+
+def _create_sync_engine(profile: str):
+    name = f"{profile}-sync"
+    new_engine = create_engine(
+        settings.DATABASE_URL,
+        echo=settings.DEBUG,
+        **pool_options(settings.DATABASE_URL, profile, name),
+    )
+    instrument_engine(new_engine, name)
+    return new_engine
+
+
+# Create engine (API profile; Celery workers switch in configure_engine)
+engine = _create_sync_engine("api")
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for the FastAPI request path (asyncpg / aiosqlite)
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    echo=settings.DEBUG,
+    **pool_options(settings.ASYNC_DATABASE_URL, "api", "api-async", is_async=True),
+)
+instrument_engine(async_engine.sync_engine, "api-async")
+
+# Async session factory - objects stay usable after commit, since an
+# implicit refresh would need IO outside of an await
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+def configure_engine(profile: str) -> None:
+    """
+    Replace the sync engine with one built for the given pool profile
+
+    Called from Celery's worker_process_init: the connections inherited from
+    the parent process are dropped without closing them (they belong to the
+    parent), and SessionLocal is rebound to a fresh engine.
+    """
+    global engine
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    engine = _create_sync_engine(profile)
+    SessionLocal.configure(bind=engine)
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -31,3 +76,34 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get an async database session
+    Usage:
+        @app.get("/items")
+        async def get_items(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(Item))
+            ...
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def run_with_sync_session(fn: Callable[[Session], T]) -> T:
+    """
+    Run a function that needs a sync Session in the threadpool
+
+    For services that are shared with the Celery workers and still speak the
+    sync Session API (CalendarSyncService, PaperlessSyncService). The function
+    gets its own SessionLocal, so the event loop is never blocked by it.
+    """
+    def _call() -> T:
+        db = SessionLocal()
+        try:
+            return fn(db)
+        finally:
+            db.close()
+
+    return await run_in_threadpool(_call)
@@ -3,25 +3,43 @@ Workmate Private Backend API
 Intelligent document and task management for ADHD
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 import time
 import platform
 
 from .core.config import settings
+from .core.metrics import CONTENT_TYPE_LATEST, render_metrics
+from .core.pagination import NEXT_CURSOR_HEADER
+from .core.middleware import PrometheusMiddleware, QueryBudgetMiddleware, UploadSizeLimitMiddleware
 from .api.v1 import api_router
 from .api.v1.files import router as files_router
+from .services.health_monitor import health_monitor
 
 START_TIME = time.time()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    health_monitor.start()
+    yield
+    await health_monitor.stop()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="Intelligent document and task management for ADHD",
     version=settings.VERSION,
     debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
+# Reject oversized uploads while receiving them (inside CORS, so the 413 has CORS headers)
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # CORS Middleware
 app.add_middleware(
     CORSMiddleware,
@@ -29,8 +47,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Upload-Offset"],
 )
 
+# Per-route SQL query budgets (logs N+1 patterns and over-budget routes)
+if settings.QUERY_BUDGET_ENABLED:
+    app.add_middleware(QueryBudgetMiddleware)
+
+# Request metrics (latency, status codes, SQL per request)
+app.add_middleware(PrometheusMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
@@ -49,22 +75,36 @@ def root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics"""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
+async def _health_snapshot() -> dict:
+    """Last probe results; probes once if the background loop has not run yet"""
+    await health_monitor.ensure_checked()
+    return health_monitor.snapshot()
+
+
 @app.get("/health")
-def health_check():
-    """Health check endpoint - JSON"""
+async def health_check():
+    """Health check endpoint - JSON (served from the background probe snapshot)"""
     uptime = int(time.time() - START_TIME)
-    db_ok = _check_db()
-    redis_ok = _check_redis()
+    snapshot = await _health_snapshot()
+    probes = snapshot["probes"]
     return {
-        "status": "healthy" if db_ok and redis_ok else "degraded",
+        "status": "healthy" if health_monitor.healthy else "degraded",
         "uptime_seconds": uptime,
         "environment": settings.ENVIRONMENT,
-        "services": {"database": db_ok, "redis": redis_ok},
+        "checked_at": snapshot["checked_at"],
+        "services": {"database": probes["database"]["ok"], "redis": probes["redis"]["ok"]},
+        "probes": probes,
     }
 
 
 @app.get("/health/ui", response_class=HTMLResponse)
-def health_dashboard():
+async def health_dashboard():
     """Health check dashboard"""
     uptime = int(time.time() - START_TIME)
     days, rem = divmod(uptime, 86400)
@@ -72,14 +112,24 @@ def health_dashboard():
     mins, secs = divmod(rem, 60)
     uptime_str = f"{days}d {hours}h {mins}m {secs}s" if days else f"{hours}h {mins}m {secs}s"
 
-    db_ok = _check_db()
-    redis_ok = _check_redis()
-    all_ok = db_ok and redis_ok
-
-    def badge(ok: bool) -> str:
-        color = "#10b981" if ok else "#ef4444"
-        text = "Online" if ok else "Offline"
-        return f'<span style="background:{color};color:#fff;padding:4px 12px;border-radius:9999px;font-size:13px;font-weight:600">{text}</span>'
+    snapshot = await _health_snapshot()
+    probes = snapshot["probes"]
+    all_ok = health_monitor.healthy
+
+    def badge(probe: dict) -> str:
+        if not probe["configured"]:
+            color, text = "#475569", "Nicht konfiguriert"
+        elif probe["ok"]:
+            color, text = "#10b981", "Online"
+        else:
+            color, text = "#ef4444", "Offline"
+        latency = ""
+        if probe["configured"] and probe["latency_ms"] is not None:
+            latency = f'<span class="latency">{probe["latency_ms"]:.0f} ms</span>'
+        return f'<span>{latency}<span class="badge" style="background:{color}">{text}</span></span>'
+
+    queue_depth = probes["celery"].get("queue_depth")
+    queue_text = queue_depth if queue_depth is not None else "-"
 
     status_color = "#10b981" if all_ok else "#f59e0b"
     status_text = "Healthy" if all_ok else "Degraded"
@@ -93,17 +143,21 @@ def health_dashboard():
 <title>Workmate Private - Health</title>
 <style>
 *{{margin:0;padding:0;box-sizing:border-box}}
-body{{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;background:#0f172a;color:#e2e8f0;min-height:100vh;display:flex;align-items:center;justify-content:center}}
+body{{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;background:#0f172a;color:#e2e8f0;
+  min-height:100vh;display:flex;align-items:center;justify-content:center}}
 .card{{background:#1e293b;border-radius:16px;padding:40px;max-width:480px;width:100%;box-shadow:0 25px 50px rgba(0,0,0,.4)}}
 .header{{text-align:center;margin-bottom:32px}}
 .header h1{{font-size:20px;color:#94a3b8;font-weight:400;margin-bottom:8px}}
 .status{{display:inline-flex;align-items:center;gap:10px;font-size:28px;font-weight:700}}
-.dot{{width:14px;height:14px;border-radius:50%;background:{status_color};box-shadow:0 0 12px {status_color};animation:pulse 2s infinite}}
+.dot{{width:14px;height:14px;border-radius:50%;background:{status_color};box-shadow:0 0 12px {status_color};
+  animation:pulse 2s infinite}}
 @keyframes pulse{{0%,100%{{opacity:1}}50%{{opacity:.5}}}}
 .grid{{display:grid;gap:16px}}
 .row{{display:flex;justify-content:space-between;align-items:center;padding:12px 16px;background:#0f172a;border-radius:10px}}
 .row .label{{color:#94a3b8;font-size:14px}}
 .row .value{{font-size:14px;font-weight:600}}
+.row .latency{{color:#64748b;font-size:12px;margin-right:10px}}
+.badge{{color:#fff;padding:4px 12px;border-radius:9999px;font-size:13px;font-weight:600}}
 .footer{{text-align:center;margin-top:24px;color:#475569;font-size:12px}}
 </style>
 </head>
@@ -118,32 +172,13 @@ body{{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;
     <div class="row"><span class="label">Version</span><span class="value">v{settings.VERSION}</span></div>
     <div class="row"><span class="label">Environment</span><span class="value">{settings.ENVIRONMENT}</span></div>
     <div class="row"><span class="label">Python</span><span class="value">{platform.python_version()}</span></div>
-    <div class="row"><span class="label">Database</span>{badge(db_ok)}</div>
-    <div class="row"><span class="label">Redis</span>{badge(redis_ok)}</div>
+    <div class="row"><span class="label">Database</span>{badge(probes["database"])}</div>
+    <div class="row"><span class="label">Redis</span>{badge(probes["redis"])}</div>
+    <div class="row"><span class="label">Celery Queue</span><span class="value">{queue_text}</span></div>
+    <div class="row"><span class="label">Paperless</span>{badge(probes["paperless"])}</div>
+    <div class="row"><span class="label">Claude API</span>{badge(probes["claude"])}</div>
   </div>
-  <div class="footer">Auto-refresh alle 30s</div>
+  <div class="footer">Geprüft {snapshot["checked_at"] or "-"} UTC · Auto-refresh alle 30s</div>
 </div>
 </body>
 </html>"""
-
-
-def _check_db() -> bool:
-    try:
-        from .db.session import SessionLocal
-        from sqlalchemy import text
-        db = SessionLocal()
-        db.execute(text("SELECT 1"))
-        db.close()
-        return True
-    except Exception:
-        return False
-
-
-def _check_redis() -> bool:
-    try:
-        import redis
-        r = redis.from_url(settings.CELERY_BROKER_URL)
-        r.ping()
-        return True
-    except Exception:
-        return False
@@ -6,10 +6,14 @@ from .user import User
 from .document import Document
 from .task import Task, TaskStatus, TaskPriority
 from .file import File
+from .blob import Blob
 from .reminder import Reminder, ReminderSeverity, ReminderStatus
 from .session import Session
 from .calendar_event import CalendarEvent, CalendarSyncStatus
 from .integration import Integration, IntegrationType, SyncDirection
+from .collection_version import CollectionVersion
+from .sync_change import SyncChange
+from .upload_session import UploadSession
 
 __all__ = [
     "User",
@@ -18,6 +22,7 @@ __all__ = [
     "TaskStatus",
     "TaskPriority",
     "File",
+    "Blob",
     "Reminder",
     "ReminderSeverity",
     "ReminderStatus",
@@ -27,4 +32,7 @@ __all__ = [
     "Integration",
     "IntegrationType",
     "SyncDirection",
+    "CollectionVersion",
+    "SyncChange",
+    "UploadSession",
 ]
@@ -0,0 +1,33 @@
+"""
+Blob model
+"""
+
+from sqlalchemy import Column, String, BigInteger, Integer, DateTime
+from datetime import datetime
+
+from ..db.base import Base
+
+
+class Blob(Base):
+    """
+    Content-addressed stored file, shared by all File rows with its checksum
+    in the same storage backend
+
+    The same content in another backend (stored again after STORAGE_BACKEND
+    changed) is another blob with its own count. ref_count is the number of
+    File rows using the blob; the stored file is
+    removed after it drops to zero (see FileStorageService.release and
+    purge). Files uploaded before content addressing have no blob row.
+    """
+
+    __tablename__ = "blobs"
+
+    checksum = Column(String(64), primary_key=True)  # SHA256
+    backend = Column(String(50), primary_key=True)  # File.storage_backend: local, s3
+    path = Column(String(500), nullable=False)  # key in the storage backend (File.path)
+    size_bytes = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Blob {self.checksum[:16]} in {self.backend} refs={self.ref_count}>"
@@ -2,7 +2,7 @@
 Calendar Event model
 """
 
-from sqlalchemy import Column, String, DateTime, Boolean, JSON, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, Boolean, JSON, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -24,6 +24,10 @@ class CalendarEvent(Base):
     """Calendar events that sync with external calendars"""
 
     __tablename__ = "calendar_events"
+    __table_args__ = (
+        # Keyset pagination of GET /calendar/events/ (app/core/pagination.py)
+        Index("ix_calendar_events_user_id_start_time_id", "user_id", "start_time", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -0,0 +1,168 @@
+"""
+Collection version model
+"""
+
+from sqlalchemy import Column, String, BigInteger, ForeignKey, event, select
+from sqlalchemy.dialects.postgresql import UUID, insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, object_session
+
+from ..db.base import Base
+from .reminder import Reminder
+from .sync_change import SyncChange
+from .task import Task
+
+
+class CollectionVersion(Base):
+    """
+    Per-user change counter of a list endpoint's collection
+
+    Bumped in the same flush as every ORM insert, update or delete of a row
+    that appears in the collection, so it only moves when the list could
+    have changed. Used for the ETags of the list endpoints (app/core/etag.py)
+    and, as collection "sync", for the change cursor of GET /sync/changes.
+
+    Query-level UPDATE/DELETE statements bypass the flush and are not counted.
+    """
+
+    __tablename__ = "collection_versions"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    collection = Column(String(50), primary_key=True)  # tasks, documents, calendar_events, integrations
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+# Mapped class name -> collection whose list shows its rows
+COLLECTION_OF = {
+    "Task": "tasks",
+    "Document": "documents",
+    "File": "documents",  # nested in the document list
+    "CalendarEvent": "calendar_events",
+    "Integration": "integrations",
+}
+
+# Mapped class name -> entity of GET /sync/changes (SyncChange.entity)
+SYNC_ENTITY_OF = {
+    "Task": "task",
+    "Document": "document",
+    "CalendarEvent": "calendar_event",
+    "Reminder": "reminder",
+}
+
+# Collection row holding the user's change sequence (SyncChange.seq). The
+# upsert locks it until commit, so concurrent writers of one user commit in
+# sequence order and a client cursor never skips a change committed later.
+SYNC_COLLECTION = "sync"
+
+
+def _tracked(session: Session) -> dict:
+    """Instances written by the current flush -> deleted"""
+    return session.info.setdefault("collection_changes", {})
+
+
+def _track(session: Session, instance, deleted: bool) -> None:
+    name = type(instance).__name__
+    if name in COLLECTION_OF or name in SYNC_ENTITY_OF:
+        _tracked(session)[instance] = deleted
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_changes(session: Session, flush_context, instances) -> None:
+    """Rows the flush will write; their owner columns may still be loaded here if expired"""
+    for instance in session.new:
+        _track(session, instance, False)
+    for instance in session.dirty:
+        if session.is_modified(instance, include_collections=False):
+            _track(session, instance, False)
+    for instance in session.deleted:
+        _track(session, instance, True)
+    for instance in _tracked(session):
+        if instance not in session.new:
+            getattr(instance, "task_id" if isinstance(instance, Reminder) else "user_id")
+
+
+@event.listens_for(Base, "after_delete", propagate=True)
+def _collect_cascaded_delete(mapper, connection, target) -> None:
+    """Orphans and cascades are only decided during the flush"""
+    session = object_session(target)
+    if session is not None:
+        _track(session, target, True)
+
+
+def _owners(session: Session, instances) -> dict:
+    """Instance -> user_id; reminders belong to the user of their task"""
+    owners = {}
+    task_ids = set()
+    for instance in instances:
+        if isinstance(instance, Reminder):
+            task_ids.add(instance.__dict__.get("task_id"))
+        else:
+            owners[instance] = instance.__dict__.get("user_id")
+
+    task_owners = {}
+    for task_id in task_ids - {None}:
+        task = session.identity_map.get(session.identity_key(Task, task_id))
+        if task is not None and "user_id" in task.__dict__:
+            task_owners[task_id] = task.user_id
+    missing = task_ids - set(task_owners) - {None}
+    if missing:
+        rows = session.connection().execute(select(Task.id, Task.user_id).where(Task.id.in_(missing)))
+        task_owners.update({row.id: row.user_id for row in rows})
+
+    for instance in instances:
+        if isinstance(instance, Reminder):
+            owners[instance] = task_owners.get(instance.__dict__.get("task_id"))
+    return owners
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_collection_versions(session: Session, flush_context) -> None:
+    """
+    One upsert per flush for every (user, collection) the flush touched;
+    if synced rows were written, a second one records them in sync_changes
+    """
+    tracked = session.info.pop("collection_changes", None)
+    if not tracked:
+        return
+
+    collections = set()
+    sync_changes = {}
+    for instance, user_id in _owners(session, tracked).items():
+        if user_id is None:
+            continue
+        name = type(instance).__name__
+        if name in COLLECTION_OF:
+            collections.add((user_id, COLLECTION_OF[name]))
+        if name in SYNC_ENTITY_OF:
+            sync_changes[(user_id, SYNC_ENTITY_OF[name], instance.__dict__["id"])] = tracked[instance]
+            collections.add((user_id, SYNC_COLLECTION))
+    if not collections:
+        return
+
+    connection = session.connection()
+    insert = postgresql_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    table = CollectionVersion.__table__
+    statement = insert(table).values([
+        {"user_id": user_id, "collection": collection, "version": 1}
+        for user_id, collection in sorted(collections, key=str)
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.collection],
+        set_={"version": table.c.version + 1},
+    )
+    if not sync_changes:
+        connection.execute(statement)
+        return
+
+    versions = connection.execute(statement.returning(table.c.user_id, table.c.collection, table.c.version))
+    seq = {row.user_id: row.version for row in versions if row.collection == SYNC_COLLECTION}
+
+    changes = SyncChange.__table__
+    statement = insert(changes).values([
+        {"user_id": user_id, "entity": entity, "entity_id": entity_id, "seq": seq[user_id], "deleted": deleted}
+        for (user_id, entity, entity_id), deleted in sync_changes.items()
+    ])
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=[changes.c.user_id, changes.c.entity, changes.c.entity_id],
+        set_={"seq": statement.excluded.seq, "deleted": statement.excluded.deleted},
+    ))
@@ -2,9 +2,9 @@
 Document model
 """
 
-from sqlalchemy import Column, String, Float, Text, DateTime, JSON, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Float, Text, DateTime, JSON, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 import uuid
 
@@ -15,6 +15,12 @@ class Document(Base):
     """Document model for uploaded files"""
 
     __tablename__ = "documents"
+    __table_args__ = (
+        # Keyset pagination of GET /documents/ (app/core/pagination.py)
+        Index("ix_documents_user_id_uploaded_at_id", "user_id", "uploaded_at", "id"),
+        # Full-text search (GET /search), see app/services/search_service.py
+        Index("ix_documents_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -36,6 +42,9 @@ class Document(Base):
     uploaded_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
     processed_at = Column(DateTime)
 
+    # Full-text search; maintained by a database trigger, never written by the ORM
+    search_vector = deferred(Column(TSVECTOR().with_variant(Text(), "sqlite")))
+
     # Relationships
     user = relationship("User", back_populates="documents")
     file = relationship("File", back_populates="document")
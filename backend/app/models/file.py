@@ -2,7 +2,7 @@
 File model
 """
 
-from sqlalchemy import Column, String, BigInteger, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, BigInteger, Text, DateTime, JSON, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -30,7 +30,9 @@ class File(Base):
     storage_backend = Column(String(50), default="local")  # local, s3
 
     # Processing
-    thumbnail_path = Column(String(500))
+    thumbnail_path = Column(String(500))  # directory with <size>.webp, see FileStorageService.thumbnail_dir()
+    thumbnail_sizes = Column(JSON)  # rendered sizes (long edge in px), e.g. [960, 480, 160]
+    normalized_path = Column(String(500))  # images: rendition for OCR/AI, see FileStorageService.normalized_path()
     extracted_text = Column(Text)
     ocr_language = Column(String(10))
 
@@ -0,0 +1,35 @@
+"""
+Sync change model
+"""
+
+from sqlalchemy import Column, String, BigInteger, Boolean, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..db.base import Base
+
+
+class SyncChange(Base):
+    """
+    Latest change of a synced row, for GET /sync/changes
+
+    One row per task, document, calendar event or reminder that was ever
+    written, so the log grows with the data, not with the number of edits.
+    seq is the user's change sequence at the time of the last write;
+    deleted rows stay as tombstones (deleted=True) after the row itself is
+    gone. Written by the flush hook in app/models/collection_version.py.
+    """
+
+    __tablename__ = "sync_changes"
+    __table_args__ = (
+        # Changes since a cursor, in order
+        Index("ix_sync_changes_user_id_seq", "user_id", "seq"),
+    )
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    entity = Column(String(30), primary_key=True)  # task, document, calendar_event, reminder
+    entity_id = Column(UUID(as_uuid=True), primary_key=True)
+    seq = Column(BigInteger, nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False)
+
+    def __repr__(self):
+        return f"<SyncChange {self.entity} {self.entity_id} seq={self.seq}>"
@@ -2,9 +2,9 @@
 Task model
 """
 
-from sqlalchemy import Column, String, Text, DateTime, Integer, Numeric, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, DateTime, Integer, Numeric, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 import uuid
 from enum import Enum
@@ -32,6 +32,12 @@ class Task(Base):
     """Task model"""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pagination of GET /tasks/ (app/core/pagination.py)
+        Index("ix_tasks_user_id_due_date_id", "user_id", "due_date", "id"),
+        # Full-text search (GET /search), see app/services/search_service.py
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -59,6 +65,9 @@ class Task(Base):
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     completed_at = Column(DateTime)
 
+    # Full-text search; maintained by a database trigger, never written by the ORM
+    search_vector = deferred(Column(TSVECTOR().with_variant(Text(), "sqlite")))
+
     # Relationships
     user = relationship("User", back_populates="tasks")
     document = relationship("Document", back_populates="tasks")
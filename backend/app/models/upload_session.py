@@ -0,0 +1,44 @@
+"""
+Upload session model
+"""
+
+from sqlalchemy import Column, String, BigInteger, Boolean, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+import uuid
+
+from ..db.base import Base
+
+
+class UploadSession(Base):
+    """
+    Resumable upload in progress (POST /uploads)
+
+    The received bytes are appended to a part file below UPLOAD_DIR/.tmp
+    (FileStorageService.upload_part_path); its size is the upload offset,
+    so a chunk cut off mid-way is kept up to the last byte written and no
+    row is written per chunk. Deleted when the upload is completed,
+    cancelled or expired (cleanup_upload_sessions).
+    """
+
+    __tablename__ = "upload_sessions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # File
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(100), nullable=False)
+    size_bytes = Column(BigInteger, nullable=False)  # announced total size
+
+    # Document created on completion
+    document_type = Column(String(50), nullable=False, default="other")
+    title = Column(String(255))
+    force_processing = Column(Boolean, nullable=False, default=False)
+
+    # Timestamps
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<UploadSession {self.filename} {self.size_bytes} bytes>"
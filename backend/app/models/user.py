@@ -34,7 +34,9 @@ class User(Base):
     fcm_token = Column(String(255), nullable=True)
 
     # Service API Key (permanent, für externe Dienste wie Morning Briefing)
-    api_key = Column(String(64), nullable=True, unique=True, index=True)
+    # Only the SHA-256 digest is stored; the prefix lets users recognise their key
+    api_key_hash = Column(String(64), nullable=True, unique=True, index=True)
+    api_key_prefix = Column(String(8), nullable=True)
 
     # Status
     is_active = Column(Boolean, default=True)
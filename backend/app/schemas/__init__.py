@@ -4,15 +4,33 @@ Schemas package
 
 from .user import UserBase, UserCreate, UserUpdate, UserSettingsUpdate, UserResponse, UserLogin
 from .token import Token, TokenPayload
-from .task import TaskBase, TaskCreate, TaskUpdate, TaskResponse
+from .task import (
+    TaskBase,
+    TaskCreate,
+    TaskUpdate,
+    TaskResponse,
+    TaskRollup,
+    TaskTreeNode,
+    TaskBulkOperation,
+    TaskBulkRequest,
+    TaskBulkResult,
+    TaskBulkResponse,
+)
 from .document import (
     DocumentBase,
     DocumentCreate,
     DocumentUpdate,
     DocumentResponse,
     DocumentWithFileResponse,
+    DocumentSummaryResponse,
+    DocumentSummaryWithFileResponse,
+    DocumentTextResponse,
     FileResponse,
 )
+from .search import SearchHit, SearchResponse
+from .reminder import ReminderResponse
+from .sync import SyncTombstone, SyncChangesResponse
+from .upload import UploadSessionCreate, UploadSessionResponse
 from .calendar import (
     CalendarEventBase,
     CalendarEventCreate,
@@ -38,12 +56,28 @@ __all__ = [
     "TaskCreate",
     "TaskUpdate",
     "TaskResponse",
+    "TaskRollup",
+    "TaskTreeNode",
+    "TaskBulkOperation",
+    "TaskBulkRequest",
+    "TaskBulkResult",
+    "TaskBulkResponse",
     "DocumentBase",
     "DocumentCreate",
     "DocumentUpdate",
     "DocumentResponse",
     "DocumentWithFileResponse",
+    "DocumentSummaryResponse",
+    "DocumentSummaryWithFileResponse",
+    "DocumentTextResponse",
     "FileResponse",
+    "SearchHit",
+    "SearchResponse",
+    "ReminderResponse",
+    "SyncTombstone",
+    "SyncChangesResponse",
+    "UploadSessionCreate",
+    "UploadSessionResponse",
     "CalendarEventBase",
     "CalendarEventCreate",
     "CalendarEventUpdate",
@@ -2,11 +2,13 @@
 Document schemas
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field, computed_field
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from uuid import UUID
 
+from ..core.security import create_file_url
+
 
 class DocumentBase(BaseModel):
     """Base document schema"""
@@ -26,15 +28,14 @@ class DocumentUpdate(BaseModel):
     doc_metadata: Optional[Dict[str, Any]] = None
 
 
-class DocumentResponse(DocumentBase):
-    """Schema for document response"""
+class DocumentSummaryResponse(DocumentBase):
+    """Schema for document in lists, without extracted_text (see GET /documents/{id}/text)"""
     id: UUID
     user_id: UUID
     file_id: Optional[UUID] = None
     doc_metadata: Dict[str, Any] = {}
     processing_status: str
     confidence_score: Optional[float] = None
-    extracted_text: Optional[str] = None
     uploaded_at: datetime
     processed_at: Optional[datetime] = None
 
@@ -42,6 +43,29 @@ class DocumentResponse(DocumentBase):
         from_attributes = True
 
 
+class DocumentResponse(DocumentSummaryResponse):
+    """Schema for document response"""
+    extracted_text: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+def thumbnail_urls(
+    thumbnail_path: Optional[str],
+    sizes: Optional[List[int]],
+    user_id: UUID,
+    expires: Optional[int] = None,
+    backend: Optional[str] = None,
+) -> Dict[str, str]:
+    if not thumbnail_path:
+        return {}
+    return {
+        str(size): create_file_url(f"{thumbnail_path}/{size}.webp", user_id, expires, backend)
+        for size in sorted(sizes or [])
+    }
+
+
 class FileResponse(BaseModel):
     """Schema for file response"""
     id: UUID
@@ -50,6 +74,33 @@ class FileResponse(BaseModel):
     mime_type: str
     path: str
     created_at: datetime
+    # For the signed URLs only
+    user_id: UUID = Field(exclude=True)
+    thumbnail_path: Optional[str] = Field(None, exclude=True)
+    thumbnail_sizes: Optional[List[int]] = Field(None, exclude=True)
+    storage_backend: Optional[str] = Field(None, exclude=True)
+
+    @computed_field
+    @property
+    def url(self) -> str:
+        """Signed URL of the file (GET /files/{path}), expires after FILE_URL_EXPIRE_MINUTES"""
+        return create_file_url(self.path, self.user_id, backend=self.storage_backend)
+
+    @computed_field
+    @property
+    def thumbnails(self) -> Dict[str, str]:
+        """Signed URLs of the WebP thumbnails by size (long edge in px); empty until rendered"""
+        return thumbnail_urls(self.thumbnail_path, self.thumbnail_sizes, self.user_id, backend=self.storage_backend)
+
+    @staticmethod
+    def sign_row(row: Dict[str, Any], expires: Optional[int] = None) -> Dict[str, Any]:
+        """Replace the signing columns of a response_columns() row with url and thumbnails"""
+        user_id, backend = row.pop("user_id"), row.pop("storage_backend")
+        row["url"] = create_file_url(row["path"], user_id, expires, backend)
+        row["thumbnails"] = thumbnail_urls(
+            row.pop("thumbnail_path"), row.pop("thumbnail_sizes"), user_id, expires, backend
+        )
+        return row
 
     class Config:
         from_attributes = True
@@ -61,3 +112,20 @@ class DocumentWithFileResponse(DocumentResponse):
 
     class Config:
         from_attributes = True
+
+
+class DocumentSummaryWithFileResponse(DocumentSummaryResponse):
+    """Schema for document list entry with file info"""
+    file: Optional[FileResponse] = None
+
+    class Config:
+        from_attributes = True
+
+
+class DocumentTextResponse(BaseModel):
+    """One page of a document's extracted text"""
+    document_id: UUID
+    offset: int  # in characters
+    text: str
+    total_length: int  # of the whole text, in characters
+    next_offset: Optional[int] = None  # None on the last page
@@ -0,0 +1,25 @@
+"""
+Reminder schemas for API responses
+"""
+
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+import uuid
+
+
+class ReminderResponse(BaseModel):
+    """Schema for reminder response"""
+    id: uuid.UUID
+    task_id: uuid.UUID
+    trigger_at: datetime
+    severity: str
+    channels: Optional[List[str]] = None
+    status: str
+    sent_at: Optional[datetime] = None
+    acknowledged_at: Optional[datetime] = None
+    snoozed_until: Optional[datetime] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
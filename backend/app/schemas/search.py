@@ -0,0 +1,26 @@
+"""
+Search schemas for API responses
+"""
+
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+import uuid
+
+
+class SearchHit(BaseModel):
+    """One task or document matching the query"""
+    kind: str  # task or document
+    id: uuid.UUID
+    title: Optional[str] = None
+    snippet: Optional[str] = None  # HTML-escaped, matches wrapped in <mark>
+    rank: float
+    status: Optional[str] = None  # tasks
+    type: Optional[str] = None  # documents
+    date: Optional[datetime] = None  # due date of tasks, upload date of documents
+
+
+class SearchResponse(BaseModel):
+    """Schema for the GET /search response"""
+    query: str
+    results: List[SearchHit]
@@ -0,0 +1,29 @@
+"""
+Sync schemas for API responses
+"""
+
+from pydantic import BaseModel
+from typing import List
+import uuid
+
+from .calendar import CalendarEventResponse
+from .document import DocumentSummaryResponse
+from .reminder import ReminderResponse
+from .task import TaskResponse
+
+
+class SyncTombstone(BaseModel):
+    """A deleted row"""
+    entity: str  # task, document, calendar_event or reminder
+    id: uuid.UUID
+
+
+class SyncChangesResponse(BaseModel):
+    """Schema for the GET /sync/changes response"""
+    cursor: int  # pass as since to get the next changes
+    has_more: bool
+    tasks: List[TaskResponse] = []
+    documents: List[DocumentSummaryResponse] = []  # without extracted_text
+    calendar_events: List[CalendarEventResponse] = []
+    reminders: List[ReminderResponse] = []
+    deleted: List[SyncTombstone] = []
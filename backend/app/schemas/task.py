@@ -3,7 +3,7 @@ Task schemas for API requests/responses
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 import uuid
@@ -48,3 +48,49 @@ class TaskResponse(TaskBase):
 
     class Config:
         from_attributes = True
+
+
+class TaskRollup(BaseModel):
+    """Aggregates over a task and all of its subtasks (computed in SQL)"""
+    task_count: int
+    open_count: int  # open or in_progress
+    total_amount: Optional[Decimal] = None
+    earliest_due_date: Optional[datetime] = None  # of the open tasks
+
+
+class TaskTreeNode(TaskResponse):
+    """Schema for a task with its nested subtasks"""
+    rollup: TaskRollup
+    subtasks: List["TaskTreeNode"] = []
+
+
+class TaskBulkOperation(BaseModel):
+    """One item of a bulk request: create (with task), update (with id and changes) or delete (with id)"""
+    op: str = Field(..., pattern="^(create|update|delete)$")
+    id: Optional[uuid.UUID] = None
+    task: Optional[TaskCreate] = None
+    changes: Optional[TaskUpdate] = None
+
+
+class TaskBulkRequest(BaseModel):
+    """Schema for POST /tasks/bulk"""
+    operations: List[TaskBulkOperation] = Field(..., min_length=1, max_length=500)
+
+
+class TaskBulkResult(BaseModel):
+    """Result of one bulk operation, in request order"""
+    index: int
+    op: str
+    status: str  # created, updated, deleted or error
+    id: Optional[uuid.UUID] = None
+    task: Optional[TaskResponse] = None
+    error: Optional[str] = None
+
+
+class TaskBulkResponse(BaseModel):
+    """Schema for the POST /tasks/bulk response"""
+    results: List[TaskBulkResult]
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    failed: int = 0
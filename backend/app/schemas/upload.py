@@ -0,0 +1,28 @@
+"""
+Resumable upload schemas
+"""
+
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+from uuid import UUID
+
+
+class UploadSessionCreate(BaseModel):
+    """Schema for starting a resumable upload"""
+    filename: str = Field(..., max_length=255)
+    content_type: str
+    size_bytes: int = Field(..., gt=0, description="Total size of the file")
+    type: str = Field("other", description="Document type: invoice, reminder, contract, receipt, other")
+    title: Optional[str] = Field(None, max_length=255)
+    force_processing: bool = False
+
+
+class UploadSessionResponse(BaseModel):
+    """Schema for a resumable upload in progress"""
+    id: UUID
+    filename: str
+    content_type: str
+    size_bytes: int
+    offset: int  # bytes received; send the next chunk from here
+    expires_at: datetime
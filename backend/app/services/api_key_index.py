@@ -0,0 +1,75 @@
+"""
+Lookup index for X-API-Key authentication
+
+Keys are only known by their SHA-256 digest. The index keeps:
+- a bounded cache of valid digests -> user id
+- a short-lived negative cache of digests that matched no active user
+
+so scripted clients and repeated wrong keys do not cost a query per call.
+Malformed keys (not 64 hex characters, see POST /auth/api-key) are rejected
+before any lookup.
+"""
+
+import string
+import uuid
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..models import User
+
+_HEX_DIGITS = set(string.hexdigits)
+API_KEY_LENGTH = 64
+
+
+def is_well_formed(api_key: str) -> bool:
+    return len(api_key) == API_KEY_LENGTH and set(api_key) <= _HEX_DIGITS
+
+
+class ApiKeyIndex:
+    """Positive and negative digest caches in front of users.api_key_hash"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int, negative_ttl_seconds: int):
+        self._valid = TTLCache(max_entries, ttl_seconds)
+        self._invalid = TTLCache(max_entries, negative_ttl_seconds)
+
+    async def resolve(self, db: AsyncSession, digest: str) -> Optional[uuid.UUID]:
+        """User id for an API key digest, or None if no active user has it"""
+        user_id = self._valid.get(digest)
+        if user_id is not None:
+            return user_id
+        if self._invalid.get(digest):
+            return None
+
+        user_id = await db.scalar(
+            select(User.id).where(User.api_key_hash == digest, User.is_active == True)
+        )
+        if user_id is None:
+            self._invalid.set(digest, True)
+        else:
+            self._valid.set(digest, user_id)
+        return user_id
+
+    def remember(self, digest: str, user_id: uuid.UUID) -> None:
+        """Register a freshly generated key"""
+        self._invalid.delete(digest)
+        self._valid.set(digest, user_id)
+
+    def forget(self, digest: str) -> None:
+        """Drop a digest that turned out to be stale (key rotated, user deactivated)"""
+        self._valid.delete(digest)
+        self._invalid.set(digest, True)
+
+    def clear(self) -> None:
+        self._valid.clear()
+        self._invalid.clear()
+
+
+api_key_index = ApiKeyIndex(
+    max_entries=settings.API_KEY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.API_KEY_CACHE_TTL_SECONDS,
+    negative_ttl_seconds=settings.API_KEY_NEGATIVE_CACHE_TTL_SECONDS,
+)
@@ -11,6 +11,8 @@ from icalendar import Calendar, Event as iCalEvent
 import uuid
 import logging
 
+from ..core.metrics import observe_external
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,8 +34,9 @@ class CalDAVService:
             password=password
         )
         try:
-            self.principal = self.client.principal()
-            self.calendars = self.principal.calendars()
+            with observe_external("caldav", "connect"):
+                self.principal = self.client.principal()
+                self.calendars = self.principal.calendars()
             logger.info(f"Connected to CalDAV server: {url}")
         except Exception as e:
             logger.error(f"Failed to connect to CalDAV: {e}")
@@ -92,7 +95,8 @@ class CalDAVService:
 
         # Save to calendar
         try:
-            event = calendar.save_event(ical)
+            with observe_external("caldav", "save_event"):
+                event = calendar.save_event(ical)
             logger.info(f"Created event '{title}' in calendar '{calendar_name}'")
             return str(event.id) if hasattr(event, 'id') else event.url
         except Exception as e:
@@ -127,7 +131,8 @@ class CalDAVService:
 
         try:
             event.data = ical
-            event.save()
+            with observe_external("caldav", "update_event"):
+                event.save()
             logger.info(f"Updated event {event_id}")
         except Exception as e:
             logger.error(f"Failed to update event: {e}")
@@ -139,7 +144,8 @@ class CalDAVService:
 
         if event:
             try:
-                event.delete()
+                with observe_external("caldav", "delete_event"):
+                    event.delete()
                 logger.info(f"Deleted event {event_id}")
             except Exception as e:
                 logger.error(f"Failed to delete event: {e}")
@@ -171,7 +177,8 @@ class CalDAVService:
             end_date = datetime.now() + timedelta(days=365)
 
         try:
-            events = calendar.date_search(start=start_date, end=end_date)
+            with observe_external("caldav", "date_search"):
+                events = calendar.date_search(start=start_date, end=end_date)
             logger.info(f"Fetched {len(events)} events from '{calendar_name}'")
 
             parsed_events = []
@@ -255,7 +262,8 @@ class CalDAVService:
         """Find event across all calendars by ID/URL"""
         for calendar in self.calendars:
             try:
-                events = calendar.events()
+                with observe_external("caldav", "events"):
+                    events = calendar.events()
                 for event in events:
                     if (hasattr(event, 'id') and str(event.id) == event_id) or event.url == event_id:
                         return event
@@ -5,14 +5,17 @@ Handles bidirectional synchronization between local calendar events and external
 
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Tuple, Optional
+from typing import TYPE_CHECKING, List, Dict, Tuple, Optional
 import logging
 
 from ..models import CalendarEvent, Integration, User
 from ..models.calendar_event import CalendarSyncStatus
 from ..models.integration import IntegrationType, SyncDirection
-from .caldav_service import CalDAVService
-from .google_calendar_service import GoogleCalendarService
+
+if TYPE_CHECKING:
+    # caldav/icalendar and googleapiclient are imported on first sync only
+    from .caldav_service import CalDAVService
+    from .google_calendar_service import GoogleCalendarService
 
 logger = logging.getLogger(__name__)
 
@@ -105,6 +108,7 @@ class CalendarSyncService:
 
         try:
             # Initialize CalDAV service
+            from .caldav_service import CalDAVService
             caldav_service = CalDAVService(
                 url=integration.config.get('url'),
                 username=integration.credentials.get('username'),
@@ -136,7 +140,7 @@ class CalendarSyncService:
 
     async def _pull_from_caldav(
         self,
-        caldav_service: CalDAVService,
+        caldav_service: "CalDAVService",
         calendar_name: str,
         integration: Integration,
         user: User,
@@ -231,7 +235,7 @@ class CalendarSyncService:
 
     async def _push_to_caldav(
         self,
-        caldav_service: CalDAVService,
+        caldav_service: "CalDAVService",
         calendar_name: str,
         integration: Integration,
         user: User,
@@ -354,6 +358,7 @@ class CalendarSyncService:
 
         try:
             # Initialize Google Calendar service with OAuth credentials
+            from .google_calendar_service import GoogleCalendarService
             google_service = GoogleCalendarService(integration.credentials)
 
             calendar_id = integration.config.get('calendar_id', 'primary')
@@ -386,7 +391,7 @@ class CalendarSyncService:
 
     async def _pull_from_google(
         self,
-        google_service: GoogleCalendarService,
+        google_service: "GoogleCalendarService",
         calendar_id: str,
         integration: Integration,
         user: User,
@@ -493,7 +498,7 @@ class CalendarSyncService:
 
     async def _push_to_google(
         self,
-        google_service: GoogleCalendarService,
+        google_service: "GoogleCalendarService",
         calendar_id: str,
         integration: Integration,
         user: User,
@@ -2,7 +2,6 @@
 AI Service for document analysis with Claude
 """
 
-from anthropic import Anthropic
 from typing import Optional
 import json
 import base64
@@ -10,6 +9,7 @@ from pathlib import Path
 import logging
 
 from ..core.config import settings
+from ..core.metrics import observe_external
 
 logger = logging.getLogger(__name__)
 
@@ -20,17 +20,20 @@ class ClaudeService:
     def __init__(self):
         if not settings.CLAUDE_API_KEY:
             raise ValueError("CLAUDE_API_KEY is not set in environment")
+        # Imported here: the SDK is heavy and only the document workers need it
+        from anthropic import Anthropic
         self.client = Anthropic(api_key=settings.CLAUDE_API_KEY)
         self.model = "claude-sonnet-4-6"
 
     def analyze_document(self, text: str, document_type: Optional[str] = None) -> dict:
         """Analyze OCR-extracted document text and return structured metadata."""
         prompt = self._build_analysis_prompt(text, document_type)
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=2048,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        with observe_external("claude", "analyze_document"):
+            response = self.client.messages.create(
+                model=self.model,
+                max_tokens=2048,
+                messages=[{"role": "user", "content": prompt}]
+            )
         return self._parse_ai_response(response.content[0].text, document_type)
 
     def analyze_document_image(self, image_path: Path, document_type: Optional[str] = None) -> dict:
@@ -44,20 +47,21 @@ class ClaudeService:
         }
         media_type = media_type_map.get(image_path.suffix.lower(), "image/jpeg")
 
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=4096,
-            messages=[{
-                "role": "user",
-                "content": [
-                    {
-                        "type": "image",
-                        "source": {"type": "base64", "media_type": media_type, "data": image_data},
-                    },
-                    {"type": "text", "text": self._build_vision_analysis_prompt(document_type)}
-                ],
-            }],
-        )
+        with observe_external("claude", "analyze_document_image"):
+            response = self.client.messages.create(
+                model=self.model,
+                max_tokens=4096,
+                messages=[{
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "image",
+                            "source": {"type": "base64", "media_type": media_type, "data": image_data},
+                        },
+                        {"type": "text", "text": self._build_vision_analysis_prompt(document_type)}
+                    ],
+                }],
+            )
         return self._parse_ai_response(response.content[0].text, document_type)
 
     def generate_task_suggestion(self, metadata: dict) -> Optional[dict]:
@@ -197,11 +201,12 @@ Antworte NUR mit einem gültigen JSON-Objekt:
 
 Regeln: Nur JSON. Deutsche Dokumente sind üblich. Tags sollen kurz und nützlich sein (z.B. "Telekom", "Rechnung", "2026", "Offen").
 """
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=1024,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        with observe_external("claude", "analyze_for_paperless"):
+            response = self.client.messages.create(
+                model=self.model,
+                max_tokens=1024,
+                messages=[{"role": "user", "content": prompt}]
+            )
         return self._parse_ai_response(response.content[0].text)
 
     def _build_analysis_prompt(self, text: str, document_type: Optional[str]) -> str:
@@ -2,72 +2,595 @@
 File storage service
 """
 
+import asyncio
+import fcntl
 import hashlib
+import logging
 import os
+import re
+import shutil
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import BinaryIO
-from uuid import UUID
+from typing import AsyncIterator, BinaryIO, ContextManager, Dict, Iterator, List, NamedTuple, Optional
+from uuid import uuid4
 import aiofiles
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.config import settings
+from ..models.blob import Blob
+from ..models.file import File
+
+logger = logging.getLogger(__name__)
+
+# Read/write size of streamed uploads
+CHUNK_SIZE = 1024 * 1024
+
+# Content-addressed paths, see FileStorageService.blob_path() and thumbnail_dir()
+CONTENT_PATH = re.compile(
+    r"blobs/[0-9a-f]{2}/(?P<checksum>[0-9a-f]{64})(\.[^/]*)?"
+    r"|thumbs/[0-9a-f]{2}/(?P<thumbnail_of>[0-9a-f]{64})/(?P<size>\d+)\.webp"
+)
+
+
+class FileTooLargeError(ValueError):
+    """Upload is larger than the allowed size"""
+
+
+class UploadOffsetError(ValueError):
+    """Chunk does not start at the current offset of a resumable upload"""
+
+    def __init__(self, offset: int):
+        super().__init__(f"Upload is at offset {offset}")
+        self.offset = offset
+
+
+class UploadBusyError(RuntimeError):
+    """Another request is writing to the same resumable upload"""
+
+
+class StagedFile(NamedTuple):
+    """An upload written to a temp file, not yet stored"""
+    temp_path: Path
+    checksum: str
+    size_bytes: int
+    suffix: str
+
+
+class ReleasedFile(NamedTuple):
+    """Stored content of a deleted File row, removed by purge() once the deletion is committed"""
+    path: str
+    backend: str
+    blob_checksum: Optional[str]  # set if the last reference of a blob row was dropped
+    size_bytes: int
+    thumbnail_path: Optional[str]
+    thumbnail_sizes: List[int]
+    normalized_path: Optional[str]
+
+
+class StorageBackend:
+    """
+    Where stored files live, addressed by their path (File.path, the key)
+
+    Blocking calls; the async methods of FileStorageService run them in a
+    thread.
+    """
+
+    name: str
+
+    def put(self, source: Path, key: str, content_type: Optional[str] = None) -> None:
+        """Move the local file source to key, replacing what is there"""
+        raise NotImplementedError
+
+    def read(self, key: str) -> bytes:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Remove key; no error if it does not exist"""
+        raise NotImplementedError
+
+    def local_copy(self, key: str) -> ContextManager[Path]:
+        """A local file with the content of key, for tools that need a path (OCR)"""
+        raise NotImplementedError
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Path of key on this machine, if the backend stores files locally"""
+        return None
+
+    def download_url(self, key: str, filename: Optional[str] = None) -> Optional[str]:
+        """Time-limited URL that downloads key without going through the API, if supported"""
+        return None
+
+
+class LocalStorageBackend(StorageBackend):
+    """Files below UPLOAD_DIR, served by GET /files/{path}"""
+
+    name = "local"
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def put(self, source: Path, key: str, content_type: Optional[str] = None) -> None:
+        target = self.root / key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, target)
+
+    def read(self, key: str) -> bytes:
+        path = self.root / key
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {key}")
+        return path.read_bytes()
+
+    def delete(self, key: str) -> None:
+        (self.root / key).unlink(missing_ok=True)
+
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[Path]:
+        path = self.root / key
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {key}")
+        yield path
+
+    def local_path(self, key: str) -> Optional[Path]:
+        return self.root / key
+
+
+class S3StorageBackend(StorageBackend):
+    """
+    Bucket of an S3-compatible object store (AWS S3, MinIO, ...)
+
+    Uploads above S3_MULTIPART_THRESHOLD are sent as multipart uploads in
+    parallel parts; downloads use presigned GET URLs, so the bytes never
+    pass through the API process.
+    """
+
+    name = "s3"
+
+    def __init__(self):
+        try:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+            from botocore.config import Config
+        except ImportError:
+            raise Exception("boto3 not installed. Install: pip install boto3")
+
+        if not settings.S3_BUCKET:
+            raise Exception("STORAGE_BACKEND=s3 requires S3_BUCKET")
+
+        self.bucket = settings.S3_BUCKET
+        self.prefix = settings.S3_KEY_PREFIX
+
+        def client(endpoint_url: Optional[str]):
+            return boto3.client(
+                "s3",
+                endpoint_url=endpoint_url,
+                region_name=settings.S3_REGION,
+                aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+                # Path-style addressing works with MinIO and AWS alike
+                config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+            )
+
+        self.client = client(settings.S3_ENDPOINT_URL)
+        # Presigned URLs are signed for their host, so they are built for the
+        # endpoint the clients reach (not e.g. the Docker-internal MinIO host)
+        public_endpoint = settings.S3_PUBLIC_ENDPOINT_URL
+        if public_endpoint and public_endpoint != settings.S3_ENDPOINT_URL:
+            self.presign_client = client(public_endpoint)
+        else:
+            self.presign_client = self.client
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE,
+        )
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def put(self, source: Path, key: str, content_type: Optional[str] = None) -> None:
+        extra_args = {"ContentType": content_type} if content_type else None
+        self.client.upload_file(
+            str(source), self.bucket, self._key(key), ExtraArgs=extra_args, Config=self.transfer_config
+        )
+        source.unlink(missing_ok=True)
+
+    def read(self, key: str) -> bytes:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._key(key))["Body"].read()
+        except self.client.exceptions.NoSuchKey:
+            raise FileNotFoundError(f"File not found: {key}")
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[Path]:
+        from botocore.exceptions import ClientError
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / Path(key).name
+            try:
+                self.client.download_file(self.bucket, self._key(key), str(path), Config=self.transfer_config)
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                    raise FileNotFoundError(f"File not found: {key}")
+                raise
+            yield path
+
+    def download_url(self, key: str, filename: Optional[str] = None) -> Optional[str]:
+        params = {"Bucket": self.bucket, "Key": self._key(key)}
+        if filename:
+            params["ResponseContentDisposition"] = f'inline; filename="{filename}"'
+        return self.presign_client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=settings.S3_PRESIGNED_URL_EXPIRES
+        )
+
+
+def create_storage_backend(name: str) -> StorageBackend:
+    if name == "local":
+        return LocalStorageBackend(Path(settings.UPLOAD_DIR))
+    if name == "s3":
+        return S3StorageBackend()
+    raise ValueError(f"Unknown storage backend '{name}'. Allowed: local, s3")
+
+
+# One client per backend and process
+_backends: Dict[str, StorageBackend] = {}
+
+
+def get_storage_backend(name: Optional[str] = None) -> StorageBackend:
+    """Backend by File.storage_backend name; STORAGE_BACKEND (new uploads) by default"""
+    name = name or settings.STORAGE_BACKEND
+    if name not in _backends:
+        _backends[name] = create_storage_backend(name)
+    return _backends[name]
 
 
 class FileStorageService:
-    """Service for handling file storage"""
+    """
+    Service for handling file storage
+
+    Files are content-addressed: stored once per SHA-256 under
+    blobs/<first two hex digits>/<checksum><ext> and shared by every File row
+    with that checksum, with a reference count in the blobs table. New files
+    go to the STORAGE_BACKEND; File.storage_backend records where each is.
+    """
 
     def __init__(self):
         self.storage_path = Path(settings.UPLOAD_DIR)
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.temp_path = self.storage_path / ".tmp"
+        self.temp_path.mkdir(exist_ok=True)
+
+    @property
+    def backend(self) -> StorageBackend:
+        """Backend of new uploads"""
+        return get_storage_backend()
+
+    @staticmethod
+    def blob_path(checksum: str, suffix: str = "") -> str:
+        """Storage path of content with this checksum, relative to the storage root"""
+        return f"blobs/{checksum[:2]}/{checksum}{suffix.lower()}"
+
+    @staticmethod
+    def thumbnail_dir(checksum: str) -> str:
+        """Directory of the thumbnails of content with this checksum (<size>.webp each)"""
+        return f"thumbs/{checksum[:2]}/{checksum}"
+
+    @staticmethod
+    def normalized_path(checksum: str, long_edge: int) -> str:
+        """Path of the normalized rendition of an image (see ImageNormalizer) at long_edge px"""
+        return f"normalized/{checksum[:2]}/{checksum}-{long_edge}.jpg"
+
+    @staticmethod
+    def content_tag(path: str) -> Optional[str]:
+        """
+        Tag of a content-addressed path, which never changes its content:
+        the checksum for blobs, checksum-size for thumbnails; None for files
+        stored before content addressing
+        """
+        match = CONTENT_PATH.fullmatch(path)
+        if not match:
+            return None
+        if match["checksum"]:
+            return match["checksum"]
+        return f"{match['thumbnail_of']}-{match['size']}"
 
-    async def save_file(
+    async def stage_stream(
         self,
-        file_content: bytes,
+        stream,
         filename: str,
-        user_id: UUID,
-    ) -> tuple[str, str, int]:
+        max_size: Optional[int] = None,
+    ) -> StagedFile:
         """
-        Save file to storage
+        Write an upload to a temp file in chunks
+
+        The content is hashed while it is written, so memory use does not
+        depend on the file size. The temp file is on the storage filesystem;
+        store() moves it into place, discard() removes it.
+
+        Args:
+            stream: Source with an async read(size), e.g. an UploadFile
+            filename: Original filename (for the extension)
+            max_size: Raise FileTooLargeError once more bytes than this arrive
 
         Returns:
-            tuple: (file_path, checksum, size_bytes)
+            StagedFile: temp file, checksum and size
         """
-        # Create user directory
-        user_dir = self.storage_path / str(user_id)
-        user_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = self.temp_path / f"{uuid4().hex}.part"
+        digest = hashlib.sha256()
+        size_bytes = 0
+        try:
+            async with aiofiles.open(temp_path, 'wb') as f:
+                while chunk := await stream.read(CHUNK_SIZE):
+                    size_bytes += len(chunk)
+                    if max_size is not None and size_bytes > max_size:
+                        raise FileTooLargeError(f"File exceeds {max_size} bytes")
+                    digest.update(chunk)
+                    await f.write(chunk)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
 
-        # Generate unique filename to avoid collisions
-        file_ext = Path(filename).suffix
-        checksum = hashlib.sha256(file_content).hexdigest()
-        unique_filename = f"{checksum[:16]}{file_ext}"
+        return StagedFile(temp_path, digest.hexdigest(), size_bytes, Path(filename).suffix)
 
-        file_path = user_dir / unique_filename
+    def upload_part_path(self, session_id) -> Path:
+        """Part file of a resumable upload (UploadSession); its size is the offset"""
+        return self.temp_path / f"{session_id}.upload"
 
-        # Save file
-        async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(file_content)
+    @contextmanager
+    def lock_part(self, path: Path) -> Iterator[BinaryIO]:
+        """
+        Open a part file for appending, exclusively (flock, across processes)
 
-        # Return relative path from storage root
-        relative_path = str(file_path.relative_to(self.storage_path))
+        Raises:
+            UploadBusyError: another request holds the part file
+        """
+        f = open(path, "ab")
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            f.close()
+            raise UploadBusyError("Another chunk of this upload is being written")
+        try:
+            yield f
+        finally:
+            f.close()
 
-        return relative_path, checksum, len(file_content)
+    async def append_chunk(self, path: Path, chunks: AsyncIterator[bytes], offset: int, max_size: int) -> int:
+        """
+        Append a chunk of a resumable upload at offset
 
-    async def read_file(self, file_path: str) -> bytes:
-        """Read file from storage"""
-        full_path = self.storage_path / file_path
+        Buffered in CHUNK_SIZE pieces, so memory use does not depend on
+        the chunk size. Bytes written before the connection drops are kept;
+        the client resumes from the returned (or current) offset.
+
+        Args:
+            path: Part file (upload_part_path)
+            chunks: Request body, e.g. Request.stream()
+            offset: Offset the client sends the chunk from
+            max_size: Announced total size; more raises FileTooLargeError
+
+        Returns:
+            int: New offset
+        """
+        with self.lock_part(path) as f:
+            size = os.fstat(f.fileno()).st_size
+            if offset != size:
+                raise UploadOffsetError(size)
+
+            buffer = bytearray()
+            try:
+                async for chunk in chunks:
+                    if size + len(buffer) + len(chunk) > max_size:
+                        raise FileTooLargeError(f"Upload exceeds its announced size of {max_size} bytes")
+                    buffer += chunk
+                    if len(buffer) >= CHUNK_SIZE:
+                        await asyncio.to_thread(f.write, buffer)
+                        size += len(buffer)
+                        buffer = bytearray()
+            finally:
+                if buffer:
+                    await asyncio.to_thread(f.write, buffer)
+                    size += len(buffer)
+                await asyncio.to_thread(f.flush)
+            return size
+
+    async def stage_file(self, path: Path, filename: str) -> StagedFile:
+        """
+        Stage a complete file (e.g. a finished part file) for store()
+
+        The staged file is a hard link to path (a copy where links are not
+        supported), so store() and discard() consume the link and path
+        stays in place until the caller removes it; a failed store loses
+        nothing.
+        """
+        temp_path = self.temp_path / f"{uuid4().hex}.part"
+
+        def stage() -> str:
+            try:
+                os.link(path, temp_path)
+            except OSError:
+                shutil.copyfile(path, temp_path)
+            digest = hashlib.sha256()
+            with open(temp_path, "rb") as f:
+                while chunk := f.read(CHUNK_SIZE):
+                    digest.update(chunk)
+            return digest.hexdigest()
+
+        try:
+            checksum = await asyncio.to_thread(stage)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return StagedFile(temp_path, checksum, temp_path.stat().st_size, Path(filename).suffix)
+
+    def discard(self, staged: StagedFile) -> None:
+        """Remove a staged upload that will not be stored"""
+        staged.temp_path.unlink(missing_ok=True)
 
-        if not full_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+    async def store(self, db: AsyncSession, staged: StagedFile, content_type: Optional[str] = None) -> str:
+        """
+        Add a reference to the blob of a staged upload and put it in place
+        (in self.backend; the File row gets storage_backend=self.backend.name)
+
+        The reference is counted first (locking the blob row until the
+        transaction ends), then the file is moved into place, replacing an
+        identical copy if the content is already stored. A concurrent
+        purge() of the content therefore either finishes before (and the
+        file is put back here) or finds this blob row and keeps the file.
+
+        Returns:
+            str: Blob path relative to the storage root, for File.path
+        """
+        insert = postgresql_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+        statement = insert(Blob).values(
+            checksum=staged.checksum,
+            backend=self.backend.name,
+            path=self.blob_path(staged.checksum, staged.suffix),
+            size_bytes=staged.size_bytes,
+            ref_count=1,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[Blob.checksum, Blob.backend],
+            set_={"ref_count": Blob.ref_count + 1},
+        ).returning(Blob.path)
+        path = await db.scalar(statement)
+
+        await asyncio.to_thread(self.backend.put, staged.temp_path, path, content_type)
+        return path
+
+    async def release(self, db: AsyncSession, file: File) -> Optional[ReleasedFile]:
+        """
+        Drop the reference of a File row that is being deleted
+
+        Nothing is removed from storage here: if the transaction fails, the
+        File row must still find its content. Pass the result to purge()
+        after the commit.
+
+        Returns:
+            ReleasedFile if this was the last reference (files without a blob
+            row, stored before content addressing: unless another File row
+            uses the same path), else None
+        """
+        remaining = await db.scalar(
+            update(Blob)
+            .where(Blob.checksum == file.checksum, Blob.backend == file.storage_backend, Blob.path == file.path)
+            .values(ref_count=Blob.ref_count - 1)
+            .returning(Blob.ref_count)
+        ) if file.checksum else None
+
+        if remaining is None:
+            shared = await db.scalar(
+                select(func.count()).select_from(File).where(File.path == file.path, File.id != file.id)
+            )
+            if shared:
+                return None
+        elif remaining > 0:
+            return None
+        else:
+            await db.execute(delete(Blob).where(Blob.checksum == file.checksum, Blob.backend == file.storage_backend))
+
+        return ReleasedFile(
+            path=file.path,
+            backend=file.storage_backend,
+            blob_checksum=file.checksum if remaining is not None else None,
+            size_bytes=file.size_bytes,
+            thumbnail_path=file.thumbnail_path,
+            thumbnail_sizes=list(file.thumbnail_sizes or []),
+            normalized_path=file.normalized_path,
+        )
 
-        async with aiofiles.open(full_path, 'rb') as f:
-            return await f.read()
+    async def purge(self, db: AsyncSession, released: ReleasedFile) -> None:
+        """
+        Remove the stored content of a released file, after the deletion was committed
+
+        A placeholder blob row (ref_count 0) is held while the content is
+        removed: if the same content was stored again in the meantime, the
+        insert conflicts and nothing is removed; an upload of it that comes
+        now waits in store() until the removal is committed. Failures are
+        logged, not raised; the File row is gone either way.
+        """
+        try:
+            if released.blob_checksum:
+                insert = postgresql_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+                placeholder = await db.scalar(
+                    insert(Blob)
+                    .values(
+                        checksum=released.blob_checksum,
+                        backend=released.backend,
+                        path=released.path,
+                        size_bytes=released.size_bytes,
+                        ref_count=0,
+                    )
+                    .on_conflict_do_nothing(index_elements=[Blob.checksum, Blob.backend])
+                    .returning(Blob.checksum)
+                )
+                if placeholder is None:
+                    return
+            else:
+                shared = await db.scalar(select(func.count()).select_from(File).where(File.path == released.path))
+                if shared:
+                    return
+
+            await self.delete_file(released.path, released.backend)
+            if released.thumbnail_path and not await self._is_used(
+                db, File.thumbnail_path, released.thumbnail_path, released.backend
+            ):
+                for size in released.thumbnail_sizes:
+                    await self.delete_file(f"{released.thumbnail_path}/{size}.webp", released.backend)
+            if released.normalized_path and not await self._is_used(
+                db, File.normalized_path, released.normalized_path, released.backend
+            ):
+                await self.delete_file(released.normalized_path, released.backend)
+
+            if released.blob_checksum:
+                await db.execute(
+                    delete(Blob).where(
+                        Blob.checksum == released.blob_checksum,
+                        Blob.backend == released.backend,
+                        Blob.ref_count == 0,
+                    )
+                )
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.warning(f"Could not remove stored file {released.path}: {e}")
+
+    async def _is_used(self, db: AsyncSession, column, value: str, backend: Optional[str]) -> bool:
+        """Whether any File row in the backend still refers to a thumbnail directory or rendition"""
+        return bool(await db.scalar(
+            select(func.count()).select_from(File).where(column == value, File.storage_backend == backend)
+        ))
+
+    def store_thumbnails(self, file: File, renditions: Dict[int, Path]) -> str:
+        """
+        Put rendered thumbnails in the file's backend (blocking; for workers)
+
+        Returns:
+            str: Thumbnail directory, for File.thumbnail_path
+        """
+        backend = get_storage_backend(file.storage_backend)
+        directory = self.thumbnail_dir(file.checksum)
+        for size, path in renditions.items():
+            backend.put(path, f"{directory}/{size}.webp", "image/webp")
+        return directory
+
+    async def read_file(self, file_path: str, backend: Optional[str] = None) -> bytes:
+        """Read file from storage"""
+        return await asyncio.to_thread(get_storage_backend(backend).read, file_path)
 
-    async def delete_file(self, file_path: str) -> None:
+    async def delete_file(self, file_path: str, backend: Optional[str] = None) -> None:
         """Delete file from storage"""
-        full_path = self.storage_path / file_path
+        await asyncio.to_thread(get_storage_backend(backend).delete, file_path)
 
-        if full_path.exists():
-            full_path.unlink()
+    def local_copy(self, file: File) -> ContextManager[Path]:
+        """Context manager with a local path of the file's content (blocking; for workers)"""
+        return get_storage_backend(file.storage_backend).local_copy(file.path)
 
     def get_full_path(self, file_path: str) -> Path:
-        """Get full system path for a file"""
+        """Get full system path for a file of the local backend"""
         return self.storage_path / file_path
@@ -14,6 +14,7 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from ..core.config import settings
+from ..core.metrics import observe_external
 
 logger = logging.getLogger(__name__)
 
@@ -45,12 +46,19 @@ class GoogleCalendarService:
         if self.service is None:
             # Refresh token if expired
             if self.credentials.expired and self.credentials.refresh_token:
-                self.credentials.refresh(Request())
+                with observe_external("google", "token_refresh"):
+                    self.credentials.refresh(Request())
 
             self.service = build('calendar', 'v3', credentials=self.credentials)
 
         return self.service
 
+    @staticmethod
+    def _execute(request, operation: str):
+        """Execute an API request, recording latency and errors"""
+        with observe_external("google", operation):
+            return request.execute()
+
     def get_updated_credentials(self) -> Dict:
         """
         Get updated credentials (including refreshed access token)
@@ -74,7 +82,7 @@ class GoogleCalendarService:
         """
         try:
             service = self._get_service()
-            calendar_list = service.calendarList().list().execute()
+            calendar_list = self._execute(service.calendarList().list(), "calendar_list")
 
             calendars = []
             for calendar in calendar_list.get('items', []):
@@ -124,14 +132,14 @@ class GoogleCalendarService:
             time_min = start_date.isoformat() + 'Z'
             time_max = end_date.isoformat() + 'Z'
 
-            events_result = service.events().list(
+            events_result = self._execute(service.events().list(
                 calendarId=calendar_id,
                 timeMin=time_min,
                 timeMax=time_max,
                 maxResults=max_results,
                 singleEvents=True,
                 orderBy='startTime'
-            ).execute()
+            ), "events.list")
 
             events = []
             for event in events_result.get('items', []):
@@ -181,10 +189,10 @@ class GoogleCalendarService:
                     'timeZone': 'UTC',
                 }
 
-            created_event = service.events().insert(
+            created_event = self._execute(service.events().insert(
                 calendarId=calendar_id,
                 body=event_body
-            ).execute()
+            ), "events.insert")
 
             return self._parse_event(created_event)
 
@@ -213,10 +221,10 @@ class GoogleCalendarService:
             service = self._get_service()
 
             # Fetch existing event
-            event = service.events().get(
+            event = self._execute(service.events().get(
                 calendarId=calendar_id,
                 eventId=event_id
-            ).execute()
+            ), "events.get")
 
             # Update fields
             if title is not None:
@@ -240,11 +248,11 @@ class GoogleCalendarService:
                         'timeZone': 'UTC',
                     }
 
-            updated_event = service.events().update(
+            updated_event = self._execute(service.events().update(
                 calendarId=calendar_id,
                 eventId=event_id,
                 body=event
-            ).execute()
+            ), "events.update")
 
             return self._parse_event(updated_event)
 
@@ -256,10 +264,10 @@ class GoogleCalendarService:
         """Delete an event from Google Calendar"""
         try:
             service = self._get_service()
-            service.events().delete(
+            self._execute(service.events().delete(
                 calendarId=calendar_id,
                 eventId=event_id
-            ).execute()
+            ), "events.delete")
 
         except HttpError as e:
             logger.error(f"Error deleting Google Calendar event: {e}")
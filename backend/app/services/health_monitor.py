@@ -0,0 +1,185 @@
+"""
+Background health prober
+
+Probes the database, Redis, the Celery queue and the external integrations on
+an interval and keeps the last result in memory. /health and /health/ui only
+read that snapshot, so monitors and the Docker healthcheck cost no connections.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+
+import aiohttp
+from sqlalchemy import text
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Default Celery queue; with the Redis broker it is a list of that name
+CELERY_QUEUE_NAME = "celery"
+
+
+class ProbeResult:
+    """Outcome of the latest run of one probe"""
+
+    def __init__(self, name: str, required: bool):
+        self.name = name
+        self.required = required  # counts towards healthy/degraded
+        self.ok = False
+        self.configured = True
+        self.latency_ms: Optional[float] = None
+        self.last_checked: Optional[datetime] = None
+        self.last_success: Optional[datetime] = None
+        self.error: Optional[str] = None
+        self.details: Dict = {}
+
+    def to_dict(self) -> Dict:
+        return {
+            "ok": self.ok,
+            "configured": self.configured,
+            "required": self.required,
+            "latency_ms": self.latency_ms,
+            "last_checked": self.last_checked.isoformat() if self.last_checked else None,
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+            "error": self.error,
+            **self.details,
+        }
+
+
+class HealthMonitor:
+    """Runs all probes every HEALTH_PROBE_INTERVAL_SECONDS"""
+
+    def __init__(self, interval_seconds: float, timeout_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.results: Dict[str, ProbeResult] = {
+            "database": ProbeResult("database", required=True),
+            "redis": ProbeResult("redis", required=True),
+            "celery": ProbeResult("celery", required=False),
+            "paperless": ProbeResult("paperless", required=False),
+            "claude": ProbeResult("claude", required=False),
+        }
+        self.checked_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._redis = None
+
+    # ── lifecycle ────────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Health probe round failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    # ── snapshot ─────────────────────────────────────────────────────────────
+
+    @property
+    def healthy(self) -> bool:
+        return all(r.ok for r in self.results.values() if r.required)
+
+    def snapshot(self) -> Dict:
+        return {
+            "checked_at": self.checked_at.isoformat() if self.checked_at else None,
+            "probes": {name: result.to_dict() for name, result in self.results.items()},
+        }
+
+    async def ensure_checked(self) -> None:
+        """Probe once if no round has completed yet (requests right after startup)"""
+        if self.checked_at is None:
+            await self.refresh(only_if_unchecked=True)
+
+    async def refresh(self, only_if_unchecked: bool = False) -> None:
+        """Run all probes concurrently and update the snapshot"""
+        async with self._lock:
+            if only_if_unchecked and self.checked_at is not None:
+                return
+            await asyncio.gather(
+                self._probe("database", self._check_database),
+                self._probe("redis", self._check_redis),
+                self._probe("celery", self._check_celery_queue),
+                self._probe("paperless", self._check_paperless),
+                self._probe("claude", self._check_claude),
+            )
+            self.checked_at = datetime.utcnow()
+
+    async def _probe(self, name: str, check: Callable[[ProbeResult], Awaitable[None]]) -> None:
+        result = self.results[name]
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(check(result), timeout=self.timeout_seconds)
+            result.ok = True
+            result.error = None
+        except asyncio.TimeoutError:
+            result.ok = False
+            result.error = f"timeout after {self.timeout_seconds}s"
+        except Exception as e:
+            result.ok = False
+            result.error = str(e)
+        result.latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        result.last_checked = datetime.utcnow()
+        if result.ok and result.configured:
+            result.last_success = result.last_checked
+
+    # ── probes ───────────────────────────────────────────────────────────────
+
+    def _get_redis(self):
+        if self._redis is None:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(settings.CELERY_BROKER_URL)
+        return self._redis
+
+    async def _check_database(self, result: ProbeResult) -> None:
+        from ..db.session import async_engine
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def _check_redis(self, result: ProbeResult) -> None:
+        await self._get_redis().ping()
+
+    async def _check_celery_queue(self, result: ProbeResult) -> None:
+        result.details["queue_depth"] = await self._get_redis().llen(CELERY_QUEUE_NAME)
+
+    async def _check_paperless(self, result: ProbeResult) -> None:
+        from .paperless_service import get_paperless_client
+        client = get_paperless_client()
+        result.configured = client is not None
+        if client:
+            info = await client.test_connection()
+            result.details["total_documents"] = info["total_documents"]
+
+    async def _check_claude(self, result: ProbeResult) -> None:
+        result.configured = bool(settings.CLAUDE_API_KEY)
+        if result.configured:
+            # Reachability only: any HTTP answer means the API host is up
+            async with aiohttp.ClientSession() as session:
+                async with session.head("https://api.anthropic.com") as resp:
+                    result.details["http_status"] = resp.status
+
+
+health_monitor = HealthMonitor(
+    interval_seconds=settings.HEALTH_PROBE_INTERVAL_SECONDS,
+    timeout_seconds=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+)
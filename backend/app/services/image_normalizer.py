@@ -0,0 +1,155 @@
+"""
+Image Normalization Service
+Upright, cropped, downscaled JPEG of a photographed document for OCR and vision calls
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple, Optional, Tuple
+import logging
+
+from ..core.config import settings
+
+# numpy and PIL are loaded on first use only (kept out of the API and worker start)
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Long edge of the grayscale proxy the page is searched in
+DETECT_SIZE = 512
+
+
+class NormalizedImage(NamedTuple):
+    path: Path
+    width: int
+    height: int
+    size_bytes: int
+    cropped: bool
+
+
+def _wide_lines(mask: np.ndarray, min_fraction: float) -> np.ndarray:
+    """Rows of mask whose first and last True value are at least min_fraction of the width apart"""
+    width = mask.shape[1]
+    first = mask.argmax(axis=1)
+    last = width - 1 - mask[:, ::-1].argmax(axis=1)
+    return mask.any(axis=1) & ((last - first + 1) >= min_fraction * width)
+
+
+def _longest_run(mask: np.ndarray) -> Optional[Tuple[int, int]]:
+    """First and last index of the longest run of True values"""
+    import numpy as np
+
+    best, start = None, None
+    for index, value in enumerate(np.append(mask, False)):
+        if value and start is None:
+            start = index
+        elif not value and start is not None:
+            if best is None or index - start > best[1] - best[0] + 1:
+                best = (start, index - 1)
+            start = None
+    return best
+
+
+class ImageNormalizer:
+    """
+    Normalizes document photos before OCR and Claude Vision
+
+    Phone photos are large (12 MP, several MB), often rotated via EXIF and
+    show the desk around the page. The normalized rendition is upright,
+    cropped to the page, at most long_edge pixels long and a JPEG, which
+    cuts the bytes sent to Claude and the OCR time.
+
+    The page is found as the largest area that differs clearly from the
+    image border (a page on a darker or lighter background). The crop is
+    axis-aligned; skewed pages are cropped to their bounding box, not
+    rectified. Images where no page stands out are only downscaled.
+    """
+
+    def __init__(self, long_edge: Optional[int] = None, quality: Optional[int] = None):
+        self.long_edge = long_edge or settings.NORMALIZE_LONG_EDGE
+        self.quality = quality or settings.NORMALIZE_JPEG_QUALITY
+
+    def find_page(self, image: Image.Image) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Bounding box (left, top, right, bottom) of the page in image, or None
+
+        Args:
+            image: Upright image
+
+        Returns:
+            Box in the coordinates of image, None if no page stands out from the border
+        """
+        import numpy as np
+
+        proxy = image.convert("L")
+        proxy.thumbnail((DETECT_SIZE, DETECT_SIZE))
+        gray = np.asarray(proxy, dtype=np.int16)
+        height, width = gray.shape
+        frame = max(min(height, width) // 30, 1)
+
+        border = np.concatenate([
+            gray[:frame].ravel(), gray[-frame:].ravel(), gray[:, :frame].ravel(), gray[:, -frame:].ravel()
+        ])
+        center = gray[height // 4: height - height // 4, width // 4: width - width // 4]
+        background, page = np.median(border), np.median(center)
+
+        # The page fills the frame, or it does not stand out
+        if abs(page - background) < 40:
+            return None
+
+        # Pixels that differ from the background (paper and print); a row
+        # or column crosses the page if they span a good part of it
+        mask = np.abs(gray - background) > abs(page - background) / 2
+        rows = _longest_run(_wide_lines(mask, 0.3))
+        if rows is None:
+            return None
+        columns = _longest_run(_wide_lines(mask[rows[0]: rows[1] + 1].T, 0.3))
+        if columns is None:
+            return None
+
+        area = (rows[1] - rows[0] + 1) * (columns[1] - columns[0] + 1) / (height * width)
+        if not 0.2 <= area <= 0.95:
+            return None
+
+        scale = image.width / width
+        margin = frame // 2
+        return (
+            max(int((columns[0] - margin) * scale), 0),
+            max(int((rows[0] - margin) * scale), 0),
+            min(int((columns[1] + 1 + margin) * scale), image.width),
+            min(int((rows[1] + 1 + margin) * scale), image.height),
+        )
+
+    def normalize(self, source: Path, target: Path) -> NormalizedImage:
+        """
+        Write the normalized rendition of an image
+
+        EXIF orientation → crop to the page → downscale to long_edge → JPEG
+
+        Args:
+            source: Uploaded image
+            target: Output path (.jpg)
+
+        Returns:
+            NormalizedImage: output path, size and whether it was cropped
+        """
+        from PIL import Image, ImageOps
+
+        image = Image.open(source)
+        # Decode large JPEGs at a reduced scale right away (still >= 2x long_edge)
+        image.draft("RGB", (self.long_edge * 2, self.long_edge * 2))
+        image = ImageOps.exif_transpose(image)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+
+        box = self.find_page(image)
+        if box is not None:
+            image = image.crop(box)
+
+        image.thumbnail((self.long_edge, self.long_edge), Image.Resampling.LANCZOS)
+        image.save(target, "JPEG", quality=self.quality, optimize=True)
+
+        return NormalizedImage(target, image.width, image.height, target.stat().st_size, box is not None)
@@ -2,11 +2,15 @@
 OCR Service using Tesseract
 """
 
-import pytesseract
 from PIL import Image, ImageEnhance, ImageFilter
 from pathlib import Path
 from typing import Optional
-import numpy as np
+
+
+def _pytesseract():
+    """pytesseract pulls in numpy (and pandas if installed); load it on first OCR only"""
+    import pytesseract
+    return pytesseract
 
 
 class OCRService:
@@ -73,6 +77,7 @@ class OCRService:
                 image = self.preprocess_image(image)
 
             # Get detailed OCR data for confidence
+            pytesseract = _pytesseract()
             data = pytesseract.image_to_data(
                 image,
                 lang=self.languages,
@@ -141,6 +146,7 @@ class OCRService:
                 image = self.preprocess_image(image)
 
             # Get detailed OCR data for confidence
+            pytesseract = _pytesseract()
             data = pytesseract.image_to_data(
                 image,
                 lang=self.languages,
@@ -9,6 +9,7 @@ from typing import Optional, List, Dict
 from uuid import UUID
 
 from ..core.config import settings
+from ..core.metrics import observe_external
 
 logger = logging.getLogger(__name__)
 
@@ -25,24 +26,27 @@ class PaperlessClient:
 
     async def _get(self, endpoint: str, params: dict = None) -> dict:
         url = f"{self.base_url}/api{endpoint}"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self.headers, params=params) as resp:
-                resp.raise_for_status()
-                return await resp.json()
+        with observe_external("paperless", "GET"):
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url, headers=self.headers, params=params) as resp:
+                    resp.raise_for_status()
+                    return await resp.json()
 
     async def _patch(self, endpoint: str, data: dict) -> dict:
         url = f"{self.base_url}/api{endpoint}"
-        async with aiohttp.ClientSession() as session:
-            async with session.patch(url, headers=self.headers, json=data) as resp:
-                resp.raise_for_status()
-                return await resp.json()
+        with observe_external("paperless", "PATCH"):
+            async with aiohttp.ClientSession() as session:
+                async with session.patch(url, headers=self.headers, json=data) as resp:
+                    resp.raise_for_status()
+                    return await resp.json()
 
     async def _post(self, endpoint: str, data: dict) -> dict:
         url = f"{self.base_url}/api{endpoint}"
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=self.headers, json=data) as resp:
-                resp.raise_for_status()
-                return await resp.json()
+        with observe_external("paperless", "POST"):
+            async with aiohttp.ClientSession() as session:
+                async with session.post(url, headers=self.headers, json=data) as resp:
+                    resp.raise_for_status()
+                    return await resp.json()
 
     async def test_connection(self) -> Dict:
         """Test API connection and return basic stats"""
@@ -0,0 +1,252 @@
+"""
+Principal cache for get_current_user
+
+Avoids the users SELECT on every authenticated request:
+- access token (sha256) -> user id, kept until the token expires at the latest
+- user id -> snapshot of the user's columns, kept for PRINCIPAL_CACHE_TTL_SECONDS
+
+Snapshots live in process memory, or in Redis with PRINCIPAL_CACHE_BACKEND=redis
+so that all uvicorn workers (and invalidations from Celery) share them.
+Any committed UPDATE/DELETE of a users row invalidates its snapshot (PATCH /auth/me,
+POST /auth/api-key, FCM token changes, deactivation, ...). Bulk query.update()
+bypasses the ORM events and is only covered by the TTL. On async sessions the
+Redis keys are deleted with the async client: routes that change users commit
+with commit_user_changes().
+
+Secrets are never cached (nor written to Redis): password_hash,
+two_factor_secret, fcm_token and ui_preferences (which holds the Paperless
+token). They stay unloaded on cached principals; routes that need them load
+them with load_uncached_columns().
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import DateTime, event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..models import User
+
+logger = logging.getLogger(__name__)
+
+_EXCLUDED_COLUMNS = {"password_hash", "two_factor_secret", "fcm_token", "ui_preferences"}
+_REDIS_PREFIX = "workmate:principal:"
+# Invalidations from Celery must not hold up the task for long if Redis is unreachable
+_SYNC_REDIS_TIMEOUT_SECONDS = 2
+
+
+def _cached_columns():
+    return [c for c in User.__table__.columns if c.key not in _EXCLUDED_COLUMNS]
+
+
+def snapshot_user(user: User) -> dict:
+    """JSON-safe snapshot of the cacheable user columns"""
+    data = {}
+    for column in _cached_columns():
+        value = getattr(user, column.key)
+        if isinstance(value, uuid.UUID):
+            value = str(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        data[column.key] = value
+    return data
+
+
+def restore_user(data: dict) -> User:
+    """Detached User built from a snapshot, ready for session.merge(load=False)"""
+    values = {}
+    for column in _cached_columns():
+        value = data.get(column.key)
+        if value is not None and isinstance(column.type, UUID):
+            value = uuid.UUID(value)
+        elif value is not None and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        values[column.key] = value
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+async def load_uncached_columns(db: AsyncSession, user: User, *keys: str) -> None:
+    """Load columns that a cached principal comes without (see _EXCLUDED_COLUMNS)"""
+    unloaded = [key for key in keys if key in inspect(user).unloaded]
+    if unloaded:
+        await db.refresh(user, attribute_names=unloaded)
+
+
+class PrincipalCache:
+    """Per-process TTL/LRU cache of resolved principals, optionally backed by Redis"""
+
+    def __init__(self, ttl_seconds: int, max_entries: int, redis_url: Optional[str] = None):
+        self.ttl_seconds = ttl_seconds
+        self._tokens = TTLCache(max_entries, ttl_seconds)
+        self._users = TTLCache(max_entries, ttl_seconds)
+        self._redis_url = redis_url
+        self._async_redis = None
+        self._sync_redis = None
+
+    @staticmethod
+    def _token_key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    # ── token -> user id ─────────────────────────────────────────────────────
+
+    def get_token_user_id(self, token: str) -> Optional[uuid.UUID]:
+        """User id of an access token that was already validated, if cached"""
+        return self._tokens.get(self._token_key(token))
+
+    def remember_token(self, token: str, user_id: uuid.UUID, expires_at: Optional[int]) -> None:
+        """Cache a validated access token, never beyond its exp claim"""
+        ttl = self.ttl_seconds
+        if expires_at:
+            ttl = min(ttl, expires_at - time.time())
+        self._tokens.set(self._token_key(token), user_id, ttl_seconds=ttl)
+
+    # ── user id -> snapshot ──────────────────────────────────────────────────
+
+    async def get(self, user_id: uuid.UUID) -> Optional[dict]:
+        if not self._redis_url:
+            return self._users.get(user_id)
+        try:
+            raw = await self._get_async_redis().get(f"{_REDIS_PREFIX}{user_id}")
+        except Exception as e:
+            logger.warning(f"Principal cache read failed: {e}")
+            return None
+        return json.loads(raw) if raw else None
+
+    async def set(self, user_id: uuid.UUID, data: dict) -> None:
+        if not self._redis_url:
+            self._users.set(user_id, data)
+            return
+        try:
+            await self._get_async_redis().set(f"{_REDIS_PREFIX}{user_id}", json.dumps(data), ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Principal cache write failed: {e}")
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        """Drop a user's snapshot (sync, called from session events of sync sessions)"""
+        self._users.delete(user_id)
+        if not self._redis_url:
+            return
+        try:
+            self._get_sync_redis().delete(f"{_REDIS_PREFIX}{user_id}")
+        except Exception as e:
+            logger.warning(f"Principal cache invalidation failed for user {user_id}: {e}")
+
+    async def invalidate_many(self, user_ids: Iterable[uuid.UUID]) -> None:
+        """Drop users' snapshots, with the async Redis client"""
+        keys = []
+        for user_id in user_ids:
+            self._users.delete(user_id)
+            keys.append(f"{_REDIS_PREFIX}{user_id}")
+        if not keys or not self._redis_url:
+            return
+        try:
+            await self._get_async_redis().delete(*keys)
+        except Exception as e:
+            logger.warning(f"Principal cache invalidation failed for {len(keys)} users: {e}")
+
+    @property
+    def uses_redis(self) -> bool:
+        return self._redis_url is not None
+
+    def clear(self) -> None:
+        self._tokens.clear()
+        self._users.clear()
+
+    async def load_user(self, db: AsyncSession, user_id: uuid.UUID) -> Optional[User]:
+        """
+        Resolve a user, from the cache if possible
+
+        Cached principals are merged into the request's session without a
+        SELECT, so endpoints can still modify and commit current_user.
+        """
+        data = await self.get(user_id)
+        if data is not None:
+            return await db.merge(restore_user(data), load=False)
+
+        user = await db.get(User, user_id)
+        if user:
+            await self.set(user_id, snapshot_user(user))
+        return user
+
+    def _get_async_redis(self):
+        if self._async_redis is None:
+            import redis.asyncio as aioredis
+            self._async_redis = aioredis.from_url(self._redis_url)
+        return self._async_redis
+
+    def _get_sync_redis(self):
+        if self._sync_redis is None:
+            import redis
+            self._sync_redis = redis.from_url(
+                self._redis_url,
+                socket_timeout=_SYNC_REDIS_TIMEOUT_SECONDS,
+                socket_connect_timeout=_SYNC_REDIS_TIMEOUT_SECONDS,
+            )
+        return self._sync_redis
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    redis_url=(settings.CACHE_REDIS_URL or settings.CELERY_BROKER_URL)
+    if settings.PRINCIPAL_CACHE_BACKEND == "redis" else None,
+)
+
+
+# ===== Invalidation =====
+
+def _mark_user_changed(mapper, connection, target: User) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("principal_cache_invalidations", set()).add(target.id)
+
+
+event.listen(User, "after_update", _mark_user_changed)
+event.listen(User, "after_delete", _mark_user_changed)
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    user_ids = session.info.pop("principal_cache_invalidations", ())
+    if principal_cache.uses_redis and _in_event_loop():
+        # An AsyncSession: no blocking Redis call on the event loop, see commit_user_changes()
+        session.info.setdefault("principal_cache_pending", set()).update(user_ids)
+        return
+    for user_id in user_ids:
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changed_users(session: Session, previous_transaction) -> None:
+    session.info.pop("principal_cache_invalidations", None)
+
+
+async def commit_user_changes(db: AsyncSession) -> None:
+    """
+    Commit, then drop the cached snapshots of the users changed in the transaction
+
+    For routes that modify users rows: the Redis keys are deleted with the
+    async client before the response, so the next request sees the change.
+    """
+    await db.commit()
+    await principal_cache.invalidate_many(db.info.pop("principal_cache_pending", ()))
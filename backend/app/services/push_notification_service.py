@@ -5,6 +5,8 @@ Firebase Cloud Messaging (FCM) push notification service
 import logging
 from typing import Optional
 
+from ..core.metrics import observe_external
+
 logger = logging.getLogger(__name__)
 
 _firebase_initialized = False
@@ -63,7 +65,8 @@ class PushNotificationService:
                     ),
                 ),
             )
-            messaging.send(message)
+            with observe_external("fcm", "send"):
+                messaging.send(message)
             return True
 
         except Exception as e:
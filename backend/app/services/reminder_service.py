@@ -4,7 +4,7 @@ Reminder Service for creating and managing reminders
 
 from datetime import datetime, timedelta
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from ..models.reminder import Reminder, ReminderSeverity, ReminderStatus
 from ..models.task import Task
@@ -50,24 +50,22 @@ class ReminderService:
         ReminderSeverity.INFO: ["push"],
     }
 
-    def create_reminders_for_task(
+    def build_reminders_for_task(
         self,
         task: Task,
-        db: Session,
         channels: Optional[List[str]] = None,
         schedule_type: str = "priority"
     ) -> List[Reminder]:
         """
-        Create reminders for a task based on its priority and due date
+        Reminders for a task based on its priority and due date, not added to any session
 
         Args:
-            task: Task to create reminders for
-            db: Database session
+            task: Task to build reminders for
             channels: Custom notification channels (overrides defaults)
             schedule_type: "priority" (default) or "contract"
 
         Returns:
-            List of created Reminder objects
+            List of new Reminder objects
         """
         if not task.due_date:
             return []
@@ -77,7 +75,8 @@ class ReminderService:
         else:
             schedule = self.REMINDER_SCHEDULE.get(task.priority, self.REMINDER_SCHEDULE["medium"])
 
-        created_reminders = []
+        reminders = []
+        now = datetime.utcnow()
 
         for reminder_config in schedule:
             days_before = reminder_config["days_before"]
@@ -87,10 +86,10 @@ class ReminderService:
             trigger_at = task.due_date - timedelta(days=days_before)
 
             # Don't create reminders in the past
-            if trigger_at < datetime.utcnow():
+            if trigger_at < now:
                 # For overdue tasks, create immediate reminder
                 if days_before == 0:
-                    trigger_at = datetime.utcnow()
+                    trigger_at = now
                 else:
                     continue
 
@@ -100,25 +99,78 @@ class ReminderService:
             else:
                 reminder_channels = self.DEFAULT_CHANNELS.get(severity, ["push"])
 
-            # Create reminder
-            reminder = Reminder(
+            reminders.append(Reminder(
                 task_id=task.id,
                 trigger_at=trigger_at,
                 severity=severity,
                 channels=reminder_channels,
                 status=ReminderStatus.PENDING,
-            )
+            ))
 
-            db.add(reminder)
-            created_reminders.append(reminder)
+        return reminders
 
-        db.commit()
+    def create_reminders_for_task(
+        self,
+        task: Task,
+        db: Session,
+        channels: Optional[List[str]] = None,
+        schedule_type: str = "priority",
+        commit: bool = True
+    ) -> List[Reminder]:
+        """
+        Create reminders for a task based on its priority and due date
+
+        Args:
+            task: Task to create reminders for
+            db: Database session
+            channels: Custom notification channels (overrides defaults)
+            schedule_type: "priority" (default) or "contract"
+            commit: Commit the new reminders; False leaves that to the caller
+
+        Returns:
+            List of created Reminder objects
+        """
+        created_reminders = self.build_reminders_for_task(task, channels=channels, schedule_type=schedule_type)
+        db.add_all(created_reminders)
+        if commit:
+            db.commit()
 
         return created_reminders
 
+    def reschedule_reminders_for_task(
+        self,
+        task: Task,
+        db: Session,
+        schedule_type: str = "priority",
+        commit: bool = True
+    ) -> List[Reminder]:
+        """
+        Replace the pending reminders of a task after its due date or priority changed
+
+        Sent and failed reminders are kept as history.
+
+        Args:
+            task: Updated task
+            db: Database session
+            schedule_type: "priority" (default) or "contract"
+            commit: Commit the changes; False leaves that to the caller
+
+        Returns:
+            List of the new Reminder objects
+        """
+        new_reminders = self.build_reminders_for_task(task, schedule_type=schedule_type)
+        kept = [reminder for reminder in task.reminders if reminder.status != ReminderStatus.PENDING]
+        # Removed pending reminders are deleted as orphans on flush
+        task.reminders = kept + new_reminders
+        if commit:
+            db.commit()
+
+        return new_reminders
+
     def get_due_reminders(self, db: Session) -> List[Reminder]:
         """
-        Get all pending reminders that are due to be sent
+        Get all pending reminders that are due to be sent, with their task
+        and the task's user loaded in the same query
 
         Args:
             db: Database session
@@ -130,6 +182,7 @@ class ReminderService:
 
         reminders = (
             db.query(Reminder)
+            .options(joinedload(Reminder.task).joinedload(Task.user))
             .filter(
                 Reminder.status == ReminderStatus.PENDING,
                 Reminder.trigger_at <= now,
@@ -0,0 +1,191 @@
+"""
+Search Service
+Full-text search over tasks and documents
+"""
+
+from sqlalchemy import String, cast, func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+import html
+import logging
+import uuid
+
+from ..models import Document, Task
+from ..schemas.search import SearchHit
+
+logger = logging.getLogger(__name__)
+
+# Text search configuration of the search_vector columns (migration a7b8c9d0e1f2);
+# inlined as regconfig, a bound varchar would not match the function signatures
+SEARCH_CONFIG = literal_column("'german'::regconfig")
+
+# Highlight markers for ts_headline; the snippet is HTML-escaped afterwards and
+# the markers become <mark> tags, so document text cannot inject markup
+_START, _STOP = "⟦", "⟧"
+HEADLINE_OPTIONS = f'StartSel={_START}, StopSel={_STOP}, MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter=" … "'
+
+SNIPPET_CHARS = 160
+
+
+def _highlighted(snippet: Optional[str]) -> Optional[str]:
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+class SearchService:
+    """
+    Ranked full-text search
+
+    On PostgreSQL the search_vector columns are kept up to date by triggers
+    (weights: title A, sender/description B, OCR text D) and searched through
+    their GIN indexes with websearch_to_tsquery, so quoted phrases, "or" and
+    -exclusions work. Each kind is ranked and limited first; ts_headline,
+    which re-parses the text, only runs for the rows that are returned.
+
+    Other databases (SQLite in local development) fall back to an unranked
+    LIKE match over the same fields.
+    """
+
+    async def search(
+        self,
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        query: str,
+        kinds: List[str],
+        limit: int = 20,
+    ) -> List[SearchHit]:
+        """Best matches over the requested kinds ("task", "document"), best first"""
+        postgres = db.bind.dialect.name == "postgresql"
+        hits: List[SearchHit] = []
+
+        if "task" in kinds:
+            hits += await (self._search_tasks if postgres else self._like_tasks)(db, user_id, query, limit)
+        if "document" in kinds:
+            hits += await (self._search_documents if postgres else self._like_documents)(db, user_id, query, limit)
+
+        hits.sort(key=lambda hit: hit.rank, reverse=True)
+        return hits[:limit]
+
+    async def _search_tasks(self, db: AsyncSession, user_id: uuid.UUID, query: str, limit: int) -> List[SearchHit]:
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = func.ts_rank_cd(Task.search_vector, tsquery)
+        ranked = (
+            select(Task.id, rank.label("rank"))
+            .where(Task.user_id == user_id, Task.search_vector.op("@@")(tsquery))
+            .order_by(rank.desc())
+            .limit(limit)
+            .subquery()
+        )
+        rows = await db.execute(
+            select(
+                Task.id,
+                Task.title,
+                Task.status,
+                Task.due_date,
+                ranked.c.rank,
+                func.ts_headline(
+                    SEARCH_CONFIG, func.coalesce(Task.description, Task.title), tsquery, HEADLINE_OPTIONS
+                ).label("snippet"),
+            )
+            .join(ranked, ranked.c.id == Task.id)
+            .order_by(ranked.c.rank.desc())
+        )
+        return [
+            SearchHit(
+                kind="task", id=row.id, title=row.title, snippet=_highlighted(row.snippet), rank=row.rank,
+                status=row.status, date=row.due_date,
+            )
+            for row in rows
+        ]
+
+    async def _search_documents(self, db: AsyncSession, user_id: uuid.UUID, query: str, limit: int) -> List[SearchHit]:
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = func.ts_rank_cd(Document.search_vector, tsquery)
+        ranked = (
+            select(Document.id, rank.label("rank"))
+            .where(Document.user_id == user_id, Document.search_vector.op("@@")(tsquery))
+            .order_by(rank.desc())
+            .limit(limit)
+            .subquery()
+        )
+        rows = await db.execute(
+            select(
+                Document.id,
+                Document.title,
+                Document.type,
+                Document.uploaded_at,
+                ranked.c.rank,
+                func.ts_headline(
+                    SEARCH_CONFIG, func.coalesce(Document.extracted_text, Document.title, ""), tsquery, HEADLINE_OPTIONS
+                ).label("snippet"),
+            )
+            .join(ranked, ranked.c.id == Document.id)
+            .order_by(ranked.c.rank.desc())
+        )
+        return [
+            SearchHit(
+                kind="document", id=row.id, title=row.title, snippet=_highlighted(row.snippet), rank=row.rank,
+                type=row.type, date=row.uploaded_at,
+            )
+            for row in rows
+        ]
+
+    # LIKE fallback (no tsvector support)
+
+    @staticmethod
+    def _like_snippet(text: Optional[str], query: str) -> Optional[str]:
+        if not text:
+            return None
+        position = text.lower().find(query.lower())
+        if position < 0:
+            return html.escape(text[:SNIPPET_CHARS])
+        start = max(position - SNIPPET_CHARS // 2, 0)
+        end = position + len(query)
+        return (
+            html.escape(text[start:position])
+            + "<mark>" + html.escape(text[position:end]) + "</mark>"
+            + html.escape(text[end:end + SNIPPET_CHARS // 2])
+        )
+
+    async def _like_tasks(self, db: AsyncSession, user_id: uuid.UUID, query: str, limit: int) -> List[SearchHit]:
+        pattern = f"%{query}%"
+        rows = await db.execute(
+            select(Task.id, Task.title, Task.description, Task.status, Task.due_date)
+            .where(Task.user_id == user_id, or_(Task.title.ilike(pattern), Task.description.ilike(pattern)))
+            .order_by(Task.updated_at.desc())
+            .limit(limit)
+        )
+        return [
+            SearchHit(
+                kind="task", id=row.id, title=row.title, snippet=self._like_snippet(row.description or row.title, query),
+                rank=0.0, status=row.status, date=row.due_date,
+            )
+            for row in rows
+        ]
+
+    async def _like_documents(self, db: AsyncSession, user_id: uuid.UUID, query: str, limit: int) -> List[SearchHit]:
+        pattern = f"%{query}%"
+        rows = await db.execute(
+            select(Document.id, Document.title, Document.type, Document.uploaded_at, Document.extracted_text)
+            .where(
+                Document.user_id == user_id,
+                or_(
+                    Document.title.ilike(pattern),
+                    Document.extracted_text.ilike(pattern),
+                    cast(Document.doc_metadata, String).ilike(pattern),
+                ),
+            )
+            .order_by(Document.uploaded_at.desc())
+            .limit(limit)
+        )
+        return [
+            SearchHit(
+                kind="document", id=row.id, title=row.title, snippet=self._like_snippet(row.extracted_text, query),
+                rank=0.0, type=row.type, date=row.uploaded_at,
+            )
+            for row in rows
+        ]
+
+
+search_service = SearchService()
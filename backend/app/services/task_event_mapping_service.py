@@ -18,8 +18,93 @@ logger = logging.getLogger(__name__)
 class TaskEventMappingService:
     """Service for mapping tasks to calendar events"""
 
-    def __init__(self, db: Session):
+    PRIORITY_EMOJI = {
+        "low": "🔵",
+        "medium": "🟡",
+        "high": "🟠",
+        "critical": "🔴"
+    }
+
+    def __init__(self, db: Session, commit: bool = True):
+        # commit=False: the per-task methods only add their changes to the
+        # session and the caller commits them (see TaskWriteService)
         self.db = db
+        self.commit = commit
+
+    def _commit(self, *refresh) -> None:
+        """Commit and refresh, unless the caller owns the transaction"""
+        if not self.commit:
+            return
+        self.db.commit()
+        for instance in refresh:
+            self.db.refresh(instance)
+
+    @classmethod
+    def event_fields(cls, task: Task) -> dict:
+        """
+        Title, description and times of the calendar event for a task with a due_date
+
+        For tasks, due_date is the deadline, so the event ends at due_date and
+        lasts estimated_duration_minutes (default 1 hour).
+        """
+        if task.estimated_duration_minutes:
+            duration = timedelta(minutes=task.estimated_duration_minutes)
+        else:
+            duration = timedelta(hours=1)
+
+        emoji = cls.PRIORITY_EMOJI.get(task.priority, "📋")
+
+        description_parts = []
+        if task.description:
+            description_parts.append(task.description)
+        description_parts.append(f"\nStatus: {task.status}")
+        description_parts.append(f"Priority: {task.priority}")
+        if task.amount:
+            description_parts.append(f"Amount: {task.amount} {task.currency}")
+
+        return {
+            "title": f"{emoji} {task.title}",
+            "description": "\n".join(description_parts),
+            "start_time": task.due_date - duration,
+            "end_time": task.due_date,
+        }
+
+    @classmethod
+    def build_event(
+        cls,
+        task: Task,
+        integration_id: Optional[str] = None,
+        auto_sync: bool = True
+    ) -> CalendarEvent:
+        """Calendar event for a task, not added to any session (used for batches)"""
+        return CalendarEvent(
+            user_id=task.user_id,
+            task_id=task.id,
+            all_day=False,
+            external_calendar_id=integration_id,
+            sync_status=CalendarSyncStatus.PENDING if (integration_id and auto_sync) else CalendarSyncStatus.SYNCED,
+            **cls.event_fields(task),
+        )
+
+    @classmethod
+    def apply_task_to_event(cls, event: CalendarEvent, task: Task) -> bool:
+        """
+        Copy the task's details onto its event
+
+        Returns False if nothing changed. Synced events of an external
+        calendar are marked for re-sync.
+        """
+        fields = cls.event_fields(task)
+        if all(getattr(event, name) == value for name, value in fields.items()):
+            return False
+
+        for name, value in fields.items():
+            setattr(event, name, value)
+
+        # Mark for re-sync if it was previously synced
+        if event.sync_status == CalendarSyncStatus.SYNCED and event.external_calendar_id:
+            event.sync_status = CalendarSyncStatus.PENDING
+        return True
 
     def create_event_from_task(
         self,
@@ -48,38 +133,6 @@ class TaskEventMappingService:
             logger.debug(f"Task {task.id} already has a calendar event")
             return task.calendar_event
 
-        # Determine event duration
-        if task.estimated_duration_minutes:
-            duration = timedelta(minutes=task.estimated_duration_minutes)
-        else:
-            # Default to 1 hour
-            duration = timedelta(hours=1)
-
-        # Calculate start and end times
-        # For tasks, we treat due_date as the deadline, so event ends at due_date
-        end_time = task.due_date
-        start_time = end_time - duration
-
-        # Create title with task priority indicator
-        priority_emoji = {
-            "low": "🔵",
-            "medium": "🟡",
-            "high": "🟠",
-            "critical": "🔴"
-        }
-        emoji = priority_emoji.get(task.priority, "📋")
-        title = f"{emoji} {task.title}"
-
-        # Create description with task details
-        description_parts = []
-        if task.description:
-            description_parts.append(task.description)
-        description_parts.append(f"\nStatus: {task.status}")
-        description_parts.append(f"Priority: {task.priority}")
-        if task.amount:
-            description_parts.append(f"Amount: {task.amount} {task.currency}")
-        description = "\n".join(description_parts)
-
         # Validate integration if provided
         if integration_id:
             integration = self.db.query(Integration).filter(
@@ -91,21 +144,11 @@ class TaskEventMappingService:
                 integration_id = None
 
         # Create calendar event
-        new_event = CalendarEvent(
-            user_id=task.user_id,
-            task_id=str(task.id),
-            title=title,
-            description=description,
-            start_time=start_time,
-            end_time=end_time,
-            all_day=False,
-            external_calendar_id=integration_id,
-            sync_status=CalendarSyncStatus.PENDING if (integration_id and auto_sync) else CalendarSyncStatus.SYNCED
-        )
+        new_event = self.build_event(task, integration_id=integration_id, auto_sync=auto_sync)
 
         self.db.add(new_event)
-        self.db.commit()
-        self.db.refresh(new_event)
+        task.calendar_event = new_event
+        self._commit(new_event)
 
         logger.info(f"Created calendar event for task {task.id}: {new_event.id}")
         return new_event
@@ -127,7 +170,8 @@ class TaskEventMappingService:
             if event:
                 logger.info(f"Task {task.id} no longer has due_date, deleting event {event.id}")
                 self.db.delete(event)
-                self.db.commit()
+                task.calendar_event = None
+                self._commit()
             return None
 
         if not event:
@@ -136,55 +180,10 @@ class TaskEventMappingService:
             return self.create_event_from_task(task)
 
         # Update existing event
-        # Recalculate duration
-        if task.estimated_duration_minutes:
-            duration = timedelta(minutes=task.estimated_duration_minutes)
-        else:
-            duration = timedelta(hours=1)
-
-        end_time = task.due_date
-        start_time = end_time - duration
-
-        # Update title with priority
-        priority_emoji = {
-            "low": "🔵",
-            "medium": "🟡",
-            "high": "🟠",
-            "critical": "🔴"
-        }
-        emoji = priority_emoji.get(task.priority, "📋")
-        title = f"{emoji} {task.title}"
-
-        # Update description
-        description_parts = []
-        if task.description:
-            description_parts.append(task.description)
-        description_parts.append(f"\nStatus: {task.status}")
-        description_parts.append(f"Priority: {task.priority}")
-        if task.amount:
-            description_parts.append(f"Amount: {task.amount} {task.currency}")
-        description = "\n".join(description_parts)
-
-        # Check if anything actually changed
-        changed = (
-            event.title != title or
-            event.description != description or
-            event.start_time != start_time or
-            event.end_time != end_time
-        )
+        changed = self.apply_task_to_event(event, task)
 
         if changed:
-            event.title = title
-            event.description = description
-            event.start_time = start_time
-            event.end_time = end_time
-
-            # Mark for re-sync if it was previously synced
-            if event.sync_status == CalendarSyncStatus.SYNCED and event.external_calendar_id:
-                event.sync_status = CalendarSyncStatus.PENDING
-
-            self.db.commit()
-            self.db.refresh(event)
+            self._commit(event)
             logger.info(f"Updated calendar event {event.id} for task {task.id}")
         else:
             logger.debug(f"No changes to event {event.id} for task {task.id}")
@@ -223,7 +222,8 @@ class TaskEventMappingService:
             if force and task.calendar_event:
                 # Delete existing event and recreate
                 self.db.delete(task.calendar_event)
-                self.db.commit()
+                task.calendar_event = None
+                self._commit()
 
             if task.calendar_event:
                 # Update existing event
@@ -0,0 +1,115 @@
+"""
+Task Tree Service
+Loads task hierarchies (parent_task_id) with their rolled-up aggregates in one query
+"""
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from datetime import datetime
+from typing import Dict, List, Sequence
+import logging
+import uuid
+
+from ..models import Task, TaskStatus
+from ..schemas.task import TaskResponse, TaskRollup, TaskTreeNode
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = (TaskStatus.OPEN.value, TaskStatus.IN_PROGRESS.value)
+
+
+class TaskTreeService:
+    """
+    Subtask trees from one recursive query
+
+    Two recursive CTEs: `tree` collects every task below the roots, and
+    `closure` pairs each of them with each of its descendants (including
+    itself). Grouping the closure by ancestor gives the rollup of every node
+    in the same statement. Both use UNION instead of UNION ALL, so
+    overlapping roots (a task and its parent on one page) are not counted
+    twice and a parent cycle cannot recurse forever.
+    """
+
+    def tree_query(self, user_id: uuid.UUID, root_ids: Sequence[uuid.UUID]) -> Select:
+        """Every task of the trees below root_ids with its rollup columns"""
+        tree = (
+            select(Task.id)
+            .where(Task.id.in_(root_ids), Task.user_id == user_id)
+            .cte("tree", recursive=True)
+        )
+        tree = tree.union(
+            select(Task.id).join(tree, Task.parent_task_id == tree.c.id).where(Task.user_id == user_id)
+        )
+
+        closure = select(tree.c.id.label("ancestor_id"), tree.c.id.label("task_id")).cte("closure", recursive=True)
+        closure = closure.union(
+            select(closure.c.ancestor_id, Task.id).join(closure, Task.parent_task_id == closure.c.task_id)
+        )
+
+        descendant = Task.__table__.alias("descendant")
+        is_open = descendant.c.status.in_(OPEN_STATUSES)
+        rollup = (
+            select(
+                closure.c.ancestor_id,
+                func.count().label("task_count"),
+                func.count(case((is_open, 1))).label("open_count"),
+                func.sum(descendant.c.amount).label("total_amount"),
+                func.min(case((is_open, descendant.c.due_date))).label("earliest_due_date"),
+            )
+            .join(descendant, descendant.c.id == closure.c.task_id)
+            .group_by(closure.c.ancestor_id)
+            .subquery("rollup")
+        )
+
+        return select(
+            Task,
+            rollup.c.task_count,
+            rollup.c.open_count,
+            rollup.c.total_amount,
+            rollup.c.earliest_due_date,
+        ).join(rollup, rollup.c.ancestor_id == Task.id)
+
+    async def load_trees(
+        self,
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        root_ids: Sequence[uuid.UUID]
+    ) -> List[TaskTreeNode]:
+        """
+        Nested trees for root_ids, in the given order
+
+        Roots that do not exist (or belong to another user) are skipped.
+        Subtasks are ordered by due date (none last), then id.
+        """
+        if not root_ids:
+            return []
+
+        nodes: Dict[uuid.UUID, TaskTreeNode] = {}
+        parents: Dict[uuid.UUID, uuid.UUID] = {}
+        for task, task_count, open_count, total_amount, earliest_due_date in await db.execute(
+            self.tree_query(user_id, root_ids)
+        ):
+            nodes[task.id] = TaskTreeNode(
+                **TaskResponse.model_validate(task).model_dump(),
+                rollup=TaskRollup(
+                    task_count=task_count,
+                    open_count=open_count,
+                    total_amount=total_amount,
+                    earliest_due_date=earliest_due_date,
+                ),
+            )
+            if task.parent_task_id:
+                parents[task.id] = task.parent_task_id
+
+        for task_id, parent_id in parents.items():
+            if parent_id in nodes:
+                nodes[parent_id].subtasks.append(nodes[task_id])
+
+        for node in nodes.values():
+            node.subtasks.sort(key=lambda child: (child.due_date is None, child.due_date or datetime.min, child.id))
+
+        return [nodes[root_id] for root_id in root_ids if root_id in nodes]
+
+
+task_tree_service = TaskTreeService()
@@ -0,0 +1,92 @@
+"""
+Task Write Service
+Writes a task together with its calendar event and reminders as one unit of work
+"""
+
+from sqlalchemy.orm import Session
+from datetime import datetime
+import logging
+import uuid
+
+from ..models import Task, TaskStatus
+from ..schemas.task import TaskCreate, TaskUpdate
+from .reminder_service import ReminderService
+from .task_event_mapping_service import TaskEventMappingService
+
+logger = logging.getLogger(__name__)
+
+# Task fields whose change moves the reminder schedule
+RESCHEDULE_FIELDS = {"due_date", "priority"}
+
+
+class TaskWriteService:
+    """
+    Coordinator for task writes
+
+    The event and reminder services get the session with commit=False, so a
+    create or update only adds task, event and reminder changes to the
+    session. The caller commits them together (commit(), or `await
+    db.commit()` after AsyncSession.run_sync); nothing is written if it
+    fails halfway.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.events = TaskEventMappingService(db, commit=False)
+        self.reminders = ReminderService()
+
+    def create_task(self, user_id: uuid.UUID, task_data: TaskCreate) -> Task:
+        """
+        Add a new task, its calendar event and reminders (if it has a due_date)
+
+        Id and status are set here instead of on flush, so the event and the
+        reminders can be built before anything is written.
+        """
+        task = Task(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            title=task_data.title,
+            description=task_data.description,
+            due_date=task_data.due_date,
+            status=TaskStatus.OPEN.value,
+            priority=task_data.priority,
+            amount=task_data.amount,
+            currency=task_data.currency,
+            document_id=task_data.document_id,
+            parent_task_id=task_data.parent_task_id,
+        )
+        self.db.add(task)
+
+        if task.due_date:
+            self.events.create_event_from_task(task)
+            task.reminders = self.reminders.build_reminders_for_task(task)
+
+        return task
+
+    def update_task(self, task: Task, task_data: TaskUpdate) -> Task:
+        """Apply the set fields, then update the event and, if needed, the reminders"""
+        update_data = task_data.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(task, field, value)
+
+        # Update completed_at timestamp if status changed to done
+        if task_data.status == "done" and not task.completed_at:
+            task.completed_at = datetime.utcnow()
+        elif task_data.status and task_data.status != "done":
+            task.completed_at = None
+
+        # Automatically update/create/delete calendar event based on due_date
+        self.events.update_event_from_task(task)
+
+        if RESCHEDULE_FIELDS & update_data.keys():
+            self.reminders.reschedule_reminders_for_task(task, self.db, commit=False)
+
+        return task
+
+    def delete_task(self, task: Task) -> None:
+        """Delete a task; its event and reminders go with it (cascade)"""
+        self.db.delete(task)
+
+    def commit(self) -> None:
+        """Write everything in one flush and commit (sync sessions)"""
+        self.db.commit()
@@ -0,0 +1,83 @@
+"""
+Thumbnail Service
+WebP renditions of images and the first page of PDFs
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+import logging
+
+from ..core.config import settings
+
+# PIL is loaded when the first thumbnail is rendered
+if TYPE_CHECKING:
+    from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+class ThumbnailService:
+    """Renders WebP thumbnails at THUMBNAIL_SIZES (long edge in pixels)"""
+
+    def __init__(self, sizes: Optional[Iterable[int]] = None, quality: Optional[int] = None):
+        self.sizes = sorted(set(sizes or settings.THUMBNAIL_SIZES), reverse=True)
+        self.quality = quality or settings.THUMBNAIL_QUALITY
+
+    @staticmethod
+    def supports(mime_type: Optional[str]) -> bool:
+        return bool(mime_type) and (mime_type.startswith("image/") or mime_type == "application/pdf")
+
+    def load(self, source: Path, mime_type: str) -> Image.Image:
+        """
+        Image to render from: the upload itself, or the first page of a PDF
+        rasterized just large enough for the largest size
+        """
+        if mime_type == "application/pdf":
+            try:
+                from pdf2image import convert_from_path
+            except ImportError:
+                raise Exception("pdf2image not installed. Install: pip install pdf2image")
+
+            pages = convert_from_path(source, first_page=1, last_page=1, size=self.sizes[0])
+            if not pages:
+                raise Exception("PDF has no pages")
+            return pages[0]
+
+        from PIL import Image, ImageOps
+
+        image = Image.open(source)
+        # Only decode what the largest thumbnail needs (JPEG draft mode)
+        image.draft("RGB", (self.sizes[0], self.sizes[0]))
+        return ImageOps.exif_transpose(image)
+
+    def render(self, source: Path, mime_type: str, target_dir: Path) -> Dict[int, Path]:
+        """
+        Write one WebP per size to target_dir
+
+        Sizes are rendered from large to small, each from the previous one,
+        so the original is decoded and scaled once. Images smaller than a
+        size are not upscaled.
+
+        Args:
+            source: Local file (see FileStorageService.local_copy)
+            mime_type: MIME type of the file
+            target_dir: Existing directory for the output
+
+        Returns:
+            Dict[int, Path]: size -> WebP file
+        """
+        from PIL import Image
+
+        image = self.load(source, mime_type)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+        renditions = {}
+        for size in self.sizes:
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            path = target_dir / f"{size}.webp"
+            image.save(path, "WEBP", quality=self.quality, method=4)
+            renditions[size] = path
+        return renditions
@@ -3,8 +3,10 @@ Background tasks for Workmate Private
 """
 
 from .document_processing import process_document
+from .thumbnails import generate_thumbnails
+from .upload_cleanup import cleanup_upload_sessions
 from .reminder_dispatch import dispatch_reminders
 from .paperless_sync import paperless_sync
 from .paperless_analyze import analyze_paperless_document
 
-__all__ = ["process_document", "dispatch_reminders", "paperless_sync", "analyze_paperless_document"]
+__all__ = ["process_document", "generate_thumbnails", "cleanup_upload_sessions", "dispatch_reminders", "paperless_sync", "analyze_paperless_document"]
@@ -2,20 +2,29 @@
 Document processing background tasks
 """
 
+from contextlib import ExitStack, contextmanager, nullcontext
 from pathlib import Path
 from datetime import datetime
 from uuid import UUID
-from typing import Optional
+from typing import Iterator, Optional
+import logging
+import shutil
+import tempfile
 
 from ..celery import celery_app
+from ..core.config import settings
 from ..db.session import SessionLocal
 from ..models.document import Document as DocumentModel
+from ..models.file import File as FileModel
 from ..models.task import Task as TaskModel
 from ..services.ocr_service import OCRService
 from ..services.claude_service import ClaudeService
-from ..services.file_storage import FileStorageService
+from ..services.file_storage import FileStorageService, get_storage_backend
+from ..services.image_normalizer import ImageNormalizer
 from ..services.reminder_service import ReminderService
 
+logger = logging.getLogger(__name__)
+
 
 # Quality Assurance Thresholds
 CONFIDENCE_THRESHOLDS = {
@@ -25,13 +34,92 @@ CONFIDENCE_THRESHOLDS = {
 }
 
 
+# Keys of doc_metadata that belong to one document, not to the analysis of its file
+PER_DOCUMENT_METADATA = ("qa_needs_review", "qa_review_reason", "error", "reused_from")
+
+
+def pop_extracted_text(metadata: dict) -> str:
+    """
+    Take the OCR text out of a Claude Vision response
+
+    It is stored in Document.extracted_text only; left in doc_metadata it
+    would be sent with every list and sync response.
+    """
+    return metadata.pop("extracted_text", None) or ""
+
+
+def _find_analyzed_duplicate(db, document: DocumentModel) -> Optional[DocumentModel]:
+    """Latest analyzed document of the same user with an identical file"""
+    if not document.file.checksum:
+        return None
+    return (
+        db.query(DocumentModel)
+        .join(FileModel, DocumentModel.file_id == FileModel.id)
+        .filter(
+            FileModel.checksum == document.file.checksum,
+            DocumentModel.user_id == document.user_id,
+            DocumentModel.id != document.id,
+            DocumentModel.processing_status.in_(("done", "needs_review")),
+            DocumentModel.extracted_text.isnot(None),
+        )
+        .order_by(DocumentModel.processed_at.desc())
+        .first()
+    )
+
+
+@contextmanager
+def _normalized_image(db, file_storage: FileStorageService, file: FileModel) -> Iterator[Path]:
+    """
+    Local copy of the normalized rendition of an uploaded image (see ImageNormalizer)
+
+    Rendered from the original on first use and stored next to it, so a
+    reprocessing (force, retry) neither downloads the original again nor
+    normalizes it twice.
+    """
+    backend = get_storage_backend(file.storage_backend)
+    expected = file_storage.normalized_path(file.checksum, settings.NORMALIZE_LONG_EDGE) if file.checksum else None
+
+    with ExitStack() as stack:
+        path = None
+        if expected and file.normalized_path == expected:
+            try:
+                path = stack.enter_context(backend.local_copy(expected))
+            except FileNotFoundError:
+                logger.warning(f"Normalized image {expected} missing, rendering it again")
+
+        if path is None:
+            original = stack.enter_context(file_storage.local_copy(file))
+            target_dir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+            normalized = ImageNormalizer().normalize(Path(original), target_dir / "normalized.jpg")
+            logger.info(
+                f"Normalized {file.path}: {file.size_bytes} -> {normalized.size_bytes} bytes, "
+                f"{normalized.width}x{normalized.height}, cropped={normalized.cropped}"
+            )
+            path = normalized.path
+
+            if expected:
+                # put() moves its source; keep normalized.jpg for the analysis
+                upload = target_dir / "upload.jpg"
+                shutil.copyfile(normalized.path, upload)
+                backend.put(upload, expected, "image/jpeg")
+                file.normalized_path = expected
+                db.commit()
+
+        yield path
+
+
 @celery_app.task(name="app.tasks.process_document")
-def process_document(document_id: str):
+def process_document(document_id: str, force: bool = False):
     """
     Process uploaded document: OCR → AI Analysis → Task Creation
 
+    If the user's identical file (same checksum) was analyzed before, its
+    OCR text and AI metadata are reused instead of calling OCR and Claude
+    again; QA and task creation still run for this document.
+
     Args:
         document_id: UUID of the document to process
+        force: Always run OCR and AI analysis
     """
     db = SessionLocal()
 
@@ -47,48 +135,66 @@ def process_document(document_id: str):
         document.processing_status = "processing"
         db.commit()
 
-        # Get file path
+        # Get a local copy of the file (downloaded for remote storage backends)
         file_storage = FileStorageService()
-        file_path = file_storage.get_full_path(document.file.path)
-
-        if not Path(file_path).exists():
-            raise Exception(f"File not found: {file_path}")
-
         claude_service = ClaudeService()
+        duplicate = None if force else _find_analyzed_duplicate(db, document)
+        if duplicate is not None:
+            source = nullcontext()
+        elif document.file.mime_type.startswith("image/") and settings.NORMALIZE_IMAGES:
+            # Upright, cropped and downscaled: fewer bytes for Claude Vision
+            source = _normalized_image(db, file_storage, document.file)
+        else:
+            source = file_storage.local_copy(document.file)
+
+        with source as file_path:
+            # Identical file analyzed before: reuse its results
+            if duplicate is not None:
+                extracted_text = duplicate.extracted_text
+                ocr_confidence = duplicate.confidence_score
+                metadata = {
+                    key: value for key, value in (duplicate.doc_metadata or {}).items()
+                    if key not in PER_DOCUMENT_METADATA
+                }
+                metadata["reused_from"] = str(duplicate.id)
+
+                document.extracted_text = extracted_text
+                document.confidence_score = ocr_confidence
+                db.commit()
 
-        # For images: Use Claude Vision API directly (more accurate)
-        if document.file.mime_type.startswith("image/"):
-            metadata = claude_service.analyze_document_image(
-                image_path=Path(file_path),
-                document_type=document.type if document.type != "other" else None
-            )
+            # For images: Use Claude Vision API directly (more accurate)
+            elif document.file.mime_type.startswith("image/"):
+                metadata = claude_service.analyze_document_image(
+                    image_path=Path(file_path),
+                    document_type=document.type if document.type != "other" else None
+                )
 
-            # Extract text from Vision API response
-            extracted_text = metadata.get("extracted_text", "")
-            ocr_confidence = 0.9 if metadata.get("ocr_quality") == "high" else (
-                0.7 if metadata.get("ocr_quality") == "medium" else 0.5
-            )
+                # Extract text from Vision API response
+                extracted_text = pop_extracted_text(metadata)
+                ocr_confidence = 0.9 if metadata.get("ocr_quality") == "high" else (
+                    0.7 if metadata.get("ocr_quality") == "medium" else 0.5
+                )
 
-            # Save OCR results
-            document.extracted_text = extracted_text
-            document.confidence_score = ocr_confidence
-            db.commit()
+                # Save OCR results
+                document.extracted_text = extracted_text
+                document.confidence_score = ocr_confidence
+                db.commit()
 
-        # For PDFs: Use traditional OCR + text analysis
-        else:
-            ocr_service = OCRService()
-            extracted_text, ocr_confidence = ocr_service.extract_from_pdf(Path(file_path))
+            # For PDFs: Use traditional OCR + text analysis
+            else:
+                ocr_service = OCRService()
+                extracted_text, ocr_confidence = ocr_service.extract_from_pdf(Path(file_path))
 
-            # Save OCR results
-            document.extracted_text = extracted_text
-            document.confidence_score = ocr_confidence
-            db.commit()
+                # Save OCR results
+                document.extracted_text = extracted_text
+                document.confidence_score = ocr_confidence
+                db.commit()
 
-            # Analyze extracted text with Claude
-            metadata = claude_service.analyze_document(
-                text=extracted_text,
-                document_type=document.type if document.type != "other" else None
-            )
+                # Analyze extracted text with Claude
+                metadata = claude_service.analyze_document(
+                    text=extracted_text,
+                    document_type=document.type if document.type != "other" else None
+                )
 
         # Update document with AI-extracted metadata
         document.doc_metadata = metadata
@@ -159,13 +265,13 @@ def process_document(document_id: str):
                     status="open",
                 )
                 db.add(new_task)
-                db.commit()
-                db.refresh(new_task)
+                db.flush()
 
+                # Task and reminders are committed together with the document status below
                 if metadata.get("action_required", False) or doc_type in ("contract", "identity_document"):
                     reminder_service = ReminderService()
                     schedule = "contract" if doc_type == "contract" else "priority"
-                    reminder_service.create_reminders_for_task(new_task, db, schedule_type=schedule)
+                    reminder_service.create_reminders_for_task(new_task, db, schedule_type=schedule, commit=False)
 
                 task_created = True
             else:
@@ -186,6 +292,7 @@ def process_document(document_id: str):
             "ocr_confidence": ocr_confidence,
             "ai_confidence": metadata.get("confidence", 0),
             "task_created": task_created,
+            "reused_from": metadata.get("reused_from"),
         }
 
     except Exception as e:
@@ -6,13 +6,14 @@ from ..celery import celery_app
 from ..db.session import SessionLocal
 from ..services.reminder_service import ReminderService
 from ..services.push_notification_service import PushNotificationService
-from ..models.user import User
 
 
 @celery_app.task(name="app.tasks.dispatch_reminders")
 def dispatch_reminders():
     """Check for due reminders and send push notifications."""
-    db = SessionLocal()
+    # Each reminder is committed on its own; keep the eagerly loaded
+    # task/user instead of reloading them after every commit
+    db = SessionLocal(expire_on_commit=False)
     reminder_service = ReminderService()
     push_service = PushNotificationService()
 
@@ -24,7 +25,7 @@ def dispatch_reminders():
             if not task:
                 continue
 
-            user = db.query(User).filter(User.id == task.user_id).first()
+            user = task.user
             if not user:
                 continue
 
@@ -0,0 +1,89 @@
+"""
+Thumbnail rendering tasks
+"""
+
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from uuid import UUID
+
+from ..celery import celery_app
+from ..core.config import settings
+from ..db.session import SessionLocal
+from ..models.file import File as FileModel
+from ..services.file_storage import CHUNK_SIZE, FileStorageService
+from ..services.thumbnail_service import ThumbnailService
+
+logger = logging.getLogger(__name__)
+
+
+def _checksum(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@celery_app.task(name="app.tasks.generate_thumbnails")
+def generate_thumbnails(file_id: str, force: bool = False):
+    """
+    Render the WebP thumbnails of an uploaded image or PDF
+
+    Enqueued next to process_document at upload; existing files are
+    queued by scripts/backfill_thumbnails.py. Thumbnails are stored by
+    checksum (FileStorageService.thumbnail_dir), so a file whose content
+    was rendered before only gets the existing thumbnails recorded.
+
+    Args:
+        file_id: UUID of the File row
+        force: Render again even if all THUMBNAIL_SIZES exist
+    """
+    db = SessionLocal()
+
+    try:
+        file = db.query(FileModel).filter(FileModel.id == UUID(file_id)).first()
+        if not file or not ThumbnailService.supports(file.mime_type):
+            return {"success": False, "file_id": file_id, "reason": "unsupported"}
+
+        sizes = set(settings.THUMBNAIL_SIZES)
+        if not force and file.thumbnail_path and sizes <= set(file.thumbnail_sizes or []):
+            return {"success": True, "file_id": file_id, "reused": True}
+
+        # Identical content rendered before
+        if not force and file.checksum:
+            rendered = (
+                db.query(FileModel)
+                .filter(
+                    FileModel.checksum == file.checksum,
+                    FileModel.id != file.id,
+                    FileModel.storage_backend == file.storage_backend,
+                    FileModel.thumbnail_path.isnot(None),
+                )
+                .first()
+            )
+            if rendered and sizes <= set(rendered.thumbnail_sizes or []):
+                file.thumbnail_path = rendered.thumbnail_path
+                file.thumbnail_sizes = rendered.thumbnail_sizes
+                db.commit()
+                return {"success": True, "file_id": file_id, "reused": True}
+
+        file_storage = FileStorageService()
+        with tempfile.TemporaryDirectory() as target_dir, file_storage.local_copy(file) as source:
+            if not file.checksum:
+                # Stored before checksums were recorded
+                file.checksum = _checksum(Path(source))
+            renditions = ThumbnailService(sizes).render(Path(source), file.mime_type, Path(target_dir))
+            file.thumbnail_path = file_storage.store_thumbnails(file, renditions)
+            file.thumbnail_sizes = sorted(renditions, reverse=True)
+
+        db.commit()
+        return {"success": True, "file_id": file_id, "reused": False, "sizes": file.thumbnail_sizes}
+
+    except Exception as e:
+        logger.warning(f"Thumbnails of file {file_id} failed: {e}")
+        raise
+
+    finally:
+        db.close()
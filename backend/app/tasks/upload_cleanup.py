@@ -0,0 +1,53 @@
+"""
+Celery beat task: removes expired resumable uploads every hour
+"""
+
+import itertools
+import logging
+import time
+from datetime import datetime
+
+from ..celery import celery_app
+from ..core.config import settings
+from ..db.session import SessionLocal
+from ..models.upload_session import UploadSession
+from ..services.file_storage import FileStorageService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.cleanup_upload_sessions")
+def cleanup_upload_sessions():
+    """
+    Delete expired upload sessions and their part files
+
+    Part files without a session (e.g. a cancel that failed half-way) and
+    staged uploads left behind by a crashed worker (*.part) are removed once
+    they are older than UPLOAD_SESSION_EXPIRE_HOURS.
+    """
+    db = SessionLocal()
+    file_storage = FileStorageService()
+
+    try:
+        expired = db.query(UploadSession).filter(UploadSession.expires_at < datetime.utcnow()).all()
+        for upload in expired:
+            file_storage.upload_part_path(upload.id).unlink(missing_ok=True)
+            db.delete(upload)
+        db.commit()
+
+        cutoff = time.time() - settings.UPLOAD_SESSION_EXPIRE_HOURS * 3600
+        orphaned = 0
+        for path in itertools.chain(file_storage.temp_path.glob("*.upload"), file_storage.temp_path.glob("*.part")):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    orphaned += 1
+            except FileNotFoundError:
+                pass
+
+        if expired or orphaned:
+            logger.info(f"Removed {len(expired)} expired uploads and {orphaned} orphaned temp files")
+        return {"expired": len(expired), "orphaned": orphaned}
+
+    finally:
+        db.close()
@@ -0,0 +1,120 @@
+"""
+Shared pytest fixtures
+"""
+
+import os
+from contextlib import contextmanager
+from typing import Optional
+
+import pytest
+
+# Without a database in the environment, app.db.session builds its engines
+# for SQLite; the tests use their own database anyway (see db_engine)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+
+from app import models  # noqa: E402,F401 (registers all tables)
+from app.core import query_budget  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.query_stats import track_queries  # noqa: E402
+from app.db.session import get_async_db, get_db  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(monkeypatch):
+    """Fail the test if any request went over the query budget of its route"""
+    monkeypatch.setattr(settings, "QUERY_BUDGET_TRACE_CALLSITES", True)
+    monkeypatch.setattr(query_budget, "collect_violations", True)
+    query_budget.violations.clear()
+    yield
+    violations = list(query_budget.violations)
+    query_budget.violations.clear()
+    if violations:
+        pytest.fail("\n\n".join(str(v) for v in violations), pytrace=False)
+
+
+@pytest.fixture
+def query_counter():
+    """
+    Count the SQL statements of a block, optionally asserting a maximum
+
+        def test_list_tasks(client, query_counter):
+            with query_counter(4) as stats:
+                client.get("/api/v1/tasks/")
+    """
+    @contextmanager
+    def counter(max_queries: Optional[int] = None):
+        with track_queries(record_sites=True) as stats:
+            yield stats
+        if max_queries is not None and stats.count > max_queries:
+            pytest.fail(f"Expected at most {max_queries} statements, got {stats.report()}", pytrace=False)
+
+    return counter
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    """Sync engine on a fresh SQLite database with all tables"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(db_engine):
+    """Session for seeding and checking rows"""
+    with Session(db_engine) as session:
+        yield session
+
+
+@pytest.fixture
+def client(db_engine, monkeypatch):
+    """
+    TestClient of the app on the test database, logged in as a new user
+
+    The database dependencies are overridden, so requests and the db
+    fixture see the same rows. The principal cache is off: every request
+    resolves its user with a query, as on a cold cache, which is what the
+    route budgets count with. client.user_id is the user's id.
+    """
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    monkeypatch.setattr(settings, "PRINCIPAL_CACHE_ENABLED", False)
+
+    async_engine = create_async_engine(db_engine.url.set(drivername="sqlite+aiosqlite"))
+    async_sessions = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    sync_sessions = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+
+    async def override_get_async_db():
+        async with async_sessions() as session:
+            yield session
+
+    def override_get_db():
+        session = sync_sessions()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_db] = override_get_db
+
+    test_client = TestClient(app)
+    user = {"email": "test@example.com", "username": "test", "password": "secret123"}
+    test_client.user_id = test_client.post("/api/v1/auth/register", json=user).json()["id"]
+    token = test_client.post(
+        "/api/v1/auth/login", json={"username": user["username"], "password": user["password"]}
+    ).json()["access_token"]
+    test_client.headers["Authorization"] = f"Bearer {token}"
+
+    yield test_client
+
+    app.dependency_overrides.clear()
+    async_engine.sync_engine.dispose()
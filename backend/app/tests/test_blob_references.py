@@ -0,0 +1,53 @@
+"""
+Shared blobs
+
+Documents with identical content share one stored file (a blob with a
+reference count): deleting a document removes the file only with the last
+reference.
+"""
+
+import pytest
+
+from app.api.v1 import documents
+from app.core.config import settings
+from app.models import Blob
+from app.services import file_storage
+from app.services.file_storage import FileStorageService
+
+CONTENT = b"%PDF-1.4 shared content"
+
+
+@pytest.fixture
+def storage(client, tmp_path, monkeypatch):
+    """Local storage in a temporary UPLOAD_DIR, without the Celery tasks of uploads"""
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "local")
+    monkeypatch.setattr(file_storage, "_backends", {})
+    monkeypatch.setattr(documents, "file_storage", FileStorageService())
+    monkeypatch.setattr(documents.process_document, "delay", lambda *args, **kwargs: None)
+    monkeypatch.setattr(documents.generate_thumbnails, "delay", lambda *args, **kwargs: None)
+    return tmp_path
+
+
+def upload(client, filename: str) -> dict:
+    response = client.post("/api/v1/documents/", files={"file": (filename, CONTENT, "application/pdf")})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_shared_blob_is_removed_with_the_last_document(client, db, storage):
+    first, second = upload(client, "a.pdf"), upload(client, "b.pdf")
+    path = storage / first["file"]["path"]
+    assert first["file"]["path"] == second["file"]["path"]
+    assert db.query(Blob).one().ref_count == 2
+
+    assert client.delete(f"/api/v1/documents/{first['id']}").status_code == 204
+    db.expire_all()
+    assert path.read_bytes() == CONTENT
+    assert db.query(Blob).one().ref_count == 1
+    assert client.get(second["file"]["url"]).content == CONTENT
+
+    assert client.delete(f"/api/v1/documents/{second['id']}").status_code == 204
+    db.expire_all()
+    assert not path.exists()
+    assert db.query(Blob).count() == 0
@@ -0,0 +1,78 @@
+"""
+Signed file URLs
+
+GET /files/{path} serves a file only with the signature of create_file_url():
+any change to the path, owner, expiry or storage backend gets 403.
+"""
+
+import time
+import uuid
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import pytest
+
+from app.core.config import settings
+from app.core.security import create_file_url
+
+FILE_PATH = "blobs/ab/" + "ab" * 32 + ".pdf"
+CONTENT = b"%PDF-1.4 signed"
+
+
+@pytest.fixture
+def stored_file(client, tmp_path, monkeypatch):
+    """A file in UPLOAD_DIR and its signed URL for the client's user"""
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    path = tmp_path / FILE_PATH
+    path.parent.mkdir(parents=True)
+    path.write_bytes(CONTENT)
+    return create_file_url(FILE_PATH, uuid.UUID(client.user_id))
+
+
+def with_params(url: str, **params) -> str:
+    """The URL with some query parameters replaced"""
+    parts = urlsplit(url)
+    query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+    query.update(params)
+    return f"{parts.path}?{urlencode(query)}"
+
+
+def test_valid_url_serves_the_file(client, stored_file):
+    response = client.get(stored_file)
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+def test_unsigned_url_is_rejected(client, stored_file):
+    assert client.get(urlsplit(stored_file).path).status_code == 403
+
+
+def test_tampered_signature_is_rejected(client, stored_file):
+    signature = parse_qs(urlsplit(stored_file).query)["sig"][0]
+    tampered = ("A" if signature[0] != "A" else "B") + signature[1:]
+    assert client.get(with_params(stored_file, sig=tampered)).status_code == 403
+
+
+def test_tampered_path_is_rejected(client, stored_file, tmp_path):
+    other = "blobs/cd/" + "cd" * 32 + ".pdf"
+    (tmp_path / other).parent.mkdir(parents=True)
+    (tmp_path / other).write_bytes(b"other")
+    url = stored_file.replace(FILE_PATH, other)
+    assert client.get(url).status_code == 403
+
+
+def test_foreign_user_is_rejected(client, stored_file):
+    assert client.get(with_params(stored_file, uid=str(uuid.uuid4()))).status_code == 403
+
+
+def test_tampered_backend_is_rejected(client, stored_file):
+    assert client.get(with_params(stored_file, b="s3")).status_code == 403
+
+
+def test_expired_url_is_rejected(client, stored_file):
+    expired = create_file_url(FILE_PATH, uuid.UUID(client.user_id), expires=int(time.time()) - 60)
+    assert client.get(expired).status_code == 403
+
+
+def test_extended_expiry_is_rejected(client, stored_file):
+    expires = int(parse_qs(urlsplit(stored_file).query)["exp"][0])
+    assert client.get(with_params(stored_file, exp=str(expires + 3600))).status_code == 403
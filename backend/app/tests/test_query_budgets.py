@@ -0,0 +1,78 @@
+"""
+Query budgets of the list endpoints
+
+Each list is requested at two page sizes: the number of statements must
+not grow with the page (no N+1), and enforce_query_budgets fails the test
+if a request goes over the budget declared on its route.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.models import CalendarEvent, Document, File, Reminder, Task
+
+SMALL_PAGE, LARGE_PAGE = 3, 20
+
+
+@pytest.fixture
+def seeded(client, db):
+    """25 of everything for the client's user: tasks with subtasks and reminders, documents, events"""
+    user_id = uuid.UUID(client.user_id)
+    now = datetime.utcnow()
+    for i in range(25):
+        task = Task(user_id=user_id, title=f"Task {i}", due_date=now + timedelta(days=i))
+        task.subtasks = [Task(user_id=user_id, title=f"Subtask {i}.{j}") for j in range(2)]
+        task.reminders = [Reminder(trigger_at=now + timedelta(days=i, hours=-1), severity="medium")]
+        db.add(task)
+
+        file = File(
+            user_id=user_id, path=f"blobs/{i:02x}/{i:064x}.pdf", original_filename=f"scan-{i}.pdf",
+            size_bytes=1000, mime_type="application/pdf", checksum=f"{i:064x}",
+        )
+        db.add(Document(
+            user_id=user_id, file=file, type="invoice", title=f"Rechnung {i}",
+            doc_metadata={"amount": 39.95}, extracted_text="Rechnung " * 100, uploaded_at=now - timedelta(minutes=i),
+        ))
+
+        db.add(CalendarEvent(
+            user_id=user_id, title=f"Event {i}", start_time=now + timedelta(days=i),
+            end_time=now + timedelta(days=i, hours=1),
+        ))
+    db.commit()
+    return client
+
+
+def statement_counts(client, query_counter, url: str):
+    counts = []
+    for limit in (SMALL_PAGE, LARGE_PAGE):
+        with query_counter() as stats:
+            response = client.get(url, params={"limit": limit})
+        assert response.status_code == 200, response.text
+        assert response.json(), f"{url} returned an empty page"
+        counts.append(stats.count)
+    return counts
+
+
+@pytest.fixture(params=[False, True], ids=["orm", "fast"])
+def fast_list_responses(request, monkeypatch):
+    monkeypatch.setattr(settings, "FAST_LIST_RESPONSES", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("url", ["/api/v1/tasks/", "/api/v1/documents/", "/api/v1/calendar/events/"])
+def test_list_statements_do_not_grow_with_page_size(seeded, query_counter, fast_list_responses, url):
+    small, large = statement_counts(seeded, query_counter, url)
+    assert small == large
+
+
+def test_task_subtrees_do_not_grow_with_page_size(seeded, query_counter):
+    small, large = statement_counts(seeded, query_counter, "/api/v1/tasks/?include=subtree")
+    assert small == large
+
+
+def test_sync_changes_do_not_grow_with_page_size(seeded, query_counter):
+    small, large = statement_counts(seeded, query_counter, "/api/v1/sync/changes")
+    assert small == large
@@ -0,0 +1,41 @@
+"""add resumable upload sessions
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = 'a3b4c5d6e7f8'
+down_revision = 'f2a3b4c5d6e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'upload_sessions',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('document_type', sa.String(length=50), nullable=False, server_default='other'),
+        sa.Column('title', sa.String(length=255), nullable=True),
+        sa.Column('force_processing', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_upload_sessions_user_id', 'upload_sessions', ['user_id'])
+    op.create_index('ix_upload_sessions_expires_at', 'upload_sessions', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_upload_sessions_expires_at', table_name='upload_sessions')
+    op.drop_index('ix_upload_sessions_user_id', table_name='upload_sessions')
+    op.drop_table('upload_sessions')
@@ -0,0 +1,107 @@
+"""add full-text search vectors to tasks and documents
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = 'a7b8c9d0e1f2'
+down_revision = 'f6a7b8c9d0e1'
+branch_labels = None
+depends_on = None
+
+
+# Weights: A title, B sender / task description, D OCR text.
+# The functions are IMMUTABLE so the triggers and the backfill below share them.
+TASKS_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION tasks_search_vector(title text, description text)
+RETURNS tsvector LANGUAGE sql IMMUTABLE AS $$
+    SELECT setweight(to_tsvector('german', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('german', coalesce(description, '')), 'B')
+$$;
+
+CREATE OR REPLACE FUNCTION tasks_search_vector_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector := tasks_search_vector(NEW.title, NEW.description);
+    RETURN NEW;
+END
+$$;
+"""
+
+DOCUMENTS_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION documents_search_sender(doc_metadata json)
+RETURNS text LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE json_typeof(doc_metadata -> 'sender')
+        WHEN 'object' THEN doc_metadata -> 'sender' ->> 'name'
+        WHEN 'string' THEN doc_metadata ->> 'sender'
+    END
+$$;
+
+CREATE OR REPLACE FUNCTION documents_search_vector(title text, doc_metadata json, extracted_text text)
+RETURNS tsvector LANGUAGE sql IMMUTABLE AS $$
+    SELECT setweight(to_tsvector('german', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('german', coalesce(documents_search_sender(doc_metadata), '')), 'B')
+        || setweight(to_tsvector('german', coalesce(extracted_text, '')), 'D')
+$$;
+
+CREATE OR REPLACE FUNCTION documents_search_vector_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector := documents_search_vector(NEW.title, NEW.doc_metadata, NEW.extracted_text);
+    RETURN NEW;
+END
+$$;
+"""
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        # SQLite (local dev): plain columns, /search falls back to LIKE
+        op.add_column('tasks', sa.Column('search_vector', sa.Text(), nullable=True))
+        op.add_column('documents', sa.Column('search_vector', sa.Text(), nullable=True))
+        return
+
+    op.add_column('tasks', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.add_column('documents', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    op.execute(TASKS_VECTOR_FUNCTION)
+    op.execute(DOCUMENTS_VECTOR_FUNCTION)
+
+    # Only writes that touch the indexed columns pay for re-indexing
+    op.execute("""
+        CREATE TRIGGER tasks_search_vector_update
+        BEFORE INSERT OR UPDATE OF title, description ON tasks
+        FOR EACH ROW EXECUTE FUNCTION tasks_search_vector_trigger()
+    """)
+    op.execute("""
+        CREATE TRIGGER documents_search_vector_update
+        BEFORE INSERT OR UPDATE OF title, doc_metadata, extracted_text ON documents
+        FOR EACH ROW EXECUTE FUNCTION documents_search_vector_trigger()
+    """)
+
+    op.execute("UPDATE tasks SET search_vector = tasks_search_vector(title, description)")
+    op.execute(
+        "UPDATE documents SET search_vector = documents_search_vector(title, doc_metadata, extracted_text)"
+    )
+
+    op.create_index('ix_tasks_search_vector', 'tasks', ['search_vector'], postgresql_using='gin')
+    op.create_index('ix_documents_search_vector', 'documents', ['search_vector'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_documents_search_vector', 'documents')
+        op.drop_index('ix_tasks_search_vector', 'tasks')
+        op.execute("DROP TRIGGER IF EXISTS documents_search_vector_update ON documents")
+        op.execute("DROP TRIGGER IF EXISTS tasks_search_vector_update ON tasks")
+        op.execute("DROP FUNCTION IF EXISTS documents_search_vector_trigger()")
+        op.execute("DROP FUNCTION IF EXISTS documents_search_vector(text, json, text)")
+        op.execute("DROP FUNCTION IF EXISTS documents_search_sender(json)")
+        op.execute("DROP FUNCTION IF EXISTS tasks_search_vector_trigger()")
+        op.execute("DROP FUNCTION IF EXISTS tasks_search_vector(text, text)")
+
+    op.drop_column('documents', 'search_vector')
+    op.drop_column('tasks', 'search_vector')
@@ -0,0 +1,29 @@
+"""move extracted_text out of documents.doc_metadata
+
+Revision ID: b4c5d6e7f8a9
+Revises: a3b4c5d6e7f8
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+
+revision = 'b4c5d6e7f8a9'
+down_revision = 'a3b4c5d6e7f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Image documents kept the Claude Vision OCR text in doc_metadata as
+    # well; keep it in extracted_text (if that is empty) and drop the copy
+    op.execute(
+        "UPDATE documents "
+        "SET extracted_text = COALESCE(NULLIF(extracted_text, ''), doc_metadata::jsonb ->> 'extracted_text'), "
+        "    doc_metadata = (doc_metadata::jsonb - 'extracted_text')::json "
+        "WHERE doc_metadata::jsonb -> 'extracted_text' IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    # The text is still in documents.extracted_text
+    pass
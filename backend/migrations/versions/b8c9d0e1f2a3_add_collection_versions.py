@@ -0,0 +1,29 @@
+"""add per-user collection versions for list ETags
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = 'b8c9d0e1f2a3'
+down_revision = 'a7b8c9d0e1f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'collection_versions',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('collection', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('user_id', 'collection'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('collection_versions')
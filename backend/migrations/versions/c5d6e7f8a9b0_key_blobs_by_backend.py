@@ -0,0 +1,56 @@
+"""key blobs by checksum and storage backend
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'c5d6e7f8a9b0'
+down_revision = 'b4c5d6e7f8a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('blobs', sa.Column('backend', sa.String(length=50), nullable=False, server_default='local'))
+    op.drop_constraint('blobs_pkey', 'blobs', type_='primary')
+    op.create_primary_key('blobs_pkey', 'blobs', ['checksum', 'backend'])
+    op.alter_column('blobs', 'backend', server_default=None)
+
+    # Content stored again after a STORAGE_BACKEND change shared one row
+    # (and one count) across backends: one row per backend holding it,
+    # counting the File rows there
+    op.execute(
+        "INSERT INTO blobs (checksum, backend, path, size_bytes, ref_count, created_at) "
+        "SELECT DISTINCT b.checksum, f.storage_backend, b.path, b.size_bytes, 0, b.created_at "
+        "FROM blobs b JOIN files f ON f.checksum = b.checksum AND f.path = b.path "
+        "WHERE f.storage_backend IS NOT NULL AND f.storage_backend <> 'local' "
+        "ON CONFLICT DO NOTHING"
+    )
+    op.execute(
+        "UPDATE blobs SET ref_count = ("
+        "    SELECT count(*) FROM files f "
+        "    WHERE f.checksum = blobs.checksum AND f.path = blobs.path AND f.storage_backend = blobs.backend"
+        ")"
+    )
+    op.execute("DELETE FROM blobs WHERE ref_count = 0")
+
+
+def downgrade() -> None:
+    # One row per checksum again, counting the File rows in all backends
+    op.execute(
+        "UPDATE blobs SET ref_count = ("
+        "    SELECT sum(other.ref_count) FROM blobs other WHERE other.checksum = blobs.checksum"
+        ")"
+    )
+    op.execute(
+        "DELETE FROM blobs WHERE backend <> ("
+        "    SELECT min(other.backend) FROM blobs other WHERE other.checksum = blobs.checksum"
+        ")"
+    )
+    op.drop_constraint('blobs_pkey', 'blobs', type_='primary')
+    op.create_primary_key('blobs_pkey', 'blobs', ['checksum'])
+    op.drop_column('blobs', 'backend')
@@ -0,0 +1,51 @@
+"""add sync change log for GET /sync/changes
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = 'c9d0e1f2a3b4'
+down_revision = 'b8c9d0e1f2a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sync_changes',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('entity', sa.String(length=30), nullable=False),
+        sa.Column('entity_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('seq', sa.BigInteger(), nullable=False),
+        sa.Column('deleted', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.PrimaryKeyConstraint('user_id', 'entity', 'entity_id'),
+    )
+    op.create_index('ix_sync_changes_user_id_seq', 'sync_changes', ['user_id', 'seq'])
+
+    # Existing rows are the first change (seq 1) of their user, so a full
+    # sync (since=0) returns them
+    op.execute("INSERT INTO sync_changes (user_id, entity, entity_id, seq) SELECT user_id, 'task', id, 1 FROM tasks")
+    op.execute("INSERT INTO sync_changes (user_id, entity, entity_id, seq) SELECT user_id, 'document', id, 1 FROM documents")
+    op.execute(
+        "INSERT INTO sync_changes (user_id, entity, entity_id, seq) "
+        "SELECT user_id, 'calendar_event', id, 1 FROM calendar_events"
+    )
+    op.execute(
+        "INSERT INTO sync_changes (user_id, entity, entity_id, seq) "
+        "SELECT tasks.user_id, 'reminder', reminders.id, 1 FROM reminders JOIN tasks ON tasks.id = reminders.task_id"
+    )
+    op.execute(
+        "INSERT INTO collection_versions (user_id, collection, version) "
+        "SELECT DISTINCT user_id, 'sync', 1 FROM sync_changes"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM collection_versions WHERE collection = 'sync'")
+    op.drop_index('ix_sync_changes_user_id_seq', 'sync_changes')
+    op.drop_table('sync_changes')
@@ -0,0 +1,31 @@
+"""add content-addressed blobs with reference counts
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'd0e1f2a3b4c5'
+down_revision = 'c9d0e1f2a3b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing files keep their per-user paths and get no blob row
+    op.create_table(
+        'blobs',
+        sa.Column('checksum', sa.String(length=64), nullable=False),
+        sa.Column('path', sa.String(length=500), nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('checksum'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('blobs')
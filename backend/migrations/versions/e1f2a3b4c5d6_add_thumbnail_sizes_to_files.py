@@ -0,0 +1,23 @@
+"""add thumbnail sizes to files
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'e1f2a3b4c5d6'
+down_revision = 'd0e1f2a3b4c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing files get thumbnails from scripts/backfill_thumbnails.py
+    op.add_column('files', sa.Column('thumbnail_sizes', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('files', 'thumbnail_sizes')
@@ -0,0 +1,44 @@
+"""store user api keys as sha256 digests
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'e5f6a7b8c9d0'
+down_revision = 'd4e5f6a7b8c9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('api_key_hash', sa.String(64), nullable=True))
+    op.add_column('users', sa.Column('api_key_prefix', sa.String(8), nullable=True))
+
+    # Existing keys keep working: hash them in place
+    op.execute(
+        "UPDATE users "
+        "SET api_key_hash = encode(sha256(convert_to(api_key, 'UTF8')), 'hex'), "
+        "    api_key_prefix = left(api_key, 8) "
+        "WHERE api_key IS NOT NULL"
+    )
+
+    op.create_index('ix_users_api_key_hash', 'users', ['api_key_hash'], unique=True)
+
+    op.drop_index('ix_users_api_key', 'users')
+    op.drop_constraint('uq_users_api_key', 'users', type_='unique')
+    op.drop_column('users', 'api_key')
+
+
+def downgrade() -> None:
+    # Plaintext keys cannot be recovered; users have to generate a new key
+    op.add_column('users', sa.Column('api_key', sa.String(64), nullable=True))
+    op.create_unique_constraint('uq_users_api_key', 'users', ['api_key'])
+    op.create_index('ix_users_api_key', 'users', ['api_key'])
+
+    op.drop_index('ix_users_api_key_hash', 'users')
+    op.drop_column('users', 'api_key_prefix')
+    op.drop_column('users', 'api_key_hash')
@@ -0,0 +1,23 @@
+"""add normalized image path to files
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'f2a3b4c5d6e7'
+down_revision = 'e1f2a3b4c5d6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled by process_document the next time an image is analyzed
+    op.add_column('files', sa.Column('normalized_path', sa.String(length=500), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('files', 'normalized_path')
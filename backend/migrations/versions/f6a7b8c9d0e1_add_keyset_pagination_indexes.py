@@ -0,0 +1,27 @@
+"""add composite indexes for keyset pagination
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+
+revision = 'f6a7b8c9d0e1'
+down_revision = 'e5f6a7b8c9d0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (user_id, sort column, id): serves both the ORDER BY and the cursor
+    # comparison of the list endpoints, read forwards or backwards
+    op.create_index('ix_tasks_user_id_due_date_id', 'tasks', ['user_id', 'due_date', 'id'])
+    op.create_index('ix_documents_user_id_uploaded_at_id', 'documents', ['user_id', 'uploaded_at', 'id'])
+    op.create_index('ix_calendar_events_user_id_start_time_id', 'calendar_events', ['user_id', 'start_time', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_calendar_events_user_id_start_time_id', 'calendar_events')
+    op.drop_index('ix_documents_user_id_uploaded_at_id', 'documents')
+    op.drop_index('ix_tasks_user_id_due_date_id', 'tasks')
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Queue thumbnail rendering for files stored before thumbnails existed
+
+Enqueues one generate_thumbnails task per image/PDF without thumbnails
+(with --force: every image/PDF), so all running Celery workers render in
+parallel. Files are read in id order in batches; the script only needs
+the database and the broker.
+
+    python scripts/backfill_thumbnails.py --dry-run
+    python scripts/backfill_thumbnails.py --batch-size 500
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add app directory to path
+sys.path.append(str(Path(__file__).parents[1]))
+
+from sqlalchemy import or_, select  # noqa: E402
+
+from app.db.session import SessionLocal  # noqa: E402
+from app.models import File  # noqa: E402
+from app.tasks.thumbnails import generate_thumbnails  # noqa: E402
+
+
+def pending_files(session, batch_size: int, force: bool):
+    """Ids of files to render, batch by batch (keyset on id)"""
+    query = (
+        select(File.id)
+        .where(or_(File.mime_type.like("image/%"), File.mime_type == "application/pdf"))
+        .order_by(File.id)
+        .limit(batch_size)
+    )
+    if not force:
+        query = query.where(File.thumbnail_path.is_(None))
+
+    last_id = None
+    while True:
+        batch = session.scalars(query if last_id is None else query.where(File.id > last_id)).all()
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500, help="Files read per query")
+    parser.add_argument("--limit", type=int, help="Queue at most this many files")
+    parser.add_argument("--force", action="store_true", help="Render files that have thumbnails again")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the files")
+    args = parser.parse_args()
+
+    queued = 0
+    session = SessionLocal()
+    try:
+        for batch in pending_files(session, args.batch_size, args.force):
+            if args.limit is not None:
+                batch = batch[:args.limit - queued]
+            if not args.dry_run:
+                for file_id in batch:
+                    generate_thumbnails.delay(str(file_id), force=args.force)
+            queued += len(batch)
+            print(f"{'Found' if args.dry_run else 'Queued'} {queued} files")
+            if args.limit is not None and queued >= args.limit:
+                break
+    finally:
+        session.close()
+
+    print(f"✅ {queued} files {'to render' if args.dry_run else 'queued for thumbnails'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+API latency benchmark under concurrent load
+
+Fires N requests with C concurrent clients against a running API and reports
+p50/p95/p99 latency per endpoint. Results can be written to JSON and compared
+with an earlier run, e.g. before/after the async DB port:
+
+    git checkout <before>   && uvicorn app.main:app &
+    python scripts/bench_api_latency.py --token $TOKEN --out before.json
+    git checkout <after>    && uvicorn app.main:app &
+    python scripts/bench_api_latency.py --token $TOKEN --out after.json --compare before.json
+
+Use --slow-path to mix in requests to an endpoint that is slow on purpose
+(e.g. a manual calendar sync); with blocking DB calls on the event loop the
+p99 of the fast endpoints goes up with it.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import defaultdict
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/api/v1/auth/me",
+    "/api/v1/tasks/",
+    "/api/v1/documents/",
+    "/api/v1/calendar/events/",
+]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: dict[str, list[float]], errors: dict[str, int]) -> dict:
+    summary = {}
+    for path, values in latencies.items():
+        summary[path] = {
+            "count": len(values),
+            "errors": errors.get(path, 0),
+            "mean_ms": round(statistics.fmean(values), 2) if values else 0.0,
+            "p50_ms": round(percentile(values, 50), 2),
+            "p95_ms": round(percentile(values, 95), 2),
+            "p99_ms": round(percentile(values, 99), 2),
+        }
+    return summary
+
+
+async def run(args) -> dict:
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    if args.api_key:
+        headers = {"X-API-Key": args.api_key}
+
+    paths = args.path or DEFAULT_PATHS
+    schedule = [paths[i % len(paths)] for i in range(args.requests)]
+    if args.slow_path:
+        # Every 10th request hits the slow endpoint
+        schedule = [args.slow_path if i % 10 == 0 else p for i, p in enumerate(schedule)]
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    queue: asyncio.Queue = asyncio.Queue()
+    for path in schedule:
+        queue.put_nowait(path)
+
+    async def worker(client: httpx.AsyncClient):
+        while True:
+            try:
+                path = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            method = "POST" if path == args.slow_path and args.slow_method == "POST" else "GET"
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, headers=headers)
+                if response.status_code >= 400:
+                    errors[path] += 1
+            except httpx.HTTPError:
+                errors[path] += 1
+            latencies[path].append((time.perf_counter() - started) * 1000)
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "label": args.label,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(args.requests / elapsed, 1),
+        "endpoints": summarize(latencies, errors),
+    }
+
+
+def print_report(result: dict, baseline: dict | None = None) -> None:
+    print(f"\n{result['label']}: {result['requests']} requests, concurrency {result['concurrency']}, "
+          f"{result['throughput_rps']} req/s")
+    print(f"{'endpoint':<40} {'p50':>9} {'p95':>9} {'p99':>9} {'err':>5}" + ("   p99 vs base" if baseline else ""))
+    for path, stats in result["endpoints"].items():
+        line = f"{path:<40} {stats['p50_ms']:>8.1f}ms {stats['p95_ms']:>7.1f}ms {stats['p99_ms']:>7.1f}ms {stats['errors']:>5}"
+        base = (baseline or {}).get("endpoints", {}).get(path)
+        if base and base["p99_ms"]:
+            line += f"   {stats['p99_ms'] / base['p99_ms']:.2f}x"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", help="JWT access token")
+    parser.add_argument("--api-key", help="X-API-Key instead of a JWT")
+    parser.add_argument("--path", action="append", help="Endpoint to hit (repeatable)")
+    parser.add_argument("--slow-path", help="Slow endpoint mixed into the load")
+    parser.add_argument("--slow-method", default="POST", choices=["GET", "POST"])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--out", help="Write results as JSON")
+    parser.add_argument("--compare", help="Earlier JSON result to compare against")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print_report(baseline)
+    print_report(result, baseline)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
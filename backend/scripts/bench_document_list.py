@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Document list payload: full documents vs. summaries without extracted_text
+
+Seeds one account with N documents (with files) carrying multi-page OCR
+text and measures, for the first page (GET /documents/ default limit) and
+for the whole account:
+
+- full:    SELECT every column + files -> DocumentWithFileResponse
+           (the list response before the summary schema)
+- summary: defer(extracted_text) + files -> DocumentSummaryWithFileResponse
+           (GET /documents/ now)
+
+and one page of GET /documents/{id}/text. A share of the documents
+(--image-share) are photos analyzed with Claude Vision, whose response
+carries the OCR text as well; they are stored the way process_document
+stores them, so text left in doc_metadata shows up in the summary size. Reported are the median query
+time (SELECT and fetch), the total time including serialization, and the
+JSON payload size. The default database is in-memory SQLite, which stores
+text inline; point --database-url at a scratch PostgreSQL to include the
+de-TOASTing that the summary skips (the tables are created, never dropped).
+
+    python scripts/bench_document_list.py --documents 1000 --out after.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine, func, select  # noqa: E402
+from sqlalchemy.orm import defer, selectinload, sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.models import Document, File, User  # noqa: E402
+from app.schemas.document import DocumentSummaryWithFileResponse, DocumentWithFileResponse  # noqa: E402
+from app.tasks.document_processing import pop_extracted_text  # noqa: E402
+
+WORDS = (
+    "Rechnung Betrag Kundennummer Zahlung Überweisung bis zum Monatsende Telekom Deutschland GmbH "
+    "Leistungszeitraum Mehrwertsteuer Gesamtbetrag fällig Vertragsnummer Seite von Bankverbindung IBAN"
+).split()
+PAGE_CHARS = 3000  # OCR text of one scanned A4 page
+
+
+def ocr_text(pages: int) -> str:
+    return "\n\f\n".join(
+        " ".join(random.choice(WORDS) for _ in range(PAGE_CHARS // 8)) for _ in range(pages)
+    )
+
+
+def vision_document(text: str):
+    """extracted_text and doc_metadata of a photo, as process_document stores the Vision response"""
+    metadata = {
+        "type": "invoice", "title": "Rechnung", "confidence": 0.9, "extracted_text": text,
+        "sender": {"name": "Telekom"}, "amount": 39.95, "due_date": "2026-11-30", "ocr_quality": "high",
+    }
+    extracted_text = pop_extracted_text(metadata)
+    return extracted_text, metadata
+
+
+def seed(session, documents: int, image_share: float) -> uuid.UUID:
+    user = User(id=uuid.uuid4(), email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+                username=f"bench-{uuid.uuid4().hex[:8]}", password_hash="-")
+    session.add(user)
+    now = datetime.utcnow()
+    for i in range(documents):
+        text = ocr_text(random.randint(1, 8))
+        if random.random() < image_share:
+            extension, mime_type = "jpg", "image/jpeg"
+            extracted_text, metadata = vision_document(text)
+        else:
+            extension, mime_type = "pdf", "application/pdf"
+            extracted_text = text
+            metadata = {"sender": {"name": "Telekom"}, "amount": 39.95, "due_date": "2026-11-30"}
+        file = File(
+            id=uuid.uuid4(), user_id=user.id, path=f"{user.id}/{i:08x}.{extension}",
+            original_filename=f"scan-{i}.{extension}", size_bytes=random.randint(100_000, 5_000_000),
+            mime_type=mime_type, created_at=now,
+        )
+        session.add(file)
+        session.add(Document(
+            id=uuid.uuid4(), user_id=user.id, file_id=file.id, type="invoice", title=f"Rechnung {i}",
+            doc_metadata=metadata, processing_status="done", confidence_score=0.93, extracted_text=extracted_text,
+            uploaded_at=now - timedelta(minutes=i), processed_at=now,
+        ))
+    session.commit()
+    return user.id
+
+
+def list_query(user_id: uuid.UUID, limit: int):
+    return (
+        select(Document)
+        .where(Document.user_id == user_id)
+        .order_by(Document.uploaded_at.desc(), Document.id.desc())
+        .limit(limit)
+    )
+
+
+PATHS = {
+    "full": (DocumentWithFileResponse, [selectinload(Document.file)]),
+    "summary": (DocumentSummaryWithFileResponse, [defer(Document.extracted_text), selectinload(Document.file)]),
+}
+
+
+def list_documents(session, user_id: uuid.UUID, limit: int, name: str):
+    schema, options = PATHS[name]
+    started = time.perf_counter()
+    documents = session.scalars(list_query(user_id, limit).options(*options)).all()
+    query_ms = (time.perf_counter() - started) * 1000
+    adapter = TypeAdapter(List[schema])
+    content = adapter.dump_python(adapter.validate_python(documents, from_attributes=True), mode="json")
+    body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+    return query_ms, (time.perf_counter() - started) * 1000, len(body)
+
+
+def text_page(session, user_id: uuid.UUID, limit: int):
+    """What GET /documents/{id}/text selects"""
+    document_id = session.scalar(list_query(user_id, 1).with_only_columns(Document.id))
+    started = time.perf_counter()
+    session.execute(
+        select(func.substr(Document.extracted_text, 1, limit), func.length(Document.extracted_text))
+        .where(Document.id == document_id, Document.user_id == user_id)
+    ).first()
+    return (time.perf_counter() - started) * 1000
+
+
+def run(args) -> dict:
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        user_id = seed(session, args.documents, args.image_share)
+
+    results = {}
+    for label, limit in (("page", args.page), ("account", args.documents)):
+        for name in PATHS:
+            runs = []
+            for _ in range(args.repeat):
+                with Session() as session:
+                    runs.append(list_documents(session, user_id, limit, name))
+            results[f"{label} {name}"] = {
+                "documents": limit,
+                "query_ms": round(statistics.median(run[0] for run in runs), 1),
+                "total_ms": round(statistics.median(run[1] for run in runs), 1),
+                "bytes": runs[-1][2],
+            }
+
+    with Session() as session:
+        text_ms = statistics.median(text_page(session, user_id, 20000) for _ in range(args.repeat))
+    results["text page"] = {"documents": 1, "query_ms": round(text_ms, 2), "total_ms": round(text_ms, 2), "bytes": None}
+    engine.dispose()
+    return results
+
+
+def print_report(label: str, results: dict, baseline: dict | None = None) -> None:
+    print(f"\n{label}")
+    print(f"{'case':<18} {'docs':>6} {'query':>10} {'total':>10} {'payload':>12}" + ("   total vs base" if baseline else ""))
+    for name, stats in results.items():
+        size = f"{stats['bytes'] / 1024:>10.1f}KB" if stats["bytes"] is not None else f"{'-':>12}"
+        line = f"{name:<18} {stats['documents']:>6} {stats['query_ms']:>8.1f}ms {stats['total_ms']:>8.1f}ms {size}"
+        base = (baseline or {}).get(name)
+        if base and base["total_ms"]:
+            line += f"   {stats['total_ms'] / base['total_ms']:.2f}x"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=1000, help="Documents in the account")
+    parser.add_argument("--image-share", type=float, default=0.3, help="Share of photos (Claude Vision)")
+    parser.add_argument("--page", type=int, default=50, help="Page size (GET /documents/ default)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case; the median is reported")
+    parser.add_argument("--database-url", help="Scratch database (sync driver); default: in-memory SQLite")
+    parser.add_argument("--out", help="Write results as JSON")
+    parser.add_argument("--compare", help="Earlier JSON result to compare against")
+    args = parser.parse_args()
+
+    results = run(args)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print_report("baseline", baseline)
+    print_report("current", results, baseline)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Image uploads: original vs. normalized rendition for OCR and Claude Vision
+
+For each document photo, reports the bytes that go to Claude (the base64
+image in the request), the estimated vision tokens and the end-to-end
+latency per document:
+
+- original:   the upload as it is (process_document before normalization)
+- normalized: ImageNormalizer (EXIF, crop, NORMALIZE_LONG_EDGE, JPEG)
+
+End-to-end is normalization (0 for the original) plus the analysis step:
+--ocr runs Tesseract (OCRService.extract_text), --claude calls
+ClaudeService.analyze_document_image (needs CLAUDE_API_KEY, costs tokens).
+Without either, only bytes, tokens and normalization time are measured.
+Use your own scans with --images; by default synthetic 12 MP phone photos
+(a page on a desk, EXIF-rotated) are generated.
+
+    python scripts/bench_image_normalization.py --images ~/scans --ocr --out after.json
+"""
+
+import argparse
+import base64
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from PIL import Image, ImageDraw  # noqa: E402
+
+from app.services.image_normalizer import ImageNormalizer  # noqa: E402
+
+# Claude scales images down to fit these before counting tokens (~ pixels / 750)
+VISION_MAX_EDGE = 1568
+VISION_MAX_PIXELS = 1_150_000
+
+
+def vision_tokens(width: int, height: int) -> int:
+    scale = min(1.0, VISION_MAX_EDGE / max(width, height), (VISION_MAX_PIXELS / (width * height)) ** 0.5)
+    return round(width * scale * height * scale / 750)
+
+
+def synthetic_photo(path: Path, seed: int) -> Path:
+    """4032x3024 photo of a printed page on a desk, stored rotated with EXIF orientation 6"""
+    rng = np.random.default_rng(seed)
+    desk = rng.normal(70 + seed % 3 * 25, 14, (3024, 4032, 3)).clip(0, 255).astype("uint8")
+    image = Image.fromarray(desk)
+    draw = ImageDraw.Draw(image)
+    left, top = 500 + int(rng.integers(0, 400)), 150 + int(rng.integers(0, 200))
+    right, bottom = left + 2600, top + 2700 if top + 2700 < 3000 else 2990
+    draw.rectangle((left, top, right, bottom), fill=(236, 234, 228))
+    for y in range(top + 200, bottom - 200, 55):
+        x = left + 180
+        while x < right - 300:
+            word = int(rng.integers(40, 160))
+            draw.rectangle((x, y, x + word, y + 22), fill=(35, 35, 40))
+            x += word + 30
+    exif = image.getexif()
+    exif[0x0112] = 6
+    image.save(path, "JPEG", quality=92, exif=exif)
+    return path
+
+
+def analyze(path: Path, args, ocr_service, claude_service) -> float:
+    """Time of the analysis step in ms"""
+    started = time.perf_counter()
+    if ocr_service:
+        ocr_service.extract_text(path)
+    if claude_service:
+        claude_service.analyze_document_image(image_path=path)
+    return (time.perf_counter() - started) * 1000
+
+
+def measure(path: Path, args, normalizer, ocr_service, claude_service, workdir: Path) -> dict:
+    result = {}
+    for name in ("original", "normalized"):
+        started = time.perf_counter()
+        if name == "normalized":
+            rendition = normalizer.normalize(path, workdir / f"{path.stem}.normalized.jpg")
+            image_path, width, height = rendition.path, rendition.width, rendition.height
+        else:
+            image_path = path
+            with Image.open(path) as image:
+                width, height = image.size
+        prepare_ms = (time.perf_counter() - started) * 1000
+        analyze_ms = analyze(image_path, args, ocr_service, claude_service)
+        result[name] = {
+            "bytes_sent": len(base64.standard_b64encode(image_path.read_bytes())),
+            "pixels": f"{width}x{height}",
+            "tokens": vision_tokens(width, height),
+            "prepare_ms": round(prepare_ms, 1),
+            "end_to_end_ms": round(prepare_ms + analyze_ms, 1),
+        }
+    return result
+
+
+def run(args) -> dict:
+    ocr_service = claude_service = None
+    if args.ocr:
+        from app.services.ocr_service import OCRService
+        ocr_service = OCRService()
+    if args.claude:
+        from app.services.claude_service import ClaudeService
+        claude_service = ClaudeService()
+
+    normalizer = ImageNormalizer()
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        if args.images:
+            paths = sorted(p for p in Path(args.images).iterdir() if p.suffix.lower() in (".jpg", ".jpeg", ".png"))
+        else:
+            paths = [synthetic_photo(workdir / f"photo-{i}.jpg", i) for i in range(args.synthetic)]
+
+        documents = {path.name: measure(path, args, normalizer, ocr_service, claude_service, workdir) for path in paths}
+
+    totals = {}
+    for name in ("original", "normalized"):
+        rows = [document[name] for document in documents.values()]
+        totals[name] = {
+            "bytes_sent": sum(row["bytes_sent"] for row in rows),
+            "tokens": sum(row["tokens"] for row in rows),
+            "median_end_to_end_ms": round(statistics.median(row["end_to_end_ms"] for row in rows), 1),
+        }
+    return {"documents": documents, "totals": totals}
+
+
+def print_report(label: str, results: dict) -> None:
+    print(f"\n{label}")
+    print(f"{'document':<24} {'case':<11} {'pixels':>10} {'sent':>10} {'tokens':>7} {'prepare':>10} {'end-to-end':>11}")
+    for document, cases in results["documents"].items():
+        for name, stats in cases.items():
+            print(
+                f"{document[:24]:<24} {name:<11} {stats['pixels']:>10} {stats['bytes_sent'] / 1024:>8.0f}KB "
+                f"{stats['tokens']:>7} {stats['prepare_ms']:>8.1f}ms {stats['end_to_end_ms']:>9.1f}ms"
+            )
+    original, normalized = results["totals"]["original"], results["totals"]["normalized"]
+    print(
+        f"\ntotal sent {original['bytes_sent'] / 1024:.0f}KB -> {normalized['bytes_sent'] / 1024:.0f}KB "
+        f"({normalized['bytes_sent'] / original['bytes_sent']:.2f}x), tokens {original['tokens']} -> "
+        f"{normalized['tokens']}, median end-to-end {original['median_end_to_end_ms']}ms -> "
+        f"{normalized['median_end_to_end_ms']}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", help="Directory of document photos (default: synthetic)")
+    parser.add_argument("--synthetic", type=int, default=5, help="Number of synthetic photos")
+    parser.add_argument("--ocr", action="store_true", help="Include Tesseract OCR in the end-to-end time")
+    parser.add_argument("--claude", action="store_true", help="Include a Claude Vision call (CLAUDE_API_KEY)")
+    parser.add_argument("--out", help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args)
+    print_report("original vs. normalized", results)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+List serialization benchmark: response_model path vs. the orjson fast path
+
+Seeds an in-memory SQLite database with N tasks, documents (with files) and
+calendar events for one user and times, per list endpoint:
+
+- model: SELECT entities -> ORM objects -> Pydantic response models
+  (from_attributes) -> json.dumps, as FastAPI does for response_model
+- fast:  SELECT response columns -> row dicts -> orjson
+  (FAST_LIST_RESPONSES, app/core/serialization.py)
+
+Both outputs are decoded and compared, so a shape difference fails the run.
+
+    python scripts/bench_list_serialization.py --rows 5000 --out after.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine, select  # noqa: E402
+from sqlalchemy.orm import defer, selectinload, sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.core.serialization import fast_json_response, nest_rows, response_columns  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.models import CalendarEvent, Document, File, Task  # noqa: E402
+from app.schemas import CalendarEventResponse, TaskResponse  # noqa: E402
+from app.schemas.document import DocumentSummaryResponse, DocumentSummaryWithFileResponse, FileResponse  # noqa: E402
+
+
+def seed(session, user_id: uuid.UUID, rows: int) -> None:
+    now = datetime.utcnow()
+    for i in range(rows):
+        file = File(
+            id=uuid.uuid4(), user_id=user_id, path=f"{user_id}/{i:08x}.pdf", original_filename=f"scan-{i}.pdf",
+            size_bytes=random.randint(10_000, 5_000_000), mime_type="application/pdf", created_at=now,
+        )
+        session.add(file)
+        session.add(Document(
+            id=uuid.uuid4(), user_id=user_id, file_id=file.id, type="invoice", title=f"Rechnung {i}",
+            doc_metadata={"sender": "Telekom", "amount": 39.95}, processing_status="done", confidence_score=0.93,
+            extracted_text="Lorem ipsum dolor sit amet " * 40, uploaded_at=now - timedelta(minutes=i),
+            processed_at=now,
+        ))
+        session.add(Task(
+            id=uuid.uuid4(), user_id=user_id, title=f"Rechnung {i} bezahlen", description="Überweisung bis Monatsende",
+            due_date=now + timedelta(days=i % 30), status="open", priority="high", amount=Decimal("39.95"),
+            currency="EUR", created_at=now, updated_at=now,
+        ))
+        session.add(CalendarEvent(
+            id=uuid.uuid4(), user_id=user_id, title=f"Termin {i}", start_time=now + timedelta(hours=i),
+            end_time=now + timedelta(hours=i, minutes=30), all_day=False, location="Berlin",
+            created_at=now, updated_at=now,
+        ))
+    session.commit()
+
+
+def model_path(session, query, schema, options=()) -> bytes:
+    """What FastAPI does for response_model=List[schema]"""
+    objects = session.scalars(query.options(*options)).all()
+    adapter = TypeAdapter(List[schema])
+    value = adapter.validate_python(objects, from_attributes=True)
+    content = adapter.dump_python(value, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def fast_path(session, query, nested=None) -> bytes:
+    rows = session.execute(query).mappings()
+    return fast_json_response(nest_rows(rows, nested=nested)).body
+
+
+def endpoints(user_id: uuid.UUID, limit: int) -> dict:
+    tasks = select(Task).where(Task.user_id == user_id).offset(0).limit(limit)
+    events = select(CalendarEvent).where(CalendarEvent.user_id == user_id).order_by(CalendarEvent.start_time).limit(limit)
+    documents = select(Document).where(Document.user_id == user_id).order_by(Document.uploaded_at.desc()).limit(limit)
+    document_columns = response_columns(Document, DocumentSummaryResponse) + response_columns(File, FileResponse, prefix="file__")
+    return {
+        "GET /tasks/": (
+            lambda s: model_path(s, tasks, TaskResponse),
+            lambda s: fast_path(s, tasks.with_only_columns(*response_columns(Task, TaskResponse))),
+        ),
+        "GET /documents/": (
+            lambda s: model_path(
+                s, documents, DocumentSummaryWithFileResponse, [defer(Document.extracted_text), selectinload(Document.file)]
+            ),
+            lambda s: fast_path(
+                s,
+                documents.with_only_columns(*document_columns).outerjoin(File, Document.file_id == File.id),
+                nested="file",
+            ),
+        ),
+        "GET /calendar/events/": (
+            lambda s: model_path(s, events, CalendarEventResponse),
+            lambda s: fast_path(s, events.with_only_columns(*response_columns(CalendarEvent, CalendarEventResponse))),
+        ),
+    }
+
+
+def timed(fn, Session, repeat: int):
+    durations, body = [], None
+    for _ in range(repeat):
+        with Session() as session:
+            started = time.perf_counter()
+            body = fn(session)
+            durations.append((time.perf_counter() - started) * 1000)
+    return statistics.median(durations), body
+
+
+def run(args) -> dict:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    user_id = uuid.uuid4()
+    with Session() as session:
+        seed(session, user_id, args.rows)
+
+    results = {}
+    for name, (model_fn, fast_fn) in endpoints(user_id, args.rows).items():
+        model_ms, model_body = timed(model_fn, Session, args.repeat)
+        fast_ms, fast_body = timed(fast_fn, Session, args.repeat)
+        if json.loads(model_body) != json.loads(fast_body):
+            raise SystemExit(f"{name}: fast path output differs from the response_model output")
+        results[name] = {
+            "rows": args.rows,
+            "model_ms": round(model_ms, 1),
+            "fast_ms": round(fast_ms, 1),
+            "speedup": round(model_ms / fast_ms, 2) if fast_ms else None,
+            "bytes": len(fast_body),
+        }
+    return results
+
+
+def print_report(label: str, results: dict, baseline: dict | None = None) -> None:
+    print(f"\n{label}")
+    print(f"{'endpoint':<24} {'rows':>6} {'model':>10} {'fast':>10} {'speedup':>8}" + ("   fast vs base" if baseline else ""))
+    for name, stats in results.items():
+        line = f"{name:<24} {stats['rows']:>6} {stats['model_ms']:>8.1f}ms {stats['fast_ms']:>8.1f}ms {stats['speedup']:>7.2f}x"
+        base = (baseline or {}).get(name)
+        if base and base["fast_ms"]:
+            line += f"   {stats['fast_ms'] / base['fast_ms']:.2f}x"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000, help="Rows per table (and page size)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per path; the median is reported")
+    parser.add_argument("--out", help="Write results as JSON")
+    parser.add_argument("--compare", help="Earlier JSON result to compare against")
+    args = parser.parse_args()
+
+    results = run(args)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print_report("baseline", baseline)
+    print_report("current", results, baseline)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the API and the Celery processes
+
+Imports each process's entry modules in a fresh interpreter and reports
+import time, resident memory and which heavy integrations got loaded. For
+the worker types it also measures the first use of their integrations
+(what the first task of that kind pays on top of the worker start).
+
+    python scripts/bench_startup.py --out before.json
+    python scripts/bench_startup.py --compare before.json --max-regression 20
+
+With --max-regression the script exits non-zero if import time or RSS of
+any target grew by more than that many percent against --compare.
+Run from backend/ with the same environment as the processes (.env).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must stay out of the process until something actually uses them
+HEAVY_MODULES = [
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "caldav",
+    "icalendar",
+    "anthropic",
+    "pytesseract",
+    "pdf2image",
+    "numpy",
+    "firebase_admin",
+]
+
+# name -> (statements run at process start, statements run by the first task)
+TARGETS = {
+    "api": ("import app.main", None),
+    "beat": ("from app.celery import celery_app", None),
+    "worker": ("from app.celery import celery_app; celery_app.loader.import_default_modules()", None),
+    "worker:documents": (
+        "from app.celery import celery_app; celery_app.loader.import_default_modules()",
+        "import anthropic, pytesseract, pdf2image",
+    ),
+    "worker:calendar": (
+        "from app.celery import celery_app; celery_app.loader.import_default_modules()",
+        "import app.services.caldav_service, app.services.google_calendar_service",
+    ),
+    "worker:reminders": (
+        "from app.celery import celery_app; celery_app.loader.import_default_modules()",
+        "import firebase_admin.messaging",
+    ),
+}
+
+_PROBE = r"""
+import json, sys, time
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+startup, first_use, heavy = sys.argv[1], sys.argv[2], json.loads(sys.argv[3])
+result = {"base_rss_mb": rss_mb()}
+started = time.perf_counter()
+exec(startup)
+result["import_s"] = time.perf_counter() - started
+result["rss_mb"] = rss_mb()
+result["heavy_loaded"] = [m for m in heavy if m in sys.modules]
+if first_use:
+    started = time.perf_counter()
+    exec(first_use)
+    result["first_use_s"] = time.perf_counter() - started
+    result["first_use_rss_mb"] = rss_mb()
+print(json.dumps(result))
+"""
+
+
+def measure(startup: str, first_use: str | None) -> dict:
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR)
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE, startup, first_use or "", json.dumps(HEAVY_MODULES)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(targets: list[str], repeat: int) -> dict:
+    results = {}
+    for name in targets:
+        startup, first_use = TARGETS[name]
+        runs = [measure(startup, first_use) for _ in range(repeat)]
+        summary = {
+            "import_s": round(statistics.median(r["import_s"] for r in runs), 3),
+            "rss_mb": round(statistics.median(r["rss_mb"] for r in runs), 1),
+            "heavy_loaded": runs[-1]["heavy_loaded"],
+        }
+        if first_use:
+            summary["first_use_s"] = round(statistics.median(r["first_use_s"] for r in runs), 3)
+            summary["first_use_rss_mb"] = round(statistics.median(r["first_use_rss_mb"] for r in runs), 1)
+        results[name] = summary
+    return results
+
+
+def print_report(label: str, results: dict, baseline: dict | None = None) -> None:
+    print(f"\n{label}")
+    print(f"{'target':<18} {'import':>8} {'rss':>9} {'first use':>10} {'rss after':>10}  heavy modules at start")
+    for name, stats in results.items():
+        first = f"{stats['first_use_s']:>9.2f}s" if "first_use_s" in stats else f"{'-':>10}"
+        first_rss = f"{stats['first_use_rss_mb']:>8.1f}MB" if "first_use_rss_mb" in stats else f"{'-':>10}"
+        line = (f"{name:<18} {stats['import_s']:>7.2f}s {stats['rss_mb']:>7.1f}MB {first} {first_rss}  "
+                f"{', '.join(stats['heavy_loaded']) or '-'}")
+        base = (baseline or {}).get(name)
+        if base:
+            line += f"   (import {stats['import_s'] / base['import_s']:.2f}x, rss {stats['rss_mb'] / base['rss_mb']:.2f}x)"
+        print(line)
+
+
+def regressions(results: dict, baseline: dict, max_pct: float) -> list[str]:
+    found = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for key in ("import_s", "rss_mb"):
+            if base[key] and (stats[key] - base[key]) / base[key] * 100 > max_pct:
+                found.append(f"{name} {key}: {base[key]} -> {stats[key]}")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", action="append", choices=sorted(TARGETS), help="Target to measure (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per target; the median is reported")
+    parser.add_argument("--out", help="Write results as JSON")
+    parser.add_argument("--compare", help="Earlier JSON result to compare against")
+    parser.add_argument("--max-regression", type=float, help="Fail if import time or RSS grew by more than this many percent")
+    args = parser.parse_args()
+
+    results = run(args.target or list(TARGETS), args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print_report("baseline", baseline)
+    print_report("current", results, baseline)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if baseline and args.max_regression is not None:
+        found = regressions(results, baseline, args.max_regression)
+        if found:
+            print("\nStartup regressions over {:.0f}%:\n  ".format(args.max_regression) + "\n  ".join(found))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
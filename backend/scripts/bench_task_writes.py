@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Task edit throughput: commit per service vs. one unit of work
+
+Runs the same edits (create with due date, move the due date, rename) for
+N tasks two ways against a scratch database:
+
+- per-service: task commit + refresh, then TaskEventMappingService and
+  ReminderService each commit on their own (the services' default,
+  commit=True; the task endpoints wrote like this before TaskWriteService)
+- unit-of-work: TaskWriteService adds task, event and reminder changes to
+  the session and they go out in one commit
+
+and reports edits/s, p50/p95 latency and statements and commits per edit.
+The default database is a SQLite file in a temp directory, so commits pay
+a real fsync; point --database-url at a scratch PostgreSQL for numbers
+closer to production (the tables are created, never dropped).
+
+    python scripts/bench_task_writes.py --tasks 200 --out after.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.models import Task, User  # noqa: E402
+from app.schemas.task import TaskCreate, TaskUpdate  # noqa: E402
+from app.services.reminder_service import ReminderService  # noqa: E402
+from app.services.task_event_mapping_service import TaskEventMappingService  # noqa: E402
+from app.services.task_write_service import TaskWriteService  # noqa: E402
+
+
+class Counter:
+    def __init__(self, engine):
+        self.statements = 0
+        self.commits = 0
+        event.listen(engine, "before_cursor_execute", self._statement)
+        event.listen(engine, "commit", self._commit)
+
+    def _statement(self, *args):
+        self.statements += 1
+
+    def _commit(self, *args):
+        self.commits += 1
+
+
+def per_service_create(session, user_id, task_data: TaskCreate) -> Task:
+    task = Task(user_id=user_id, **task_data.model_dump())
+    session.add(task)
+    session.commit()
+    session.refresh(task)
+    if task.due_date:
+        TaskEventMappingService(session).create_event_from_task(task)
+        session.refresh(task)
+        ReminderService().create_reminders_for_task(task, session)
+    return task
+
+
+def per_service_update(session, task: Task, task_data: TaskUpdate) -> Task:
+    for field, value in task_data.model_dump(exclude_unset=True).items():
+        setattr(task, field, value)
+    session.commit()
+    session.refresh(task)
+    TaskEventMappingService(session).update_event_from_task(task)
+    session.refresh(task)
+    if task_data.due_date is not None:
+        ReminderService().reschedule_reminders_for_task(task, session)
+    return task
+
+
+def unit_of_work_create(session, user_id, task_data: TaskCreate) -> Task:
+    writer = TaskWriteService(session)
+    task = writer.create_task(user_id, task_data)
+    writer.commit()
+    return task
+
+
+def unit_of_work_update(session, task: Task, task_data: TaskUpdate) -> Task:
+    writer = TaskWriteService(session)
+    writer.update_task(task, task_data)
+    writer.commit()
+    return task
+
+
+PATHS = {
+    "per-service": (per_service_create, per_service_update),
+    "unit-of-work": (unit_of_work_create, unit_of_work_update),
+}
+
+
+def edits(index: int):
+    due = datetime.utcnow().replace(microsecond=0) + timedelta(days=10 + index % 20)
+    yield "create", TaskCreate(title=f"Rechnung {index} bezahlen", due_date=due, priority="high")
+    yield "move due date", TaskUpdate(due_date=due + timedelta(days=3))
+    yield "rename", TaskUpdate(title=f"Rechnung {index} überweisen")
+
+
+def run_path(name: str, database_url: str, tasks: int) -> dict:
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    counter = Counter(engine)
+    create, update = PATHS[name]
+
+    with Session() as session:
+        user = User(id=uuid.uuid4(), email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+                    username=f"bench-{uuid.uuid4().hex[:8]}", password_hash="-")
+        session.add(user)
+        session.commit()
+        user_id = user.id
+
+    durations = {}
+    counter.statements = counter.commits = 0
+    started = time.perf_counter()
+    for index in range(tasks):
+        # One session per edit, as one request would have
+        task_id = None
+        for kind, task_data in edits(index):
+            with Session(expire_on_commit=False) as session:
+                begin = time.perf_counter()
+                if kind == "create":
+                    task_id = create(session, user_id, task_data).id
+                else:
+                    update(session, session.get(Task, task_id), task_data)
+                durations.setdefault(kind, []).append((time.perf_counter() - begin) * 1000)
+    total = time.perf_counter() - started
+    edit_count = sum(len(values) for values in durations.values())
+    engine.dispose()
+
+    return {
+        "edits": edit_count,
+        "edits_per_s": round(edit_count / total, 1),
+        "statements_per_edit": round(counter.statements / edit_count, 2),
+        "commits_per_edit": round(counter.commits / edit_count, 2),
+        "latency_ms": {
+            kind: {
+                "p50": round(statistics.median(values), 2),
+                "p95": round(statistics.quantiles(values, n=20)[-1], 2) if len(values) > 1 else round(values[0], 2),
+            }
+            for kind, values in durations.items()
+        },
+    }
+
+
+def run(args) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in PATHS:
+            database_url = args.database_url or f"sqlite:///{os.path.join(tmp, name)}.db"
+            results[name] = run_path(name, database_url, args.tasks)
+    return results
+
+
+def print_report(label: str, results: dict, baseline: dict | None = None) -> None:
+    print(f"\n{label}")
+    print(f"{'path':<14} {'edits/s':>9} {'stmts':>7} {'commits':>8}  latency p50/p95 (ms)")
+    for name, stats in results.items():
+        latency = ", ".join(f"{kind} {v['p50']:.1f}/{v['p95']:.1f}" for kind, v in stats["latency_ms"].items())
+        line = (f"{name:<14} {stats['edits_per_s']:>9.1f} {stats['statements_per_edit']:>7.2f} "
+                f"{stats['commits_per_edit']:>8.2f}  {latency}")
+        base = (baseline or {}).get(name)
+        if base and base["edits_per_s"]:
+            line += f"   ({stats['edits_per_s'] / base['edits_per_s']:.2f}x)"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200, help="Tasks to create; each gets 3 edits")
+    parser.add_argument("--database-url", help="Scratch database (sync driver); default: SQLite file per path")
+    parser.add_argument("--out", help="Write results as JSON")
+    parser.add_argument("--compare", help="Earlier JSON result to compare against")
+    args = parser.parse_args()
+
+    results = run(args)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print_report("baseline", baseline)
+    print_report("current", results, baseline)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
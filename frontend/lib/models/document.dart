@@ -89,6 +89,8 @@ class DocumentFile {
   final int sizeBytes;
   final String mimeType;
   final String path;
+  final String url; // signed, expires; relative to the server
+  final Map<int, String> thumbnails; // WebP by long edge in px, signed like url
   final DateTime createdAt;
 
   DocumentFile({
@@ -97,6 +99,8 @@ class DocumentFile {
     required this.sizeBytes,
     required this.mimeType,
     required this.path,
+    required this.url,
+    this.thumbnails = const {},
     required this.createdAt,
   });
 
@@ -107,10 +111,20 @@ class DocumentFile {
       sizeBytes: json['size_bytes'] as int,
       mimeType: json['mime_type'] as String,
       path: json['path'] as String,
+      url: json['url'] as String,
+      thumbnails: (json['thumbnails'] as Map<String, dynamic>? ?? {})
+          .map((size, url) => MapEntry(int.parse(size), url as String)),
       createdAt: DateTime.parse(json['created_at']),
     );
   }
 
+  /// Smallest thumbnail at least [size] px on the long edge (else the largest), if rendered
+  String? thumbnailUrl(int size) {
+    if (thumbnails.isEmpty) return null;
+    final sizes = thumbnails.keys.toList()..sort();
+    return thumbnails[sizes.firstWhere((s) => s >= size, orElse: () => sizes.last)];
+  }
+
   String get sizeFormatted {
     if (sizeBytes < 1024) return '$sizeBytes B';
     if (sizeBytes < 1024 * 1024) return '${(sizeBytes / 1024).toStringAsFixed(1)} KB';
@@ -1,8 +1,7 @@
 import 'package:flutter/material.dart';
 import 'package:flutter_secure_storage/flutter_secure_storage.dart';
-import 'package:provider/provider.dart';
 import '../models/document.dart';
-import '../providers/document_provider.dart';
+import '../services/document_service.dart';
 import '../config/api_config.dart';
 import 'package:intl/intl.dart';
 
@@ -19,6 +18,7 @@ class DocumentDetailPage extends StatefulWidget {
 }
 
 class _DocumentDetailPageState extends State<DocumentDetailPage> {
+  final DocumentService _documentService = DocumentService();
   Document? _document;
   bool _isLoading = true;
   String? _error;
@@ -36,13 +36,8 @@ class _DocumentDetailPageState extends State<DocumentDetailPage> {
     });
 
     try {
-      final documentProvider = context.read<DocumentProvider>();
-      await documentProvider.loadDocuments();
-
-      final doc = documentProvider.documents.firstWhere(
-        (d) => d.id == widget.documentId,
-        orElse: () => throw Exception('Document not found'),
-      );
+      // The list entries come without extracted_text, so load the full document
+      final doc = await _documentService.getDocument(widget.documentId);
 
       setState(() {
         _document = doc;
@@ -56,10 +51,11 @@ class _DocumentDetailPageState extends State<DocumentDetailPage> {
     }
   }
 
-  String _getImageUrl(String path) {
-    // Remove /api/v1 from base URL for image serving
+  String _getImageUrl(DocumentFile file) {
+    // Remove /api/v1 from base URL; file.url is a signed /files/ URL.
+    // The preview is 400 px high: a thumbnail is enough once rendered.
     final baseUrl = ApiConfig.baseUrl.replaceAll('/api/v1', '');
-    return '$baseUrl/files/$path';
+    return '$baseUrl${file.thumbnailUrl(960) ?? file.url}';
   }
 
   Color _getStatusColor() {
@@ -262,9 +258,9 @@ class _DocumentDetailPageState extends State<DocumentDetailPage> {
     return Container(
       height: 400,
       color: Colors.grey[200],
-      child: file.mimeType.startsWith('image/')
+      child: file.mimeType.startsWith('image/') || file.thumbnails.isNotEmpty
           ? Image.network(
-              _getImageUrl(file.path),
+              _getImageUrl(file),
               fit: BoxFit.contain,
               loadingBuilder: (context, child, loadingProgress) {
                 if (loadingProgress == null) return child;
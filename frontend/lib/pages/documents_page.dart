@@ -2,6 +2,7 @@ import 'dart:typed_data';
 import 'package:flutter/material.dart';
 import 'package:intl/intl.dart';
 import 'package:provider/provider.dart';
+import '../config/api_config.dart';
 import '../models/document.dart';
 import '../providers/document_provider.dart';
 import '../services/file_upload_service.dart';
@@ -427,6 +428,10 @@ class _DocumentCard extends StatelessWidget {
             children: [
               _buildStatusIcon(),
               const SizedBox(width: 16),
+              if (document.file?.thumbnailUrl(160) != null) ...[
+                _buildThumbnail(document.file!.thumbnailUrl(160)!),
+                const SizedBox(width: 12),
+              ],
               Expanded(
                 child: Column(
                   crossAxisAlignment: CrossAxisAlignment.start,
@@ -488,6 +493,21 @@ class _DocumentCard extends StatelessWidget {
     );
   }
 
+  Widget _buildThumbnail(String url) {
+    // Signed /files/ URL, relative to the server (outside /api/v1)
+    final baseUrl = ApiConfig.baseUrl.replaceAll('/api/v1', '');
+    return ClipRRect(
+      borderRadius: BorderRadius.circular(6),
+      child: Image.network(
+        '$baseUrl$url',
+        width: 48,
+        height: 48,
+        fit: BoxFit.cover,
+        errorBuilder: (context, error, stackTrace) => const SizedBox(width: 48, height: 48),
+      ),
+    );
+  }
+
   Widget _buildStatusIcon() {
     IconData icon;
     Color color;